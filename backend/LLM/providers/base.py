@@ -1,5 +1,12 @@
 from abc import ABC, abstractmethod
 
+def join_prefix(prefix: str, prompt: str) -> str:
+    """
+    Combines a shared prompt prefix (passed as the `prefix` kwarg, e.g. the transcript) with the
+    task prompt. Providers that can't reuse an evaluated prefix simply send the joined text.
+    """
+    return f"{prefix}\n{prompt}" if prefix else prompt
+
 class LLMProvider(ABC):
     @abstractmethod
     def generate(self, prompt: str, system_message: str = None, **kwargs) -> str:
@@ -7,7 +14,16 @@ class LLMProvider(ABC):
         Generates text based on the prompt.
         :param prompt: The user prompt.
         :param system_message: (Optional) System instruction.
-        :param kwargs: Additional arguments (e.g., temperature).
+        :param kwargs: Additional arguments (e.g., temperature, prefix - a shared leading part of
+                       the prompt that several calls have in common).
         :return: Generated string.
         """
         pass
+
+    def generate_stream(self, prompt: str, system_message: str = None, **kwargs):
+        """
+        Generates text incrementally, yielding chunks as they arrive.
+        Providers without native streaming yield the full response once.
+        :return: Iterator of string chunks.
+        """
+        yield self.generate(prompt, system_message=system_message, **kwargs)
@@ -0,0 +1,150 @@
+from .base import LLMProvider
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", os.path.join(BACKEND_DIR, "cache", "llm_cache.sqlite3"))
+
+# Stores between trims of expired / least recently used entries (the cache can exceed
+# max_entries by up to this many until the next trim)
+TRIM_INTERVAL = 100
+
+class _ResponseCache:
+    """One SQLite connection per cache file, shared by every CachedProvider using it."""
+
+    def __init__(self, cache_path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(cache_path, check_same_thread=False, timeout=30)
+        self.stores = 0
+        with self.lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self.conn.commit()
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def _get_cache(cache_path: str) -> _ResponseCache:
+    path = os.path.abspath(cache_path)
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = _ResponseCache(path)
+        return _caches[path]
+
+class CachedProvider(LLMProvider):
+    """
+    Wraps another LLMProvider and stores its responses in a local SQLite database.
+    Entries are keyed by (provider, model, system message, prompt hash, temperature and
+    other kwargs). Only deterministic (temperature 0) calls are cached unless cache_all=True.
+    Providers on the same cache file share one connection, so wrapping a provider per run is cheap.
+    """
+
+    def __init__(self, provider: LLMProvider, cache_path: str = DEFAULT_CACHE_PATH,
+                 ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 5000, cache_all: bool = False):
+        self.provider = provider
+        self.model = getattr(provider, "model", "")
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.cache_all = cache_all
+        self._cache = _get_cache(cache_path)
+
+    def _cache_key(self, prompt: str, system_message: str, kwargs: dict) -> str:
+        key_data = [
+            type(self.provider).__name__,
+            self.model,
+            system_message,
+            hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            sorted((k, repr(v)) for k, v in kwargs.items()),
+        ]
+        return hashlib.sha256(json.dumps(key_data).encode("utf-8")).hexdigest()
+
+    def _cacheable(self, kwargs: dict) -> bool:
+        return self.cache_all or kwargs.get("temperature", None) == 0
+
+    def _lookup(self, key: str):
+        now = time.time()
+        cache = self._cache
+        with cache.lock:
+            row = cache.conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND created >= ?",
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is not None:
+                cache.conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                cache.conn.commit()
+        return row[0] if row else None
+
+    def _store(self, key: str, response: str):
+        now = time.time()
+        cache = self._cache
+        with cache.lock:
+            cache.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            cache.stores += 1
+            if cache.stores % TRIM_INTERVAL == 1:
+                # Expire old entries, then trim to the size limit (least recently used first)
+                cache.conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+                cache.conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+            cache.conn.commit()
+
+    def generate(self, prompt: str, system_message: str = "You are a helpful assistant.", **kwargs) -> str:
+        if not self._cacheable(kwargs):
+            return self.provider.generate(prompt, system_message=system_message, **kwargs)
+
+        key = self._cache_key(prompt, system_message, kwargs)
+        try:
+            cached = self._lookup(key)
+        except sqlite3.Error as e:
+            print(f"[CachedProvider] Cache read warning: {e}")
+            cached = None
+        if cached is not None:
+            return cached
+
+        response = self.provider.generate(prompt, system_message=system_message, **kwargs)
+        try:
+            self._store(key, response)
+        except sqlite3.Error as e:
+            print(f"[CachedProvider] Cache write warning: {e}")
+        return response
+
+    def generate_stream(self, prompt: str, system_message: str = "You are a helpful assistant.", **kwargs):
+        if not self._cacheable(kwargs):
+            yield from self.provider.generate_stream(prompt, system_message=system_message, **kwargs)
+            return
+
+        key = self._cache_key(prompt, system_message, kwargs)
+        try:
+            cached = self._lookup(key)
+        except sqlite3.Error as e:
+            print(f"[CachedProvider] Cache read warning: {e}")
+            cached = None
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        for chunk in self.provider.generate_stream(prompt, system_message=system_message, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        # Match generate(), which strips the full response
+        response = "".join(chunks).strip()
+        try:
+            self._store(key, response)
+        except sqlite3.Error as e:
+            print(f"[CachedProvider] Cache write warning: {e}")
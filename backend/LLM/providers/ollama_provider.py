@@ -1,32 +1,152 @@
-from .base import LLMProvider
+from .base import LLMProvider, join_prefix
 import requests
 import json
+import hashlib
+import threading
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Pooled sessions shared by every provider instance in the process, keyed by
+# (base_url, pool_size, max_retries, backoff_factor), so successive workflow runs
+# also reuse the open keep-alive connections.
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def _get_session(base_url: str, pool_size: int, max_retries: int, backoff_factor: float) -> requests.Session:
+    key = (base_url, pool_size, max_retries, backoff_factor)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            # Retry connection failures and transient 5xx answers (e.g. while Ollama loads a model).
+            # Read timeouts are not retried: that would run a long generation twice.
+            retry = Retry(
+                total=max_retries,
+                connect=max_retries,
+                read=0,
+                status=max_retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset(["GET", "POST"]),
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[key] = session
+        return session
+
+PREFIX_SYSTEM_MESSAGE = "You are an educational AI assistant."
 
 class OllamaProvider(LLMProvider):
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "mistral"):
+    def __init__(self, base_url: str = "http://localhost:11434", model: str = "mistral",
+                 pool_size: int = 8, connect_timeout: float = 5.0, read_timeout: float = 600.0,
+                 max_retries: int = 3, backoff_factor: float = 0.5, keep_alive: str = "30m",
+                 reuse_prefix: bool = False, max_prefixes: int = 4):
+        """
+        :param pool_size: Max pooled connections (should cover concurrently running agents).
+        :param connect_timeout / read_timeout: Seconds; read_timeout bounds the wait between bytes.
+        :param max_retries: Retries for connection errors and 502/503/504, with exponential backoff.
+        :param keep_alive: How long Ollama keeps the model loaded after a request (None = server default).
+        :param reuse_prefix: Session mode. A `prefix` passed to generate() (e.g. the transcript shared by the
+                             context, summary, notes and Q&A agents) is evaluated once, and the `context`
+                             returned by Ollama is sent with later calls instead of the prefix text, so the
+                             server can reuse the cached prefix instead of re-evaluating it.
+        :param max_prefixes: Number of evaluated prefixes kept per provider instance.
+        """
         self.base_url = base_url
         self.model = model
+        self.timeout = (connect_timeout, read_timeout)
+        self.keep_alive = keep_alive
+        self.session = _get_session(base_url, pool_size, max_retries, backoff_factor)
+        self.reuse_prefix = reuse_prefix
+        self.max_prefixes = max_prefixes
+        # prefix hash -> Ollama context (token ids); evaluated once per prefix, even with concurrent callers
+        self._prefix_contexts = OrderedDict()
+        self._prefix_locks = {}
+        self._prefix_lock = threading.Lock()
+
+    def _prefix_context(self, prefix: str):
+        """
+        Returns the Ollama context for `prefix`, evaluating it on first use (None if unavailable).
+        The prefix is evaluated under a neutral system message so that agents with different
+        system messages share it; each call's own system message is sent along with its task.
+        """
+        key = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        with self._prefix_lock:
+            if key in self._prefix_contexts:
+                self._prefix_contexts.move_to_end(key)
+                return self._prefix_contexts[key]
+            key_lock = self._prefix_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._prefix_lock:
+                if key in self._prefix_contexts:
+                    return self._prefix_contexts[key]
+
+            payload = self._payload(
+                f"{prefix}\nRead the material above. The tasks follow in the next messages; reply only with OK.",
+                PREFIX_SYSTEM_MESSAGE, stream=False
+            )
+            # Only the prompt evaluation matters here, keep the generated part minimal
+            payload["options"] = {"num_predict": 1, "temperature": 0}
+            try:
+                response = self.session.post(f"{self.base_url}/api/generate", json=payload, timeout=self.timeout)
+                response.raise_for_status()
+                context = response.json().get("context")
+            except Exception as e:
+                print(f"[OllamaProvider] Prefix evaluation failed ({e}); sending the full prompt instead")
+                context = None
+
+            with self._prefix_lock:
+                self._prefix_locks.pop(key, None)
+                if context:
+                    self._prefix_contexts[key] = context
+                    while len(self._prefix_contexts) > self.max_prefixes:
+                        self._prefix_contexts.popitem(last=False)
+            if context:
+                print(f"[OllamaProvider] Evaluated shared prefix once ({len(context)} context tokens)")
+            return context
+
+    def _payload(self, prompt: str, system_message: str, stream: bool, **kwargs) -> dict:
+        prefix = kwargs.get("prefix")
+        context = None
+        if prefix and self.reuse_prefix:
+            context = self._prefix_context(prefix)
+        if context is None:
+            prompt = join_prefix(prefix, prompt)
 
-    def generate(self, prompt: str, system_message: str = "You are a helpful assistant.", **kwargs) -> str:
-        url = f"{self.base_url}/api/generate"
-        
         # Ollama API supports 'system', 'prompt', 'model', 'stream', and 'options' (for temp, etc)
         payload = {
             "model": self.model,
             "prompt": prompt,
             "system": system_message,
-            "stream": False
+            "stream": stream
         }
         
+        # Continue from the already evaluated prefix
+        if context:
+            payload["context"] = context
+        
+        # Keep the model pinned in memory between agent calls
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        
         options = {}
         if "temperature" in kwargs:
             options["temperature"] = kwargs["temperature"]
             
         if options:
             payload["options"] = options
+        return payload
+
+    def generate(self, prompt: str, system_message: str = "You are a helpful assistant.", **kwargs) -> str:
+        url = f"{self.base_url}/api/generate"
+        payload = self._payload(prompt, system_message, stream=False, **kwargs)
             
         try:
-            response = requests.post(url, json=payload)
+            response = self.session.post(url, json=payload, timeout=self.timeout)
             response.raise_for_status()
             data = response.json()
             return data.get("response", "").strip()
@@ -36,3 +156,28 @@ class OllamaProvider(LLMProvider):
         except Exception as e:
             print(f"[OllamaProvider] Error: {e}")
             raise e
+
+    def generate_stream(self, prompt: str, system_message: str = "You are a helpful assistant.", **kwargs):
+        url = f"{self.base_url}/api/generate"
+        payload = self._payload(prompt, system_message, stream=True, **kwargs)
+
+        try:
+            # Ollama streams one JSON object per line: {"response": "<token>", "done": false}
+            with self.session.post(url, json=payload, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if data.get("error"):
+                        raise RuntimeError(data["error"])
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        break
+        except requests.exceptions.RequestException as e:
+            print(f"[OllamaProvider] Connection Error: {e}. Is Ollama running?")
+            raise e
+        except Exception as e:
+            print(f"[OllamaProvider] Error: {e}")
+            raise e
@@ -1,4 +1,4 @@
-from .base import LLMProvider
+from .base import LLMProvider, join_prefix
 from openai import OpenAI
 import os
 
@@ -7,27 +7,44 @@ class OpenAIProvider(LLMProvider):
         self.client = OpenAI(api_key=api_key)
         self.model = model
 
+    def _completion_params(self, prompt: str, system_message: str, **kwargs) -> dict:
+        messages = []
+        if system_message:
+            messages.append({"role": "system", "content": system_message})
+        messages.append({"role": "user", "content": join_prefix(kwargs.get("prefix"), prompt)})
+
+        # Filter kwargs to only include valid OpenAI parameters if needed, 
+        # but for now we pass them through (cleaning up 'options' if passed from Ollama logic)
+        # OpenAI doesn't take 'options', so we might need to handle specific params like temperature.
+        
+        completion_params = {
+            "model": self.model,
+            "messages": messages
+        }
+        
+        if "temperature" in kwargs:
+            completion_params["temperature"] = kwargs["temperature"]
+        return completion_params
+
     def generate(self, prompt: str, system_message: str = "You are a helpful assistant.", **kwargs) -> str:
         try:
-            messages = []
-            if system_message:
-                messages.append({"role": "system", "content": system_message})
-            messages.append({"role": "user", "content": prompt})
-
-            # Filter kwargs to only include valid OpenAI parameters if needed, 
-            # but for now we pass them through (cleaning up 'options' if passed from Ollama logic)
-            # OpenAI doesn't take 'options', so we might need to handle specific params like temperature.
-            
-            completion_params = {
-                "model": self.model,
-                "messages": messages
-            }
-            
-            if "temperature" in kwargs:
-                completion_params["temperature"] = kwargs["temperature"]
-            
+            completion_params = self._completion_params(prompt, system_message, **kwargs)
             response = self.client.chat.completions.create(**completion_params)
             return response.choices[0].message.content.strip()
         except Exception as e:
             print(f"[OpenAIProvider] Error: {e}")
             raise e
+
+    def generate_stream(self, prompt: str, system_message: str = "You are a helpful assistant.", **kwargs):
+        try:
+            completion_params = self._completion_params(prompt, system_message, **kwargs)
+            stream = self.client.chat.completions.create(stream=True, **completion_params)
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        except Exception as e:
+            print(f"[OpenAIProvider] Error: {e}")
+            raise e
@@ -0,0 +1,41 @@
+from .base import LLMProvider
+import time
+import threading
+
+class TimedProvider(LLMProvider):
+    """
+    Wraps another LLMProvider and adds up the number of calls and the seconds spent in them
+    (from any number of threads). For streams only the time spent waiting for chunks counts,
+    not the time the caller spends handling them. Concurrent calls each count in full.
+    """
+
+    def __init__(self, provider: LLMProvider):
+        self.provider = provider
+        self.model = getattr(provider, "model", "")
+        self.calls = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _record(self, seconds: float):
+        with self._lock:
+            self.calls += 1
+            self.seconds += seconds
+
+    def generate(self, prompt: str, system_message: str = "You are a helpful assistant.", **kwargs) -> str:
+        start = time.perf_counter()
+        try:
+            return self.provider.generate(prompt, system_message=system_message, **kwargs)
+        finally:
+            self._record(time.perf_counter() - start)
+
+    def generate_stream(self, prompt: str, system_message: str = "You are a helpful assistant.", **kwargs):
+        elapsed = 0.0
+        start = time.perf_counter()
+        try:
+            for chunk in self.provider.generate_stream(prompt, system_message=system_message, **kwargs):
+                elapsed += time.perf_counter() - start
+                yield chunk
+                start = time.perf_counter()
+            elapsed += time.perf_counter() - start
+        finally:
+            self._record(elapsed)
@@ -1,11 +1,19 @@
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path to import backend modules if needed
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from backend.LLM.providers.openai_provider import OpenAIProvider
 from backend.LLM.providers.ollama_provider import OllamaProvider
+from backend.LLM.providers.cached_provider import CachedProvider
+from backend.LLM.providers.timed_provider import TimedProvider
+from backend.modules.artifact_store import get_store, request_key, new_job_id
+from backend.modules.braille_converter import DEFAULT_GRADE
+from backend.modules.single_flight import SingleFlight
+from backend.audio.youtube_audio_stream import canonical_video_id
 
 from .language_detector_agent import detect_language
 from .transcription_agent import transcribe_video
@@ -13,81 +21,403 @@ from .context_agent import analyze_context
 from .summary_agent import generate_summary
 from .notes_agent import generate_study_notes
 from .qa_agent import generate_qa
+from .batch_agent import generate_all_artifacts
 from .braille_agent import convert_to_braille
-from .pdf_agent import generate_braille_pdf
+from .pdf_agent import BraillePdfWriter, title_flowables, summary_flowables, notes_flowables, qa_flowables
+from .brf_agent import generate_braille_brf
+from .stage_graph import run_stages
+from .transcript_digest import build_transcript_digest
+
+# Set LLM_CACHE=0 to disable the persistent LLM response cache
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE", "1") != "0"
+
+# Whether summary, notes and Q&A are requested in one structured call by default, per provider.
+# Local Ollama models re-evaluate the whole prompt on every call, so batching pays off most there.
+BATCH_MODE_DEFAULTS = {"openai": False, "ollama": True}
+
+# Stored alongside the PDF / BRF of a run; an identical later request is answered from it
+RESULTS_MANIFEST = "results.json"
+
+# Model used when the caller doesn't name one
+DEFAULT_MODELS = {"openai": "gpt-4o", "ollama": "mistral"}
+
+# Concurrent identical requests (same video, provider, model and options) share one run
+_workflows = SingleFlight("Orchestrator")
+
+# Set OLLAMA_REUSE_PREFIX=1 to evaluate the shared transcript prefix once per run on Ollama
+OLLAMA_REUSE_PREFIX = os.environ.get("OLLAMA_REUSE_PREFIX", "0") == "1"
 
 # Orchestrator
-def run_agent_workflow(youtube_url: str, provider_type: str = "openai", provider_model: str = None) -> dict:
+def run_agent_workflow(youtube_url: str, provider_type: str = "openai", provider_model: str = None,
+                       use_cache: bool = LLM_CACHE_ENABLED, on_summary_token=None,
+                       use_digest: bool = True, batch_mode: bool = None,
+                       reuse_prefix: bool = OLLAMA_REUSE_PREFIX, job_id: str = None,
+                       on_progress=None, prepared: dict = None, llm_provider=None) -> dict:
     """
     Coordinators the execution of all agents.
-    :param youtube_url: URL of the video.
+    :param youtube_url: URL of the video, or the path of a local audio / video file.
     :param provider_type: 'openai' or 'ollama'.
     :param provider_model: Specific model name (optional).
+    :param use_cache: Serve repeated deterministic (temperature 0) LLM calls from the local response cache.
+    :param on_summary_token: Optional callback receiving summary chunks as they stream from the LLM.
+    :param use_digest: Build a shared transcript digest once and give it to the agents instead of the raw transcript.
+    :param batch_mode: Generate summary, notes and Q&A in a single LLM call (falls back to per-agent calls
+                       if the response fails validation). None uses BATCH_MODE_DEFAULTS for the provider.
+    :param reuse_prefix: Ollama session mode: evaluate the transcript prefix once and reuse the returned
+                         context for the context, summary, notes and Q&A agents.
+    :param job_id: Store this run's artifacts under the job ID (default: a new unique ID per run).
+    :param on_progress: Optional callback receiving a progress event per stage:
+                        {"stage": name, "status": "started" | "finished" | "failed", "seconds": float or None}.
+    :param prepared: Language and transcript from prepare_transcript(); language detection and
+                     transcription are skipped (e.g. when several providers process the same video).
+    :param llm_provider: Use this LLMProvider instance (e.g. a stub for benchmarks) instead of creating one
+                         from provider_type / provider_model; provider_type is then only a label.
+    With use_cache, a request identical to an earlier one (same video, provider, model and options)
+    is answered from the artifact store without running the agents.
+    Concurrent calls for the same video, provider, model and options wait for a single run and
+    share its results (marked results["shared"]; they get the whole summary at once via
+    on_summary_token, and a single "shared" progress event). Calls passing prepared, llm_provider
+    or job_id always run on their own.
+    Independent agents run concurrently; per-stage wall times (seconds) are returned in results["timings"],
+    with the time spent in LLM calls (all calls added up) in results["timings"]["llm"].
     """
+    provider = provider_type.lower()
+    if batch_mode is None:
+        batch_mode = BATCH_MODE_DEFAULTS.get(provider, False)
+    run = lambda: _run_workflow(
+        youtube_url, provider_type, provider_model, use_cache, on_summary_token, use_digest,
+        batch_mode, reuse_prefix, job_id, on_progress, prepared, llm_provider)
+    if prepared is not None or llm_provider is not None or job_id is not None:
+        # The run depends on caller-specific input (its own transcript, provider instance or
+        # artifact location), so it can't stand in for another caller's run
+        return run()
+    model = provider_model or DEFAULT_MODELS.get(provider)
+    key = (canonical_video_id(youtube_url), provider, model, batch_mode, use_digest, use_cache, reuse_prefix)
+    
+    wait_start = time.perf_counter()
+    results, shared = _workflows.do(key, run)
+    if shared:
+        results["shared"] = True
+        if on_summary_token and results.get("summary"):
+            on_summary_token(results["summary"])
+        if on_progress:
+            on_progress({"stage": "shared", "status": "finished",
+                         "seconds": round(time.perf_counter() - wait_start, 3)})
+    return results
+
+def _run_workflow(youtube_url: str, provider_type: str, provider_model: str, use_cache: bool,
+                  on_summary_token, use_digest: bool, batch_mode: bool, reuse_prefix: bool,
+                  job_id: str, on_progress, prepared: dict, llm_provider) -> dict:
+    """One run of the workflow (see run_agent_workflow)."""
     results = {}
+    
+    def report(stage, status, seconds=None):
+        if on_progress is None:
+            return
+        try:
+            on_progress({"stage": stage, "status": status, "seconds": seconds})
+        except Exception as e:
+            print(f"[Orchestrator] Warning: progress callback failed: {e}")
+    
     print(f"--- Starting Multi-Agent Workflow for {youtube_url} using {provider_type} ---")
     
     # Initialize Provider
-    llm_provider = None
-    if provider_type.lower() == "openai":
-        model = provider_model if provider_model else "gpt-4o"
-        llm_provider = OpenAIProvider(model=model)
-    elif provider_type.lower() == "ollama":
-        model = provider_model if provider_model else "mistral"
-        llm_provider = OllamaProvider(model=model)
-    else:
-        # Default fallback
-        print(f"Unknown provider '{provider_type}', defaulting to OpenAI.")
-        llm_provider = OpenAIProvider()
+    if llm_provider is None:
+        llm_provider = _make_provider(provider_type, provider_model, reuse_prefix)
     
-    results["provider"] = provider_type
+    # Every run writes its artifacts to its own directory in the store; the request key
+    # (video, provider, model, options) points at the latest complete run for that request
+    store = get_store()
+    request_id = _request_id(youtube_url, provider_type, llm_provider.model, batch_mode, use_digest)
+    artifact_key = job_id or new_job_id()
+    workflow_start = time.perf_counter()
     
-    # 1. Language Detection
-    lang_result = detect_language(youtube_url, llm_provider=llm_provider)
-    results["language"] = lang_result.get("language", "en")
-    print(f"STEP 1: Detected Language: {results['language']}")
+    if use_cache:
+        stored = _load_stored_results(store, request_id)
+        if stored is not None:
+            stored["timings"] = {"total": round(time.perf_counter() - workflow_start, 3)}
+            stored["from_store"] = True
+            report("store", "finished", stored["timings"]["total"])
+            if on_summary_token:
+                on_summary_token(stored.get("summary", ""))
+            print(f"--- Served from artifact store ({request_id}) ---")
+            return stored
+        llm_provider = CachedProvider(llm_provider)
+    llm_provider = TimedProvider(llm_provider)
     
-    # 2. Transcription
-    # Transcription is independent of LLM text generation provider for now (uses Whisper)
-    trans_result = transcribe_video(youtube_url, results["language"])
-    results["transcript"] = trans_result.get("transcript", "")
-    print(f"STEP 2: Transcription Complete (Length: {len(results['transcript'])})")
+    results["provider"] = provider_type
+    results["timings"] = {}
+    timings = results["timings"]
+    
+    # 1-2. Language Detection and Transcription (unless done once for several runs)
+    if prepared is None:
+        prepared = prepare_transcript(youtube_url, llm_provider, timings=timings, on_stage=report)
+    results["language"] = prepared["language"]
+    results["transcript"] = prepared["transcript"]
     
     if not results["transcript"]:
-        return {"error": "Transcription failed."}
+        return {"error": "Transcription failed.", "timings": timings}
         
+    # Shared digest (chunk summaries, key terms, outline), computed once for all agents
+    results["digest"] = None
+    def digest_stage():
+        if use_digest:
+            try:
+                results["digest"] = build_transcript_digest(results["transcript"], llm_provider)
+            except Exception as e:
+                # The agents fall back to the raw (or condensed) transcript
+                print(f"STEP 2.5: Transcript Digest failed, using the transcript instead: {e}")
+                results["digest"] = None
+        if results["digest"]:
+            print(f"STEP 2.5: Transcript Digest Built ({len(results['digest']['chunk_summaries'])} parts)")
+    
     # 3. Context Analysis
-    context_result = analyze_context(results["transcript"], llm_provider=llm_provider)
-    results["context"] = context_result
-    print(f"STEP 3: Context Analyzed: {context_result.get('topic', 'Unknown')}")
+    def context_stage():
+        context_result = analyze_context(results["transcript"], llm_provider=llm_provider, digest=results["digest"])
+        results["context"] = context_result
+        print(f"STEP 3: Context Analyzed: {context_result.get('topic', 'Unknown')}")
+    
+    # 4-6 (batched). One structured call for Summary, Study Notes and Q&A
+    def batch_stage():
+        if not batch_mode:
+            return
+        batch_result = generate_all_artifacts(results["transcript"], results["context"], llm_provider=llm_provider,
+                                              digest=results["digest"])
+        if "error" in batch_result:
+            print(f"STEP 4-6: Batched generation failed, falling back to individual agents")
+            return
+        results["summary"] = batch_result["summary"]
+        results["notes"] = batch_result["notes"]
+        results["qa"] = batch_result["questions"]
+        if on_summary_token:
+            on_summary_token(results["summary"])
+        print(f"STEP 4-6: Summary, Notes ({len(results['notes'])}) and Q&A ({len(results['qa'])}) Generated in one call")
     
-    # 4. Summary
-    summary_result = generate_summary(results["transcript"], results["context"], llm_provider=llm_provider)
-    results["summary"] = summary_result.get("summary", "")
-    print(f"STEP 4: Summary Generated")
+    # 4-6. Summary, Study Notes and Q&A only depend on transcript + context: run concurrently
+    # (each is skipped if the batched call already produced it)
+    def summary_stage():
+        if "summary" in results:
+            return
+        summary_result = generate_summary(results["transcript"], results["context"], llm_provider=llm_provider,
+                                          digest=results["digest"], on_token=on_summary_token)
+        results["summary"] = summary_result.get("summary", "")
+        print(f"STEP 4: Summary Generated")
     
-    # 5. Study Notes
-    notes_result = generate_study_notes(results["transcript"], results["context"], llm_provider=llm_provider)
-    results["notes"] = notes_result.get("notes", [])
-    print(f"STEP 5: Notes Generated ({len(results['notes'])} items)")
+    def notes_stage():
+        if "notes" in results:
+            return
+        notes_result = generate_study_notes(results["transcript"], results["context"], llm_provider=llm_provider,
+                                            digest=results["digest"])
+        results["notes"] = notes_result.get("notes", [])
+        print(f"STEP 5: Notes Generated ({len(results['notes'])} items)")
     
-    # 6. Q&A
-    qa_result = generate_qa(results["transcript"], results["context"], llm_provider=llm_provider)
-    results["qa"] = qa_result.get("questions", [])
-    print(f"STEP 6: Q&A Generated ({len(results['qa'])} items)")
+    def qa_stage():
+        if "qa" in results:
+            return
+        qa_result = generate_qa(results["transcript"], results["context"], llm_provider=llm_provider,
+                               digest=results["digest"])
+        results["qa"] = qa_result.get("questions", [])
+        print(f"STEP 6: Q&A Generated ({len(results['qa'])} items)")
     
     # 7. Braille Conversion
-    braille_result = convert_to_braille(results["summary"], results["notes"], results["qa"])
-    results["braille"] = braille_result
-    print(f"STEP 7: Braille Conversion Complete")
+    def braille_stage():
+        braille_result = convert_to_braille(results["summary"], results["notes"], results["qa"])
+        results["braille"] = braille_result
+        print(f"STEP 7: Braille Conversion Complete")
     
     # 8. PDF Generation
+    # The writer starts laying out the document (title page) as soon as the context is known,
+    # and the remaining sections are added once their Braille is ready.
     # We might want to name pdf distinctively if comparing
-    output_filename = f"study_material_{provider_type}.pdf"
-    pdf_path = generate_braille_pdf(results, output_filename=output_filename)
-    results["pdf_path"] = pdf_path
-    print(f"STEP 8: PDF Generated at {pdf_path}")
+    pdf_writer = None
+    pdf_name = f"study_material_{provider_type}.pdf"
+    pdf_tmp_path = None
+    def pdf_start_stage():
+        nonlocal pdf_writer, pdf_tmp_path
+        pdf_tmp_path = store.temp_path(artifact_key, pdf_name)
+        pdf_writer = BraillePdfWriter(pdf_tmp_path)
+        pdf_writer.add_section("title", title_flowables(results))
+    
+    def pdf_stage():
+        pdf_writer.add_section("summary", summary_flowables(results))
+        pdf_writer.add_section("notes", notes_flowables(results))
+        pdf_writer.add_section("qa", qa_flowables(results))
+        if pdf_writer.close():
+            pdf_path = store.commit(pdf_tmp_path, artifact_key, pdf_name)
+        else:
+            store.discard(pdf_tmp_path)
+            pdf_path = ""
+        results["pdf_path"] = pdf_path
+        print(f"STEP 8: PDF Generated at {pdf_path}")
+    
+    # 9. BRF (embosser-ready Braille), alongside the PDF
+    def brf_stage():
+        brf_name = f"study_material_{provider_type}.brf"
+        brf_tmp_path = store.temp_path(artifact_key, brf_name)
+        if generate_braille_brf(results, output_path=brf_tmp_path):
+            brf_path = store.commit(brf_tmp_path, artifact_key, brf_name)
+        else:
+            store.discard(brf_tmp_path)
+            brf_path = ""
+        results["brf_path"] = brf_path
+        print(f"STEP 9: BRF Generated at {brf_path}")
+    
+    try:
+        run_stages({
+            "digest": ([], digest_stage),
+            "context": (["digest"], context_stage),
+            "pdf_start": (["context"], pdf_start_stage),
+            "batch": (["context"], batch_stage),
+            "summary": (["context", "batch"], summary_stage),
+            "notes": (["context", "batch"], notes_stage),
+            "qa": (["context", "batch"], qa_stage),
+            "braille": (["summary", "notes", "qa"], braille_stage),
+            "pdf": (["braille", "pdf_start"], pdf_stage),
+            "brf": (["braille"], brf_stage),
+        }, timings=timings, on_stage=report)
+    except Exception:
+        # Don't leave a half-written PDF (and its layout thread) behind
+        if pdf_writer is not None and "pdf_path" not in results:
+            pdf_writer.abort()
+        raise
     
+    timings["total"] = round(time.perf_counter() - workflow_start, 3)
+    timings["llm"] = round(llm_provider.seconds, 3)
+    results["llm_calls"] = llm_provider.calls
+    
+    # Manifest last: it is what marks the stored artifacts as complete
+    if results.get("pdf_path") and results.get("brf_path"):
+        results["artifact_key"] = artifact_key
+        try:
+            store.put_json(artifact_key, RESULTS_MANIFEST, results)
+            store.put_json(request_id, RESULTS_MANIFEST, results)
+        except OSError as e:
+            print(f"[Orchestrator] Warning: could not store results manifest: {e}")
     print("--- Workflow Complete ---")
     return results
 
+def _make_provider(provider_type: str, provider_model: str = None, reuse_prefix: bool = OLLAMA_REUSE_PREFIX):
+    if provider_type.lower() == "openai":
+        model = provider_model if provider_model else DEFAULT_MODELS["openai"]
+        return OpenAIProvider(model=model)
+    if provider_type.lower() == "ollama":
+        model = provider_model if provider_model else DEFAULT_MODELS["ollama"]
+        return OllamaProvider(model=model, reuse_prefix=reuse_prefix)
+    # Default fallback
+    print(f"Unknown provider '{provider_type}', defaulting to OpenAI.")
+    return OpenAIProvider()
+
+def prepare_transcript(youtube_url: str, llm_provider, timings: dict = None, on_stage=None) -> dict:
+    """
+    Language detection and transcription, the part of the workflow that doesn't depend on the
+    provider generating the study material. Returns {"language", "transcript"}, which can be
+    passed to run_agent_workflow(prepared=...) for any number of runs on the same video.
+    """
+    prepared = {}
+    
+    # 1. Language Detection
+    def language_stage():
+        lang_result = detect_language(youtube_url, llm_provider=llm_provider)
+        prepared["language"] = lang_result.get("language", "en")
+        print(f"STEP 1: Detected Language: {prepared['language']}")
+    
+    # 2. Transcription
+    # Transcription is independent of LLM text generation provider for now (uses Whisper)
+    def transcription_stage():
+        trans_result = transcribe_video(youtube_url, prepared["language"])
+        prepared["transcript"] = trans_result.get("transcript", "")
+        print(f"STEP 2: Transcription Complete (Length: {len(prepared['transcript'])})")
+    
+    run_stages({
+        "language": ([], language_stage),
+        "transcription": (["language"], transcription_stage),
+    }, timings=timings, on_stage=on_stage)
+    return prepared
+
+def compare_providers(youtube_url: str, providers: list, use_cache: bool = LLM_CACHE_ENABLED, **options) -> dict:
+    """
+    Runs the workflow on one video with several providers / models, for comparison.
+    Language detection (with the first provider) and transcription run once; then the agent
+    chains of all providers run concurrently.
+    :param providers: [(provider_type, model), ...]; model None means the provider's default.
+    :param use_cache: Serve the shared language detection from the LLM response cache. The provider
+                      runs never use the caches or the artifact store, so their times are real.
+    :param options: Passed on to run_agent_workflow (e.g. use_digest, batch_mode).
+    :return: {"language", "transcript", "timings": shared stage times,
+              "runs": [{"provider", "model", "results" or "error", "wall_seconds", "llm_seconds", "from_store"}]}
+    LLM time is the time spent in the provider's LLM calls (concurrent calls add up); wall time
+    covers the provider's whole chain including Braille / PDF / BRF, but not the shared stages.
+    """
+    if not providers:
+        raise ValueError("No providers to compare")
+    print(f"--- Comparing {len(providers)} providers on {youtube_url} ---")
+    comparison = {"timings": {}, "runs": []}
+    start = time.perf_counter()
+    
+    detector = _make_provider(*providers[0])
+    if use_cache:
+        detector = CachedProvider(detector)
+    prepared = prepare_transcript(youtube_url, detector, timings=comparison["timings"])
+    comparison.update(prepared)
+    comparison["timings"]["shared"] = round(time.perf_counter() - start, 3)
+    if not prepared["transcript"]:
+        comparison["error"] = "Transcription failed."
+        return comparison
+    
+    def run(provider_type, provider_model):
+        entry = {"provider": provider_type,
+                 "model": provider_model or DEFAULT_MODELS.get(provider_type.lower(), "")}
+        run_start = time.perf_counter()
+        try:
+            results = run_agent_workflow(youtube_url, provider_type=provider_type, provider_model=provider_model,
+                                         use_cache=False, prepared=prepared, **options)
+            entry["results"] = results
+            if "error" in results:
+                entry["error"] = results["error"]
+            entry["llm_seconds"] = results.get("timings", {}).get("llm", 0.0)
+            # Stored results carry no LLM time; flagged so they aren't read as a measurement
+            entry["from_store"] = results.get("from_store", False)
+        except Exception as e:
+            print(f"[Orchestrator] {provider_type} ({provider_model}) failed: {e}")
+            entry["error"] = str(e)
+        entry["wall_seconds"] = round(time.perf_counter() - run_start, 3)
+        return entry
+    
+    with ThreadPoolExecutor(max_workers=len(providers)) as executor:
+        futures = [executor.submit(run, provider_type, provider_model) for provider_type, provider_model in providers]
+        comparison["runs"] = [future.result() for future in futures]
+    comparison["timings"]["total"] = round(time.perf_counter() - start, 3)
+    print("--- Comparison Complete ---")
+    return comparison
+
+def stored_results(youtube_url: str, provider_type: str = "openai", provider_model: str = None,
+                   use_digest: bool = True, batch_mode: bool = None) -> dict:
+    """
+    Results of an earlier run of the same request if they (and their PDF / BRF) are still in
+    the artifact store, else None. Lets batch callers skip sources that were already processed.
+    """
+    provider = provider_type.lower()
+    if batch_mode is None:
+        batch_mode = BATCH_MODE_DEFAULTS.get(provider, False)
+    # Unknown providers fall back to OpenAI (see _make_provider)
+    model = provider_model or DEFAULT_MODELS.get(provider, DEFAULT_MODELS["openai"])
+    return _load_stored_results(get_store(), _request_id(youtube_url, provider, model, batch_mode, use_digest))
+
+def _request_id(youtube_url: str, provider_type: str, model: str, batch_mode: bool, use_digest: bool) -> str:
+    return request_key(canonical_video_id(youtube_url), provider_type.lower(), model,
+                       batch_mode, use_digest, DEFAULT_GRADE)
+
+def _load_stored_results(store, request_id: str) -> dict:
+    """Results of an earlier identical request, if its manifest and files are still in the store."""
+    stored = store.get_json(request_id, RESULTS_MANIFEST)
+    if not stored:
+        return None
+    key = stored.get("artifact_key", request_id)
+    for field in ("pdf_path", "brf_path"):
+        path = store.get(key, os.path.basename(stored.get(field, ""))) if stored.get(field) else None
+        if path is None:
+            return None
+        # The store may have moved since the manifest was written
+        stored[field] = path
+    return stored
+
@@ -0,0 +1,71 @@
+import sys
+import os
+
+# Add parent directory to path to import backend modules if needed
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.LLM.providers.base import LLMProvider
+from backend.agents.response_parser import parse_response, SCHEMAS
+from backend.agents.transcript_digest import transcript_material, transcript_prefix
+
+# Agents 4-6 in one call: Summary, Study Notes and Q&A as a single structured response.
+# Small local models pay prompt evaluation over the whole transcript on every round trip,
+# so asking for all three artifacts at once saves two full passes over the input.
+
+def validate_artifacts(data: dict) -> dict:
+    """
+    Checks on top of SCHEMAS["batch"] (which parse_response applies first): every artifact must
+    be non-empty. Returns the normalized dict (only the expected keys) or raises ValueError.
+    """
+    if not data["summary"].strip():
+        raise ValueError("'summary' must not be empty")
+    if not data["notes"]:
+        raise ValueError("'notes' must not be empty")
+    if not data["questions"]:
+        raise ValueError("'questions' must not be empty")
+
+    return {
+        "summary": data["summary"].strip(),
+        "notes": data["notes"],
+        "questions": [{"question": q["question"], "answer": q["answer"]} for q in data["questions"]],
+    }
+
+def generate_all_artifacts(transcript: str, context: dict, llm_provider: LLMProvider = None,
+                           digest: dict = None) -> dict:
+    """
+    Generates summary, notes and Q&A in a single LLM call.
+    Returns {"summary": str, "notes": [...], "questions": [...]}, or {"error": str} if the
+    response could not be parsed or validated (the caller then falls back to per-agent calls).
+    """
+    print(f"[BatchAgent] Generating summary, notes and Q&A in one call...")
+
+    if not llm_provider:
+        return {"error": "No LLM Provider provided"}
+
+    topic = context.get("topic", "General")
+    intent = context.get("intent", "General")
+
+    # The transcript goes first (as the shared prefix), the task after it
+    prompt = f"""
+    The video above is about "{topic}" and appears to be a "{intent}".
+    Produce study material from it. Return ONLY a JSON object with exactly these keys:
+    - "summary": String (comprehensive yet concise summary)
+    - "notes": List of Strings (detailed bullet-point study notes: key definitions, processes, important facts)
+    - "questions": List of 5 objects, each with "question" and "answer" keys (exam-style)
+    """
+
+    try:
+        material = transcript_material(transcript, llm_provider, digest, purpose="a summary, study notes and exam questions")
+        content = llm_provider.generate(
+            prompt=prompt,
+            prefix=transcript_prefix(material),
+            system_message="You are an educational content generator. Output valid JSON only.",
+            temperature=0.5
+        )
+
+        return parse_response(content, SCHEMAS["batch"], llm_provider=llm_provider,
+                              system_message="You are an educational content generator. Output valid JSON only.",
+                              validator=validate_artifacts)
+    except Exception as e:
+        print(f"[BatchAgent] Error: {e}")
+        return {"error": str(e)}
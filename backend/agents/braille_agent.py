@@ -5,39 +5,29 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 try:
-    from backend.modules.braille_converter import text_to_braille
+    from backend.modules.braille_converter import translate_document
 except ImportError:
     # Fallback if path issues occur
-    def text_to_braille(text):
-        return f"[Braille Conversion Error: Module not found]"
+    def translate_document(document, grade=None, workers=None):
+        return {"error": "[Braille Conversion Error: Module not found]"}
 
 # Agent 7: Braille Conversion
 def convert_to_braille(summary: str, notes: list, qa: list) -> dict:
     """
     Converts summary, notes, and Q&A to Braille.
+    All fields are translated together in one batched pass (see translate_document).
     """
     print(f"[BrailleAgent] Converting content to Braille...")
     
     try:
-        # Convert Summary
-        braille_summary = text_to_braille(summary)
-        
-        # Convert Notes
-        braille_notes = [text_to_braille(note) for note in notes]
-        
-        # Convert Q&A
-        braille_qa = []
-        for item in qa:
-            braille_qa.append({
-                "question": text_to_braille(item.get("question", "")),
-                "answer": text_to_braille(item.get("answer", ""))
-            })
-            
-        return {
-            "braille_summary": braille_summary,
-            "braille_notes": braille_notes,
-            "braille_qa": braille_qa
-        }
+        return translate_document({
+            "braille_summary": summary,
+            "braille_notes": list(notes),
+            "braille_qa": [
+                {"question": item.get("question", ""), "answer": item.get("answer", "")}
+                for item in qa
+            ]
+        })
     except Exception as e:
         print(f"[BrailleAgent] Error: {e}")
         return {"error": str(e)}
@@ -0,0 +1,70 @@
+import os
+import sys
+
+# Add parent directory to path to import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.modules.braille_converter import text_to_braille
+from backend.modules.brf_formatter import BrfWriter
+
+# Transcript slices translated at a time when it is included in the BRF
+TRANSCRIPT_CHUNK_CHARS = 8000
+
+def _transcript_chunks(transcript: str):
+    """Yields the transcript in Braille, slice by slice (cut on whitespace)."""
+    start = 0
+    while start < len(transcript):
+        end = min(len(transcript), start + TRANSCRIPT_CHUNK_CHARS)
+        if end < len(transcript):
+            space = transcript.find(" ", end)
+            end = len(transcript) if space == -1 else space + 1
+        yield text_to_braille(transcript[start:end])
+        start = end
+
+# Agent 9: BRF (embosser-ready Braille) Generation
+def generate_braille_brf(results: dict, output_filename: str = "study_material.brf",
+                         include_transcript: bool = False, output_path: str = None) -> str:
+    """
+    Writes the Braille study material as a paginated BRF file (40 cells x 25 lines),
+    page by page. Returns the absolute path to the file, or "" on failure.
+    :param include_transcript: Also emboss the full transcript (translated and written in slices).
+    :param output_path: Exact file to write (e.g. an artifact store temp path); defaults to downloads/<output_filename>.
+    """
+    print(f"[BRFAgent] Generating BRF: {output_path or output_filename}")
+
+    if output_path is None:
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        output_dir = os.path.join(current_dir, "..", "downloads")
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.abspath(os.path.join(output_dir, output_filename))
+
+    braille_data = results.get("braille", {})
+    topic = results.get("context", {}).get("topic", "Study Material")
+
+    try:
+        # newline="": the writer emits BRF's CRLF line ends itself
+        with open(output_path, "w", encoding="ascii", newline="") as f, BrfWriter(f) as brf:
+            brf.heading(text_to_braille(topic))
+            brf.paragraph(text_to_braille(f"Language: {results.get('language', 'Unknown')}"))
+
+            brf.heading(text_to_braille("Summary"))
+            brf.paragraph(braille_data.get("braille_summary", ""))
+
+            brf.heading(text_to_braille("Study Notes"))
+            for note in braille_data.get("braille_notes", []):
+                brf.paragraph(note, indent=0, runover=2)
+
+            brf.heading(text_to_braille("Exam Questions"))
+            for i, item in enumerate(braille_data.get("braille_qa", [])):
+                brf.paragraph(f"{text_to_braille(f'Q{i + 1}:')} {item.get('question', '')}", indent=0, runover=2)
+                brf.paragraph(f"{text_to_braille('Answer:')} {item.get('answer', '')}", indent=0, runover=2)
+
+            if include_transcript and results.get("transcript"):
+                brf.heading(text_to_braille("Transcript"))
+                brf.paragraphs(_transcript_chunks(results["transcript"]))
+
+        print(f"[BRFAgent] BRF generated successfully: {output_path}")
+        return output_path
+    except Exception as e:
+        print(f"[BRFAgent] Error writing BRF: {e}")
+        return ""
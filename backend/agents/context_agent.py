@@ -1,6 +1,3 @@
-import json
-
-
 import sys
 import os
 
@@ -8,9 +5,11 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from backend.LLM.providers.base import LLMProvider
+from backend.agents.response_parser import parse_response, SCHEMAS
+from backend.agents.transcript_digest import transcript_material, transcript_prefix
 
 # Agent 3: Context Understanding
-def analyze_context(transcript: str, llm_provider: LLMProvider = None) -> dict:
+def analyze_context(transcript: str, llm_provider: LLMProvider = None, digest: dict = None) -> dict:
     """
     Analyzes the transcript to extract topic, subtopics, key concepts, and intent.
     """
@@ -23,30 +22,26 @@ def analyze_context(transcript: str, llm_provider: LLMProvider = None) -> dict:
         return {"topic": "Unknown", "subtopics": [], "key_points": [], "intent": "Unknown"}
 
     prompt = f"""
-    Analyze the following educational video transcript and extract structured context.
+    Analyze the educational video transcript above and extract structured context.
     Return ONLY a JSON object with the following keys:
     - "topic": String (Main topic)
     - "subtopics": List of Strings
     - "key_points": List of Strings (Core concepts taught)
     - "intent": String (e.g., "Lecture", "Tutorial", "Vlog", "News")
-
-    Transcript (first 15000 chars):
-    {transcript[:15000]}
     """
     
     try:
+        # Shared digest if the orchestrator built one, otherwise the whole (condensed) transcript
+        material = transcript_material(transcript, llm_provider, digest, purpose="a topic and context analysis")
         content = llm_provider.generate(
             prompt=prompt,
+            prefix=transcript_prefix(material),
             system_message="You are an educational AI assistant. Output valid JSON only.",
             temperature=0.3
         )
 
-        if content.startswith("```json"):
-            content = content.replace("```json", "").replace("```", "")
-        if content.startswith("```"):
-            content = content.replace("```", "")
-            
-        return json.loads(content)
+        return parse_response(content, SCHEMAS["context"], llm_provider=llm_provider,
+                              system_message="You are an educational AI assistant. Output valid JSON only.")
     except Exception as e:
         print(f"[ContextAgent] Error: {e}")
         return {"error": str(e)}
@@ -7,7 +7,10 @@ import json
 # derived from video metadata to avoid potentially long audio downloads just for detection
 
 def get_video_metadata(youtube_url: str):
-    """Fetches video title and description using yt-dlp."""
+    """Fetches video title and description using yt-dlp (local files: tags or file name)."""
+    path = local_path(youtube_url)
+    if path is not None:
+        return local_metadata(path)
     cmd = [
         "yt-dlp",
         "--dump-json",
@@ -34,6 +37,8 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from backend.LLM.providers.base import LLMProvider
+from backend.audio.sources import local_path, local_metadata
+from backend.agents.response_parser import parse_response, SCHEMAS
 
 def detect_language(youtube_url: str, llm_provider: LLMProvider = None) -> dict:
     """
@@ -68,13 +73,9 @@ def detect_language(youtube_url: str, llm_provider: LLMProvider = None) -> dict:
             temperature=0.0
         )
         
-        # Handle code blocks if present
-        if content.startswith("```json"):
-            content = content.replace("```json", "").replace("```", "")
-        if content.startswith("```"): # Handle generic code block
-            content = content.replace("```", "")
-            
-        result = json.loads(content)
+        # Tolerates code fences / surrounding prose; one repair prompt if the JSON is invalid
+        result = parse_response(content, SCHEMAS["language"], llm_provider=llm_provider,
+                                system_message="You are a language detection system. Output valid JSON only.")
         return result
     except Exception as e:
         print(f"[LanguageDetector] Error: {e}")
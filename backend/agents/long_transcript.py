@@ -0,0 +1,151 @@
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path to import backend modules if needed
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.LLM.providers.base import LLMProvider
+
+# Map-reduce processing for transcripts that don't fit in one prompt.
+# The transcript is split into token-bounded chunks on sentence boundaries and each chunk
+# is condensed by the LLM concurrently (map). Agents use condense_transcript() so long
+# lectures are covered end to end instead of being cut off after the first 15,000
+# characters; the agent's own prompt over the ordered section notes is the reduce step.
+
+# Transcripts up to this many tokens are sent to the agents as-is
+TRANSCRIPT_TOKEN_BUDGET = int(os.environ.get("TRANSCRIPT_TOKEN_BUDGET", "3500"))
+# Size of each map chunk; small enough for a 4k-context local model plus instructions
+CHUNK_TOKENS = int(os.environ.get("TRANSCRIPT_CHUNK_TOKENS", "2500"))
+# Max map calls in flight across all agents in the process
+MAP_CONCURRENCY = int(os.environ.get("LLM_MAP_CONCURRENCY", "4"))
+# Upper bound on re-condensing rounds, in case the model doesn't shrink its input
+MAX_CONDENSE_ROUNDS = 3
+
+_map_slots = threading.BoundedSemaphore(MAP_CONCURRENCY)
+
+# Sentence ends, including the Devanagari danda used in Hindi/Marathi text
+_SENTENCE_END = re.compile(r"(?<=[.!?।॥])\s+")
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text, disallowed_special=()))
+except Exception:
+    def count_tokens(text: str) -> int:
+        # Rough estimate when tiktoken (or its encoding files) is unavailable
+        return max(1, (len(text) + 3) // 4)
+
+def chunk_transcript(transcript: str, max_tokens: int = CHUNK_TOKENS) -> list:
+    """
+    Splits a transcript into chunks of at most max_tokens, cutting on sentence boundaries.
+    Sentences longer than a chunk (e.g. unpunctuated ASR output) are split on words.
+    """
+    chunks = []
+    current, current_tokens = [], 0
+
+    def flush():
+        nonlocal current, current_tokens
+        if current:
+            chunks.append(" ".join(current))
+        current, current_tokens = [], 0
+
+    for sentence in _SENTENCE_END.split(transcript.strip()):
+        tokens = count_tokens(sentence + " ")
+        if tokens > max_tokens:
+            flush()
+            for word in sentence.split():
+                word_tokens = count_tokens(word + " ")
+                if current_tokens + word_tokens > max_tokens:
+                    flush()
+                current.append(word)
+                current_tokens += word_tokens
+            flush()
+            continue
+        if current_tokens + tokens > max_tokens:
+            flush()
+        current.append(sentence)
+        current_tokens += tokens
+    flush()
+    return chunks
+
+def _map_chunk(llm_provider: LLMProvider, instruction: str, chunk: str, index: int, total: int,
+               system_message: str, temperature: float) -> str:
+    prompt = f"""
+    {instruction}
+
+    Transcript part {index + 1} of {total}:
+    {chunk}
+    """
+    try:
+        with _map_slots:
+            return llm_provider.generate(prompt=prompt, system_message=system_message, temperature=temperature)
+    except Exception as e:
+        # One failed call shouldn't lose the whole transcript: keep this part as it is
+        print(f"[LongTranscript] Part {index + 1} of {total} failed, keeping its raw text: {e}")
+        return chunk
+
+def map_chunks(chunks: list, llm_provider: LLMProvider, instruction: str,
+               system_message: str = "You are an expert note taker. Be concise and factual.",
+               temperature: float = 0.3, max_concurrency: int = MAP_CONCURRENCY) -> list:
+    """
+    Runs `instruction` over every chunk concurrently; returns the outputs in chunk order.
+    A chunk whose call fails is returned unchanged.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(chunks)))) as executor:
+        futures = [
+            executor.submit(_map_chunk, llm_provider, instruction, chunk, i, len(chunks), system_message, temperature)
+            for i, chunk in enumerate(chunks)
+        ]
+        return [f.result() for f in futures]
+
+def _join_sections(partials: list) -> str:
+    return "\n\n".join(f"Section {i + 1}:\n{p.strip()}" for i, p in enumerate(partials))
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cuts text down to at most max_tokens (on a word boundary where possible)."""
+    tokens = count_tokens(text)
+    while tokens > max_tokens and len(text) > 1:
+        cut = max(1, int(len(text) * max_tokens / tokens * 0.95))
+        text = text[:cut].rsplit(" ", 1)[0] if " " in text[:cut] else text[:cut]
+        tokens = count_tokens(text)
+    return text
+
+def condense_transcript(transcript: str, llm_provider: LLMProvider, purpose: str = "study material",
+                        token_budget: int = TRANSCRIPT_TOKEN_BUDGET) -> str:
+    """
+    Returns text for an agent prompt that covers the whole transcript within token_budget.
+    Short transcripts are returned unchanged; long ones are condensed chunk by chunk
+    (concurrently) into ordered section notes, repeatedly if needed. If condensing can't get
+    under the budget (e.g. the map calls failed), the result is truncated to it.
+    """
+    if count_tokens(transcript) <= token_budget:
+        return transcript
+
+    chunks = chunk_transcript(transcript)
+    print(f"[LongTranscript] Condensing {len(chunks)} chunks for {purpose}...")
+    instruction = (
+        f"Condense this part of a lecture transcript into dense notes for producing {purpose}. "
+        "Keep all key facts, definitions, examples and terminology. Use the transcript's language."
+    )
+    material = _join_sections(map_chunks(chunks, llm_provider, instruction))
+    for _ in range(MAX_CONDENSE_ROUNDS):
+        tokens = count_tokens(material)
+        if tokens <= token_budget:
+            break
+        chunks = chunk_transcript(material)
+        if len(chunks) <= 1:
+            break
+        condensed = _join_sections(map_chunks(chunks, llm_provider, instruction))
+        if count_tokens(condensed) >= tokens:
+            # No progress (e.g. every call failed): stop retrying
+            break
+        material = condensed
+    if count_tokens(material) > token_budget:
+        print(f"[LongTranscript] Still over {token_budget} tokens after condensing; truncating")
+        material = truncate_to_tokens(material, token_budget)
+    return material
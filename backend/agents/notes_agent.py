@@ -1,6 +1,4 @@
 
-import json
-
 import sys
 import os
 
@@ -8,9 +6,11 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from backend.LLM.providers.base import LLMProvider
+from backend.agents.response_parser import parse_response, SCHEMAS
+from backend.agents.transcript_digest import transcript_material, transcript_prefix
 
 # Agent 5: Study Notes
-def generate_study_notes(transcript: str, context: dict, llm_provider: LLMProvider = None) -> dict:
+def generate_study_notes(transcript: str, context: dict, llm_provider: LLMProvider = None, digest: dict = None) -> dict:
     """
     Generates structured study notes.
     """
@@ -22,27 +22,23 @@ def generate_study_notes(transcript: str, context: dict, llm_provider: LLMProvid
     topic = context.get("topic", "General")
     
     prompt = f"""
-    Create detailed, bullet-point study notes for the following video transcript about "{topic}".
+    Create detailed, bullet-point study notes for the video transcript above about "{topic}".
     Focus on key definitions, processes, and important facts.
     Return ONLY a JSON object with a key "notes" containing a list of strings.
-    
-    Transcript (truncated):
-    {transcript[:15000]}
     """
     
     try:
+        # Shared digest if the orchestrator built one, otherwise the whole (condensed) transcript
+        material = transcript_material(transcript, llm_provider, digest, purpose="study notes")
         content = llm_provider.generate(
             prompt=prompt,
+            prefix=transcript_prefix(material),
             system_message="You are a study aid generator. Output valid JSON only.",
             temperature=0.5
         )
 
-        if content.startswith("```json"):
-            content = content.replace("```json", "").replace("```", "")
-        if content.startswith("```"):
-            content = content.replace("```", "")
-            
-        return json.loads(content)
+        return parse_response(content, SCHEMAS["notes"], llm_provider=llm_provider,
+                              system_message="You are a study aid generator. Output valid JSON only.")
     except Exception as e:
         print(f"[NotesAgent] Error: {e}")
         return {"notes": [], "error": str(e)}
@@ -1,4 +1,8 @@
 import os
+import glob
+import shutil
+import threading
+import subprocess
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -6,178 +10,370 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
-# Agent 8: PDF Generation
-def generate_braille_pdf(results: dict, output_filename: str = "study_material.pdf") -> str:
+# Fonts are probed and registered once per process (see get_pdf_fonts).
+# Windows font paths are tried first, then fontconfig on Linux (or a scan of the usual
+# font directories when fc-list is missing), then macOS. PDF_FONT / PDF_BRAILLE_FONT
+# (paths to .ttf files) override the discovery.
+WINDOWS_FONT_PATHS = [
+    r"C:\Windows\Fonts\Nirmala.ttf", # Good for Indic
+    r"C:\Windows\Fonts\arialuni.ttf",
+    r"C:\Windows\Fonts\seguiemj.ttf" # Braille might be here
+]
+MACOS_FONT_PATHS = [
+    "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "/System/Library/Fonts/Apple Braille.ttf",
+]
+LINUX_FONT_DIRS = ["/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.local/share/fonts")]
+# Preferred Linux fonts, in order (file names as shipped by the distributions)
+LINUX_FONT_FILES = [
+    "NotoSansDevanagari-Regular.ttf", "Lohit-Devanagari.ttf", "Lohit-Marathi.ttf",
+    "FreeSerif.ttf", "FreeSans.ttf", "DejaVuSans.ttf",
+]
+
+DEVANAGARI_SAMPLE = "क"
+BRAILLE_SAMPLE = "⠁"
+
+_fonts = None
+_fonts_lock = threading.Lock()
+_loaded = {}  # path -> TTFont (or None if it can't be loaded)
+
+def _fontconfig_paths(sample: str) -> list:
+    """Font files covering `sample` according to fontconfig (empty if fc-list is unavailable)."""
+    if not shutil.which("fc-list"):
+        return []
+    try:
+        output = subprocess.run(
+            ["fc-list", f":charset={ord(sample):x}", "--format", "%{file}\n"],
+            capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return []
+    paths = [line.strip() for line in output.splitlines() if line.strip().lower().endswith(".ttf")]
+    # Preferred fonts first, the rest in a stable order
+    rank = {name: i for i, name in enumerate(LINUX_FONT_FILES)}
+    return sorted(set(paths), key=lambda p: (rank.get(os.path.basename(p), len(rank)), p))
+
+def _scanned_linux_paths() -> list:
+    paths = []
+    for name in LINUX_FONT_FILES:
+        for font_dir in LINUX_FONT_DIRS:
+            paths.extend(glob.glob(os.path.join(font_dir, "**", name), recursive=True))
+    return paths
+
+def _candidate_paths(sample: str, override: str) -> list:
+    paths = [override] if override else []
+    paths += WINDOWS_FONT_PATHS
+    paths += _fontconfig_paths(sample) or _scanned_linux_paths()
+    paths += MACOS_FONT_PATHS
+    return paths
+
+def _load_font(path: str):
+    if path not in _loaded:
+        font = None
+        if os.path.exists(path):
+            # Basic font name from filename
+            f_name = os.path.splitext(os.path.basename(path))[0].replace(" ", "")
+            try:
+                font = TTFont(f_name, path)
+                pdfmetrics.registerFont(font)
+            except Exception as e:
+                print(f"[PDFAgent] Skipping font {path}: {e}")
+                font = None
+        _loaded[path] = font
+    return _loaded[path]
+
+def _find_font(sample: str, override: str):
+    for path in _candidate_paths(sample, override):
+        font = _load_font(path)
+        if font is not None and ord(sample) in font.face.charToGlyph:
+            return font.fontName
+    return None
+
+def get_pdf_fonts() -> tuple:
     """
-    Generates a PDF book with vernacular text and corresponding Braille.
-    Returns the absolute path to the generated PDF.
+    Returns (text_font, braille_font), discovering and registering the fonts on first use.
+    Falls back to Helvetica (Braille then renders as boxes).
     """
-    print(f"[PDFAgent] Generating PDF: {output_filename}")
-    
-    # Path setup
-    # Determine safe output directory (e.g., inside backend/static or temp)
-    # For now, let's put it in the backend root or a 'downloads' folder
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    output_dir = os.path.join(current_dir, "..", "downloads")
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        
-    output_path = os.path.join(output_dir, output_filename)
-    output_path = os.path.abspath(output_path)
+    global _fonts
+    with _fonts_lock:
+        if _fonts is None:
+            text_font = _find_font(DEVANAGARI_SAMPLE, os.environ.get("PDF_FONT")) or "Helvetica"
+            braille_font = _find_font(BRAILLE_SAMPLE, os.environ.get("PDF_BRAILLE_FONT")) or text_font
+            print(f"[PDFAgent] Using Fonts: text={text_font}, braille={braille_font}")
+            _fonts = (text_font, braille_font)
+        return _fonts
 
-    doc = SimpleDocTemplate(output_path, pagesize=A4)
-    story = []
-    
-    # Font Registration
-    # Attempt to find a font that supports Braille and Indic scripts
-    # Windows typically has 'Nirmala UI' or 'Arial Unicode MS'
-    font_name = "Helvetica" # Fallback
-    braille_font_name = "Helvetica"
-    
-    try:
-        # Check for Windows Fonts
-        font_paths = [
-            r"C:\Windows\Fonts\Nirmala.ttf", # Good for Indic
-            r"C:\Windows\Fonts\arialuni.ttf",
-            r"C:\Windows\Fonts\seguiemj.ttf" # Braille might be here
-        ]
-        
-        registered_font = None
-        for path in font_paths:
-            if os.path.exists(path):
-                # Basic font name from filename
-                f_name = os.path.basename(path).split(".")[0]
-                # Avoid re-registering if already done in a previous run logic (though agent is fresh usually)
-                try:
-                    pdfmetrics.registerFont(TTFont(f_name, path))
-                    registered_font = f_name
-                    break
-                except:
-                    continue
+_styles = None
+
+def _get_styles() -> dict:
+    global _styles
+    # Fonts first: get_pdf_fonts takes the same (non-reentrant) lock
+    font_name, braille_font_name = get_pdf_fonts()
+    with _fonts_lock:
+        if _styles is not None:
+            return _styles
+        styles = getSampleStyleSheet()
         
-        if registered_font:
-            font_name = registered_font
-            # Braille support usually requires a specific font, but Nirmala might handle standard unicode braille
-            # If not, we fall back to boxes
-            braille_font_name = registered_font
-            print(f"[PDFAgent] Using Font: {font_name}")
-            
-    except Exception as e:
-        print(f"[PDFAgent] Font registration warning: {e}")
+        # Custom Styles
+        _styles = {
+            "title": ParagraphStyle(
+                'Title',
+                parent=styles['Title'],
+                fontName=font_name,
+                fontSize=24,
+                spaceAfter=20
+            ),
+            "heading": ParagraphStyle(
+                'Heading',
+                parent=styles['Heading2'],
+                fontName=font_name,
+                fontSize=18,
+                spaceBefore=15,
+                spaceAfter=10,
+                textColor=colors.darkblue
+            ),
+            "text": ParagraphStyle(
+                'Body',
+                parent=styles['Normal'],
+                fontName=font_name,
+                fontSize=12,
+                spaceAfter=6,
+                leading=14
+            ),
+            "braille": ParagraphStyle(
+                'Braille',
+                parent=styles['Normal'],
+                fontName=braille_font_name, # Ideally a braille font
+                fontSize=14,
+                spaceAfter=12,
+                textColor=colors.dimgray,
+                leading=16
+            ),
+        }
+        return _styles
 
-    styles = getSampleStyleSheet()
-    
-    # Custom Styles
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Title'],
-        fontName=font_name,
-        fontSize=24,
-        spaceAfter=20
-    )
-    
-    heading_style = ParagraphStyle(
-        'Heading',
-        parent=styles['Heading2'],
-        fontName=font_name,
-        fontSize=18,
-        spaceBefore=15,
-        spaceAfter=10,
-        textColor=colors.darkblue
-    )
-    
-    text_style = ParagraphStyle(
-        'Body',
-        parent=styles['Normal'],
-        fontName=font_name,
-        fontSize=12,
-        spaceAfter=6,
-        leading=14
-    )
-    
-    braille_style = ParagraphStyle(
-        'Braille',
-        parent=styles['Normal'],
-        fontName=braille_font_name, # Ideally a braille font
-        fontSize=14,
-        spaceAfter=12,
-        textColor=colors.dimgray,
-        leading=16
-    )
-
-    # 1. Title Page
+# --- Sections (generators, so long notes / transcripts never become one big list) ---
+
+def title_flowables(results: dict):
+    styles = _get_styles()
     context = results.get('context', {})
     topic = context.get('topic', 'Study Material')
     
-    story.append(Paragraph(topic, title_style))
-    story.append(Spacer(1, 12))
-    story.append(Paragraph(f"Language: {results.get('language', 'Unknown')}", text_style))
-    story.append(Spacer(1, 24))
-    
-    # 2. Executive Summary Section
-    story.append(Paragraph("1. Executive Summary", heading_style))
+    yield Paragraph(topic, styles["title"])
+    yield Spacer(1, 12)
+    yield Paragraph(f"Language: {results.get('language', 'Unknown')}", styles["text"])
+    yield Spacer(1, 24)
+
+def summary_flowables(results: dict):
+    styles = _get_styles()
+    yield Paragraph("1. Executive Summary", styles["heading"])
     summary_text = results.get('summary', "No summary.")
-    story.append(Paragraph(summary_text, text_style))
+    yield Paragraph(summary_text, styles["text"])
     
     # Braille Summary
-    braille_data = results.get('braille', {})
-    braille_summary = braille_data.get('braille_summary', '')
+    braille_summary = results.get('braille', {}).get('braille_summary', '')
     if braille_summary:
-        story.append(Spacer(1, 5))
-        story.append(Paragraph(braille_summary, braille_style))
+        yield Spacer(1, 5)
+        yield Paragraph(braille_summary, styles["braille"])
     
-    story.append(PageBreak())
+    yield PageBreak()
 
-    # 3. Study Notes Section
-    story.append(Paragraph("2. Study Notes", heading_style))
+def notes_flowables(results: dict):
+    styles = _get_styles()
+    yield Paragraph("2. Study Notes", styles["heading"])
     notes = results.get('notes', [])
-    braille_notes = braille_data.get('braille_notes', [])
+    braille_notes = results.get('braille', {}).get('braille_notes', [])
     
     for i, note in enumerate(notes):
         # Text Note
-        story.append(Paragraph(f"• {note}", text_style))
+        yield Paragraph(f"• {note}", styles["text"])
         
         # Braille Note
         if i < len(braille_notes):
-            story.append(Paragraph(braille_notes[i], braille_style))
+            yield Paragraph(braille_notes[i], styles["braille"])
         
-        story.append(Spacer(1, 8))
+        yield Spacer(1, 8)
         
-    story.append(PageBreak())
-    
-    # 4. Q&A Section
-    story.append(Paragraph("3. Exam Questions", heading_style))
+    yield PageBreak()
+
+def qa_flowables(results: dict):
+    styles = _get_styles()
+    yield Paragraph("3. Exam Questions", styles["heading"])
     qa_list = results.get('qa', [])
-    braille_qa = braille_data.get('braille_qa', [])
+    braille_qa = results.get('braille', {}).get('braille_qa', [])
     
     for i, item in enumerate(qa_list):
         q_text = item.get('question', '')
         a_text = item.get('answer', '')
         
         # Question
-        story.append(Paragraph(f"Q{i+1}: {q_text}", text_style))
+        yield Paragraph(f"Q{i+1}: {q_text}", styles["text"])
         
         # Braille Question
         if i < len(braille_qa):
             bq = braille_qa[i].get('question', '')
-            if bq: story.append(Paragraph(bq, braille_style))
+            if bq: yield Paragraph(bq, styles["braille"])
             
-        story.append(Spacer(1, 4))
+        yield Spacer(1, 4)
         
         # Answer
-        story.append(Paragraph(f"<b>Answer:</b> {a_text}", text_style))
+        yield Paragraph(f"<b>Answer:</b> {a_text}", styles["text"])
         
         # Braille Answer
         if i < len(braille_qa):
             ba = braille_qa[i].get('answer', '')
-            if ba: story.append(Paragraph(ba, braille_style))
+            if ba: yield Paragraph(ba, styles["braille"])
             
-        story.append(Spacer(1, 12))
+        yield Spacer(1, 12)
 
-    try:
-        doc.build(story)
-        print(f"[PDFAgent] PDF generated successfully: {output_path}")
-        return output_path
-    except Exception as e:
-        print(f"[PDFAgent] Error building PDF: {e}")
-        return ""
+def transcript_flowables(braille_chunks):
+    """Full transcript in Braille, one paragraph per chunk, pulled lazily from the iterator."""
+    styles = _get_styles()
+    yield PageBreak()
+    yield Paragraph("4. Transcript (Braille)", styles["heading"])
+    for chunk in braille_chunks:
+        if chunk.strip():
+            yield Paragraph(chunk, styles["braille"])
+
+SECTION_ORDER = ("title", "summary", "notes", "qa", "transcript")
+
+# Marks the end of a section in the story, so the layout doesn't wait for the next section
+# while it still has flowables to place
+_SECTION_END = object()
+
+class _FlowableStream(list):
+    """
+    List facade over a flowable iterator for platypus' build(), which consumes its story
+    from the front: items are pulled from the iterator only a few at a time, and not past
+    the end of a section while earlier flowables are still waiting to be laid out.
+    Relies on BaseDocTemplate.build / handle_flowable (reportlab 4.x and 5.x, see
+    requirements.txt) only using len(), indexing, del [0] and slice inserts at the front.
+    Iterating, slicing or pop() see just the buffered items.
+    """
+    LOOKAHEAD = 16
+
+    def __init__(self, source):
+        super().__init__()
+        self._source = iter(source)
+        self._at_section_end = False
+
+    def _fill(self):
+        while self._source is not None and list.__len__(self) < self.LOOKAHEAD:
+            if self._at_section_end:
+                if list.__len__(self):
+                    return  # lay out what we have before waiting for the next section
+                self._at_section_end = False
+            try:
+                item = next(self._source)
+            except StopIteration:
+                self._source = None
+                return
+            if item is _SECTION_END:
+                self._at_section_end = True
+            else:
+                self.append(item)
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+class BraillePdfWriter:
+    """
+    Lays out the PDF on a background thread while the sections are still being produced.
+    Sections can be added in any order (as the agents finish); they are written in
+    SECTION_ORDER. close() waits for the layout to finish and returns the output path.
+    """
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self._sections = {}
+        self._closed = False
+        self._aborted = False
+        self._error = None
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._build, name="pdf-writer", daemon=True)
+        self._thread.start()
+
+    def add_section(self, name: str, flowables):
+        """:param flowables: Iterable of flowables (typically one of the *_flowables generators)."""
+        if name not in SECTION_ORDER:
+            raise ValueError(f"Unknown PDF section '{name}'")
+        with self._cond:
+            self._sections[name] = flowables
+            self._cond.notify_all()
+
+    def _story(self):
+        for name in SECTION_ORDER:
+            with self._cond:
+                self._cond.wait_for(lambda: name in self._sections or self._closed)
+                if self._aborted:
+                    return
+                section = self._sections.pop(name, None)
+            if section is not None:
+                yield from section
+                yield _SECTION_END
+
+    def _build(self):
+        try:
+            doc = SimpleDocTemplate(self.output_path, pagesize=A4)
+            doc.build(_FlowableStream(self._story()))
+        except Exception as e:
+            self._error = e
+
+    def close(self) -> str:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self._aborted:
+            if os.path.exists(self.output_path):
+                os.remove(self.output_path)
+            return ""
+        if self._error is not None:
+            print(f"[PDFAgent] Error building PDF: {self._error}")
+            return ""
+        print(f"[PDFAgent] PDF generated successfully: {self.output_path}")
+        return self.output_path
+
+    def abort(self):
+        """Stops the writer without producing a document (e.g. when the workflow failed)."""
+        with self._cond:
+            self._aborted = True
+        self.close()
+
+def pdf_output_path(output_filename: str) -> str:
+    # Path setup
+    # Determine safe output directory (e.g., inside backend/static or temp)
+    # For now, let's put it in the backend root or a 'downloads' folder
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    output_dir = os.path.join(current_dir, "..", "downloads")
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.abspath(os.path.join(output_dir, output_filename))
+
+# Agent 8: PDF Generation
+def generate_braille_pdf(results: dict, output_filename: str = "study_material.pdf",
+                         transcript_braille_chunks=None) -> str:
+    """
+    Generates a PDF book with vernacular text and corresponding Braille.
+    Returns the absolute path to the generated PDF.
+    :param transcript_braille_chunks: Optional iterable of Braille transcript chunks, appended
+                                      as a final section and consumed lazily.
+    """
+    print(f"[PDFAgent] Generating PDF: {output_filename}")
+    
+    writer = BraillePdfWriter(pdf_output_path(output_filename))
+    writer.add_section("title", title_flowables(results))
+    writer.add_section("summary", summary_flowables(results))
+    writer.add_section("notes", notes_flowables(results))
+    writer.add_section("qa", qa_flowables(results))
+    if transcript_braille_chunks is not None:
+        writer.add_section("transcript", transcript_flowables(transcript_braille_chunks))
+    return writer.close()
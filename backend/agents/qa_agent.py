@@ -1,6 +1,4 @@
 
-import json
-
 import sys
 import os
 
@@ -8,9 +6,11 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from backend.LLM.providers.base import LLMProvider
+from backend.agents.response_parser import parse_response, SCHEMAS
+from backend.agents.transcript_digest import transcript_material, transcript_prefix
 
 # Agent 6: Q&A / Exam Prep
-def generate_qa(transcript: str, context: dict, llm_provider: LLMProvider = None) -> dict:
+def generate_qa(transcript: str, context: dict, llm_provider: LLMProvider = None, digest: dict = None) -> dict:
     """
     Generates Q&A pairs for exam preparation.
     """
@@ -24,24 +24,20 @@ def generate_qa(transcript: str, context: dict, llm_provider: LLMProvider = None
     prompt = f"""
     Generate 5 important exam-style questions and answers based on the transcript about "{topic}".
     Return ONLY a JSON object with a key "questions" containing a list of objects, each with "question" and "answer" keys.
-    
-    Transcript (truncated):
-    {transcript[:15000]}
     """
     
     try:
+        # Shared digest if the orchestrator built one, otherwise the whole (condensed) transcript
+        material = transcript_material(transcript, llm_provider, digest, purpose="exam questions and answers")
         content = llm_provider.generate(
             prompt=prompt,
+            prefix=transcript_prefix(material),
             system_message="You are a teacher creating an exam. Output valid JSON only.",
             temperature=0.5
         )
 
-        if content.startswith("```json"):
-            content = content.replace("```json", "").replace("```", "")
-        if content.startswith("```"):
-            content = content.replace("```", "")
-            
-        return json.loads(content)
+        return parse_response(content, SCHEMAS["qa"], llm_provider=llm_provider,
+                              system_message="You are a teacher creating an exam. Output valid JSON only.")
     except Exception as e:
         print(f"[QAAgent] Error: {e}")
         return {"questions": [], "error": str(e)}
@@ -0,0 +1,148 @@
+import re
+import json
+
+import sys
+import os
+
+# Add parent directory to path to import backend modules if needed
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.LLM.providers.base import LLMProvider
+
+# Shared structured-response parsing for the agents.
+# Finds the JSON value in an LLM response (so code fences, leading prose like
+# "Sure! Here is..." and trailing remarks are tolerated), validates it against a
+# per-agent schema and, if that fails, asks the model once for a corrected
+# response instead of failing the whole stage.
+
+# Schemas: a dict lists required keys, a one-element list means "list of", and a
+# type (or tuple of types) is checked with isinstance.
+SCHEMAS = {
+    "language": {"language": str},
+    "context": {"topic": str, "subtopics": [str], "key_points": [str], "intent": str},
+    "notes": {"notes": [str]},
+    "qa": {"questions": [{"question": str, "answer": str}]},
+    "digest": {"summary": str, "key_terms": [str], "sections": [str]},
+    "batch": {"summary": str, "notes": [str], "questions": [{"question": str, "answer": str}]},
+}
+
+MAX_REPAIR_ECHO_CHARS = 4000
+
+_OPENER_RE = re.compile(r"[{\[]")
+
+def iter_json(text: str):
+    """
+    Yields the JSON values (objects or arrays) embedded in `text`, in order.
+    Decoding is attempted at each "{" or "[": a value that decodes is yielded and scanning
+    resumes after it; prose brackets like "(see [1" fail to decode quickly and are skipped.
+    A bracket that only fails far into the text is re-scanned from the next bracket, so
+    pathological input is quadratic in the worst case.
+    """
+    decoder = json.JSONDecoder()
+    match = _OPENER_RE.search(text)
+    while match:
+        start = match.start()
+        try:
+            # Decode in place (no substring copy)
+            value, end = decoder.raw_decode(text, start)
+        except (ValueError, RecursionError):  # not JSON, or nested too deeply to decode
+            match = _OPENER_RE.search(text, start + 1)
+            continue
+        yield value
+        match = _OPENER_RE.search(text, end)
+
+def extract_json(text: str):
+    """
+    Returns the first JSON object embedded in `text` (or the first array if there is no
+    object), so code fences, leading prose and bracketed remarks like "[1]" are tolerated.
+    Raises ValueError if no JSON value is found.
+    """
+    first = None
+    for value in iter_json(text):
+        if isinstance(value, dict):
+            return value
+        if first is None:
+            first = value
+    if first is None:
+        raise ValueError("No JSON object found in response")
+    return first
+
+def validate(data, schema, path: str = "$") -> list:
+    """Returns a list of human-readable schema violations (empty if valid)."""
+    if isinstance(schema, dict):
+        if not isinstance(data, dict):
+            return [f"{path} must be an object"]
+        errors = []
+        for key, sub_schema in schema.items():
+            if key not in data:
+                errors.append(f"{path}.{key} is missing")
+            else:
+                errors.extend(validate(data[key], sub_schema, f"{path}.{key}"))
+        return errors
+    if isinstance(schema, list):
+        if not isinstance(data, list):
+            return [f"{path} must be a list"]
+        errors = []
+        for i, item in enumerate(data):
+            errors.extend(validate(item, schema[0], f"{path}[{i}]"))
+        return errors
+    if schema is float:
+        schema = (int, float)
+    if not isinstance(data, schema) or isinstance(data, bool) and schema is not bool:
+        name = schema.__name__ if isinstance(schema, type) else "/".join(t.__name__ for t in schema)
+        return [f"{path} must be of type {name}"]
+    return []
+
+def describe_schema(schema) -> str:
+    """JSON-like description of a schema for prompts, e.g. {"notes": [string, ...]}."""
+    if isinstance(schema, dict):
+        return "{" + ", ".join(f'"{k}": {describe_schema(v)}' for k, v in schema.items()) + "}"
+    if isinstance(schema, list):
+        return f"[{describe_schema(schema[0])}, ...]"
+    return {str: "string", int: "integer", float: "number", bool: "boolean"}.get(schema, "value")
+
+def _parse_once(content: str, schema, validator):
+    """Returns the first embedded JSON value that passes the schema (and validator)."""
+    error, shaped = None, False
+    for data in iter_json(content):
+        try:
+            errors = validate(data, schema)
+            if errors:
+                raise ValueError("; ".join(errors[:5]))
+            return validator(data) if validator else data
+        except ValueError as e:
+            # Report the first candidate of the schema's shape, not e.g. a "[1]" from the prose
+            if error is None or isinstance(data, type(schema)) and not shaped:
+                error, shaped = e, isinstance(data, type(schema))
+    if error is None:
+        raise ValueError("No JSON object found in response")
+    raise error
+
+def parse_response(content: str, schema, llm_provider: LLMProvider = None,
+                   system_message: str = "Output valid JSON only.", validator=None):
+    """
+    Extracts and validates the JSON in an agent response.
+    :param schema: One of SCHEMAS (or the same structure).
+    :param llm_provider: If given, one targeted repair prompt is sent when parsing/validation fails.
+                         It only echoes the bad response, not the original transcript.
+    :param validator: Optional extra check/normalizer; raises ValueError on invalid data.
+    Raises ValueError if no valid response could be obtained.
+    """
+    try:
+        return _parse_once(content, schema, validator)
+    except ValueError as e:
+        if llm_provider is None:
+            raise
+        error = e
+
+    print(f"[ResponseParser] Invalid response ({error}); requesting a repair...")
+    repair_prompt = f"""
+    Your previous response could not be used: {error}
+    Rewrite it as ONLY a JSON object with this structure (no prose, no code fences):
+    {describe_schema(schema)}
+
+    Previous response:
+    {content[:MAX_REPAIR_ECHO_CHARS]}
+    """
+    repaired = llm_provider.generate(prompt=repair_prompt, system_message=system_message, temperature=0.0)
+    return _parse_once(repaired, schema, validator)
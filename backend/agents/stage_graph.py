@@ -0,0 +1,72 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Minimal dependency-graph executor for the orchestrator.
+# Each stage runs as soon as all of its dependencies have finished; independent
+# stages (e.g. summary, notes and Q&A) run concurrently on a thread pool, which
+# suits the blocking LLM/network calls the agents make.
+
+def run_stages(stages: dict, timings: dict = None, max_workers: int = 4, on_stage=None) -> dict:
+    """
+    Executes a graph of stages.
+    :param stages: {name: (dependencies, fn)} where dependencies is a list of stage names
+                   and fn is a zero-argument callable.
+    :param timings: Optional dict that receives {name: seconds} for every finished stage.
+    :param on_stage: Optional callback on_stage(name, status, seconds), called from the stage's
+                     thread with status "started" (seconds None), then "finished" or "failed".
+    :return: {name: return value of fn}
+    Raises the first stage exception after the stages already running have finished.
+    """
+    timings = timings if timings is not None else {}
+    for name, (deps, _) in stages.items():
+        missing = [d for d in deps if d not in stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {missing}")
+
+    outputs = {}
+    done = set()
+    running = {}  # future -> name
+
+    def timed(name, fn):
+        if on_stage:
+            on_stage(name, "started", None)
+        start = time.perf_counter()
+        status = "failed"
+        try:
+            output = fn()
+            status = "finished"
+            return output
+        finally:
+            timings[name] = round(time.perf_counter() - start, 3)
+            if on_stage:
+                on_stage(name, status, timings[name])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        error = None
+        while len(done) < len(stages):
+            if error is None:
+                for name, (deps, fn) in stages.items():
+                    if name in done or name in running.values():
+                        continue
+                    if all(d in done for d in deps):
+                        running[executor.submit(timed, name, fn)] = name
+
+            if not running:
+                if error is not None:
+                    break
+                raise RuntimeError("Stage graph has a dependency cycle")
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                done.add(name)
+                try:
+                    outputs[name] = future.result()
+                except Exception as e:
+                    if error is None:
+                        error = e
+
+        if error is not None:
+            raise error
+
+    return outputs
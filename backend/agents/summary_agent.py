@@ -7,11 +7,13 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from backend.LLM.providers.base import LLMProvider
+from backend.agents.transcript_digest import transcript_material, transcript_prefix
 
 # Agent 4: Summary Generation
-def generate_summary(transcript: str, context: dict, llm_provider: LLMProvider = None) -> dict:
+def generate_summary(transcript: str, context: dict, llm_provider: LLMProvider = None, digest: dict = None, on_token=None) -> dict:
     """
     Generates a concise summary based on the transcript and context.
+    :param on_token: Optional callback receiving each chunk of the summary as it is generated.
     """
     print(f"[SummaryAgent] Generating summary...")
     
@@ -23,20 +25,33 @@ def generate_summary(transcript: str, context: dict, llm_provider: LLMProvider =
     intent = context.get("intent", "General")
     
     prompt = f"""
-    Generate a comprehensive yet concise summary of the following educational video transcript.
+    Generate a comprehensive yet concise summary of the educational video transcript above.
     The video is about "{topic}" and appears to be a "{intent}".
-    
-    Transcript (truncated):
-    {transcript[:15000]}
     """
     
     try:
-        content = llm_provider.generate(
+        # Shared digest if the orchestrator built one, otherwise the whole (condensed) transcript
+        material = transcript_material(transcript, llm_provider, digest, purpose="a summary")
+        if on_token is None:
+            content = llm_provider.generate(
+                prompt=prompt,
+                prefix=transcript_prefix(material),
+                system_message="You are an expert summarizer. Return a single string summary.",
+                temperature=0.5
+            )
+            return {"summary": content}
+
+        # Stream partial output to the caller (e.g. the UI) as tokens arrive
+        chunks = []
+        for chunk in llm_provider.generate_stream(
             prompt=prompt,
+            prefix=transcript_prefix(material),
             system_message="You are an expert summarizer. Return a single string summary.",
             temperature=0.5
-        )
-        return {"summary": content}
+        ):
+            chunks.append(chunk)
+            on_token(chunk)
+        return {"summary": "".join(chunks).strip()}
     except Exception as e:
         print(f"[SummaryAgent] Error: {e}")
         return {"summary": "Error generating summary.", "error": str(e)}
@@ -0,0 +1,95 @@
+import os
+import sys
+
+# Add parent directory to path to import backend modules if needed
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.LLM.providers.base import LLMProvider
+from backend.agents.response_parser import parse_response, SCHEMAS
+from backend.agents.long_transcript import chunk_transcript, map_chunks, count_tokens, condense_transcript
+
+# Shared transcript digest.
+# Built once per workflow run by the orchestrator: each transcript chunk is summarized
+# concurrently into a summary, key terms and section headings, and the results are merged
+# into a compact representation. The context, summary, notes and Q&A agents then prompt
+# with the digest instead of each re-sending the raw transcript.
+
+# Transcripts shorter than this are cheaper to send as-is than to digest first
+DIGEST_MIN_TOKENS = int(os.environ.get("DIGEST_MIN_TOKENS", "1500"))
+MAX_KEY_TERMS = 40
+
+DIGEST_INSTRUCTION = """Summarize this part of a lecture transcript for a student.
+    Return ONLY a JSON object with the keys:
+    - "summary": String (dense summary keeping all facts, definitions and examples)
+    - "key_terms": List of Strings (important terms and names)
+    - "sections": List of Strings (short headings of the subtopics covered, in order)
+    Use the transcript's language."""
+
+def _parse_chunk(content: str) -> dict:
+    try:
+        return parse_response(content, SCHEMAS["digest"])
+    except ValueError:
+        # Keep the text even if the model ignored the JSON format
+        return {"summary": content.strip(), "key_terms": [], "sections": []}
+
+def render_digest(digest: dict) -> str:
+    """Renders a digest as compact prompt text."""
+    parts = []
+    if digest["outline"]:
+        parts.append("Section outline:\n" + "\n".join(f"{i + 1}. {s}" for i, s in enumerate(digest["outline"])))
+    if digest["key_terms"]:
+        parts.append("Key terms: " + ", ".join(digest["key_terms"]))
+    parts.append("Section summaries:\n" + "\n\n".join(
+        f"Part {i + 1}: {s}" for i, s in enumerate(digest["chunk_summaries"])
+    ))
+    return "\n\n".join(parts)
+
+def build_transcript_digest(transcript: str, llm_provider: LLMProvider) -> dict:
+    """
+    Returns {"chunk_summaries": [...], "key_terms": [...], "outline": [...], "text": str},
+    or None if the transcript is short enough to be used directly.
+    """
+    if count_tokens(transcript) < DIGEST_MIN_TOKENS:
+        return None
+
+    chunks = chunk_transcript(transcript)
+    print(f"[TranscriptDigest] Digesting {len(chunks)} chunks...")
+    parsed = [_parse_chunk(c) for c in map_chunks(
+        chunks, llm_provider, DIGEST_INSTRUCTION,
+        system_message="You are an expert note taker. Output valid JSON only.",
+        temperature=0.3
+    )]
+
+    key_terms, seen = [], set()
+    outline = []
+    for part in parsed:
+        for term in part.get("key_terms", []) or []:
+            term = str(term).strip()
+            if term and term.lower() not in seen and len(key_terms) < MAX_KEY_TERMS:
+                seen.add(term.lower())
+                key_terms.append(term)
+        outline.extend(str(s).strip() for s in (part.get("sections", []) or []) if str(s).strip())
+
+    digest = {
+        "chunk_summaries": [str(p.get("summary", "")).strip() for p in parsed],
+        "key_terms": key_terms,
+        "outline": outline,
+    }
+    # Very long lectures: condense the rendered digest once here rather than in every agent
+    digest["text"] = condense_transcript(render_digest(digest), llm_provider, purpose="study material")
+    print(f"[TranscriptDigest] Digest ready ({count_tokens(digest['text'])} tokens, from {count_tokens(transcript)})")
+    return digest
+
+def transcript_material(transcript: str, llm_provider: LLMProvider, digest: dict = None,
+                        purpose: str = "study material") -> str:
+    """Prompt material for an agent: the shared digest when available, otherwise the (condensed) transcript."""
+    if digest and digest.get("text"):
+        return digest["text"]
+    return condense_transcript(transcript, llm_provider, purpose=purpose)
+
+def transcript_prefix(material: str) -> str:
+    """
+    Prompt prefix carrying the transcript material. Agents pass it as the `prefix` kwarg so it is
+    byte-identical across calls and a provider can evaluate it once (see OllamaProvider reuse_prefix).
+    """
+    return f"Transcript:\n{material}\n"
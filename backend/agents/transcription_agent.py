@@ -8,19 +8,50 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".
 from backend.audio import youtube_speech, youtube_whisper, youtube_vosk
 from backend.audio import hindi_speech, hindi_whisper, hindi_vosk
 from backend.audio import marathi_speech, marathi_whisper
+from backend.audio.transcript_cache import get_transcript
+from backend.audio.youtube_audio_stream import canonical_video_id
+from backend.modules.single_flight import SingleFlight
+
+# language -> (Whisper language used for the cache key, engine label)
+WHISPER_CACHE_KEYS = {
+    "en": (None, "whisper_en"),
+    "hi": ("hi", "whisper_hi"),
+    "mr": ("mr", "whisper_mr"),
+}
+
+# Concurrent requests for the same video and language share one download + transcription
+_transcriptions = SingleFlight("TranscriptionAgent")
 
 # Agent 2: Transcription
 def transcribe_video(youtube_url: str, language: str) -> dict:
     """
     Transcribes the video using the best available engine for the detected language.
     Prioritizes Whisper for accuracy.
+    Concurrent calls for the same video and language wait for one transcription and share it.
     """
+    # Whisper "base" is the only engine / model used here, so video and language identify the result
+    key = (canonical_video_id(youtube_url), language, "whisper", "base")
+    result, _ = _transcriptions.do(key, lambda: _transcribe_video(youtube_url, language))
+    return result
+
+def _transcribe_video(youtube_url: str, language: str) -> dict:
     print(f"[TranscriptionAgent] Transcribing URL: {youtube_url} in Language: {language}")
     
     transcript = ""
     engine_used = ""
     
     try:
+        # Check the transcript cache before touching yt-dlp / ffmpeg
+        cache_language, cache_engine = WHISPER_CACHE_KEYS.get(language, (None, "whisper_en_fallback"))
+        cached = get_transcript(youtube_url, cache_language, "whisper", "base")
+        if cached is not None:
+            return {
+                "transcript": cached,
+                "language": language,
+                "engine": cache_engine,
+                "cached": True
+            }
+        
         if language == "en":
             # Default to Whisper for best quality
             transcript = youtube_whisper.transcribe_with_whisper(youtube_url)
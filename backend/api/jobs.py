@@ -0,0 +1,273 @@
+import os
+import sys
+import time
+import queue
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Add parent directory to path to import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.modules.artifact_store import new_job_id
+from backend.audio.youtube_audio_stream import canonical_video_id
+
+# Job queue for the HTTP API.
+# Submitted jobs wait in a bounded queue; one dispatcher thread per worker takes the next job
+# and runs the agent workflow on a pool of worker processes, so at most API_WORKERS videos
+# are processed at a time and a full queue is reported to the client instead of growing.
+# Workers load their models once (pool initializer) and keep them warm for every later job;
+# each transcribes in-process with its share of the CPUs (no nested Whisper pools).
+# Progress events from the workers come back over a multiprocessing queue and are kept per
+# job, for status polling and for streaming to subscribers.
+# Identical submissions (same video and options) while a job is queued or running get that
+# job back instead of a new one (the workflow's own coalescing doesn't apply: every job stores
+# its artifacts under its own job ID).
+
+API_WORKERS = int(os.environ.get("API_WORKERS", "2"))
+API_QUEUE_SIZE = int(os.environ.get("API_QUEUE_SIZE", "16"))
+# Finished jobs kept in memory for status / result requests (their files stay in the artifact store)
+API_MAX_FINISHED_JOBS = int(os.environ.get("API_MAX_FINISHED_JOBS", "200"))
+# Set API_WARM_MODELS=0 to skip loading the Whisper model when a worker starts
+API_WARM_MODELS = os.environ.get("API_WARM_MODELS", "1") != "0"
+
+FINISHED_STATES = ("completed", "failed")
+# How long a finished job waits for its last progress events (e.g. if the worker died)
+DRAIN_TIMEOUT_SECONDS = 5
+
+# --- Worker process side ---
+
+_events = None
+
+def _init_worker(events, warm_models: bool, threads: int):
+    global _events
+    _events = events
+    # An initializer error would break the whole pool, so failures here only get logged
+    # (a job that needs the missing piece then fails on its own)
+    try:
+        # Importing the orchestrator pulls in the agents, providers and audio modules once per worker
+        from backend.agents import agent_orchestrator  # noqa: F401
+        from backend.audio import whisper_transcribe
+        # The API already runs several jobs at once: each job transcribes in-process on this
+        # worker's share of the CPUs, instead of starting its own pool of Whisper processes
+        whisper_transcribe.WHISPER_WORKERS = 1
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+        if warm_models:
+            from backend.audio.whisper_registry import get_whisper_model
+            get_whisper_model()
+    except Exception as e:
+        print(f"[JobWorker] Warm-up failed: {e}")
+
+def _run_job(job_id: str, url: str, options: dict) -> dict:
+    from backend.agents.agent_orchestrator import run_agent_workflow
+
+    def on_progress(event):
+        _events.put((job_id, "stage", event))
+
+    def on_summary_token(token):
+        _events.put((job_id, "summary_token", {"text": token}))
+
+    _events.put((job_id, "status", {"status": "running", "pid": os.getpid()}))
+    try:
+        return run_agent_workflow(url, job_id=job_id, on_progress=on_progress,
+                                  on_summary_token=on_summary_token, **options)
+    finally:
+        # Last event of the job on this queue: everything before it has been delivered
+        _events.put((job_id, "drained", None))
+
+# --- API process side ---
+
+class Job:
+    def __init__(self, job_id: str, url: str, options: dict):
+        self.id = job_id
+        self.url = url
+        self.options = options
+        self.key = None
+        self.status = "queued"
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.stages = {}
+        self.results = None
+        self.error = None
+        self.events = []
+        self.drained = threading.Event()
+
+    def summary(self) -> dict:
+        """Status view of the job (without the full results)."""
+        info = {
+            "job_id": self.id,
+            "url": self.url,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "stages": self.stages,
+        }
+        if self.error:
+            info["error"] = self.error
+        if self.results is not None:
+            info["timings"] = self.results.get("timings", {})
+            info["artifacts"] = [name for name in ("pdf", "brf") if self.results.get(f"{name}_path")]
+            info["from_store"] = self.results.get("from_store", False)
+        return info
+
+class JobManager:
+    def __init__(self, workers: int = API_WORKERS, queue_size: int = API_QUEUE_SIZE,
+                 max_finished: int = API_MAX_FINISHED_JOBS, warm_models: bool = API_WARM_MODELS):
+        self.workers = max(1, workers)
+        self.max_finished = max_finished
+        self.warm_models = warm_models
+        self._pending = queue.Queue(maxsize=max(1, queue_size))
+        self._jobs = OrderedDict()
+        self._inflight = {}  # (video ID, options) -> unfinished job
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._pool = None
+        self._events = None
+        self._threads = []
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        threads = max(1, (os.cpu_count() or self.workers) // self.workers)
+        print(f"[JobManager] Starting {self.workers} worker processes ({threads} threads each, "
+              f"queue size {self._pending.maxsize})...")
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._events, self.warm_models, threads),
+        )
+
+    def start(self):
+        self._events = multiprocessing.get_context("spawn").Queue()
+        self._pool = self._new_pool()
+        self._threads = [threading.Thread(target=self._listen, daemon=True)]
+        self._threads += [threading.Thread(target=self._dispatch, daemon=True) for _ in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def shutdown(self):
+        # Jobs that never started are failed, which also makes room for the dispatcher stop markers
+        while True:
+            try:
+                job = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                self._finish(job, None, "Server shutting down")
+        for _ in range(self.workers):
+            self._pending.put(None)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._events is not None:
+            self._events.put(None)
+        self._pool = None
+
+    def submit(self, url: str, **options) -> tuple:
+        """
+        Queues a workflow run; options are passed to run_agent_workflow.
+        :return: (job, shared) where shared is True if an identical job was already queued or running
+                 and is returned instead of a new one.
+        Raises queue.Full when API_QUEUE_SIZE jobs are already waiting.
+        """
+        key = (canonical_video_id(url), tuple(sorted(options.items())))
+        with self._lock:
+            existing = self._inflight.get(key)
+            if existing is not None:
+                return existing, True
+            job = Job(new_job_id(), url, options)
+            job.key = key
+            # Reserve the queue slot before the job becomes visible
+            self._pending.put_nowait(job)
+            self._jobs[job.id] = job
+            self._inflight[key] = job
+            self._add_event(job, "status", {"status": "queued"})
+        return job, False
+
+    def get(self, job_id: str) -> Job:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def queue_depth(self) -> int:
+        return self._pending.qsize()
+
+    def wait_events(self, job: Job, cursor: int, timeout: float) -> list:
+        """Events of the job after index `cursor`, waiting up to `timeout` seconds for new ones."""
+        with self._changed:
+            if len(job.events) <= cursor and job.status not in FINISHED_STATES:
+                self._changed.wait(timeout)
+            return job.events[cursor:]
+
+    def _add_event(self, job: Job, kind: str, data: dict):
+        # Called with the lock held
+        job.events.append({"id": len(job.events), "event": kind, "data": data})
+        self._changed.notify_all()
+
+    def _listen(self):
+        while True:
+            item = self._events.get()
+            if item is None:
+                return
+            job_id, kind, data = item
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+                if kind == "drained":
+                    job.drained.set()
+                    continue
+                if kind == "stage":
+                    job.stages[data["stage"]] = {"status": data["status"], "seconds": data["seconds"]}
+                self._add_event(job, kind, data)
+
+    def _dispatch(self):
+        while True:
+            job = self._pending.get()
+            if job is None:
+                return
+            with self._lock:
+                job.status = "running"
+                job.started = time.time()
+            pool = self._pool
+            try:
+                results = pool.submit(_run_job, job.id, job.url, job.options).result()
+                error = results.get("error")
+            except BrokenProcessPool as e:
+                # A worker died (e.g. out of memory); the jobs it took down fail, later ones get a new pool
+                results, error = None, f"Worker process died: {e}"
+                self._replace_pool(pool)
+            except Exception as e:
+                results, error = None, f"{type(e).__name__}: {e}"
+            # Worker events travel separately from the result; the final status goes after them
+            job.drained.wait(DRAIN_TIMEOUT_SECONDS)
+            self._finish(job, results, error)
+
+    def _replace_pool(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            if self._pool is not broken or broken is None:
+                return  # already replaced by another dispatcher, or shutting down
+            self._pool = self._new_pool()
+        broken.shutdown(wait=False)
+
+    def _finish(self, job: Job, results: dict, error: str):
+        with self._lock:
+            job.results = results
+            job.error = error
+            job.status = "failed" if error else "completed"
+            job.finished = time.time()
+            if self._inflight.get(job.key) is job:
+                del self._inflight[job.key]
+            self._add_event(job, "status", job.summary())
+            self._evict_finished()
+        print(f"[JobManager] Job {job.id} {job.status}")
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import queue
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+
+# Add parent directory to path to import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.api.jobs import JobManager, FINISHED_STATES
+from backend.audio.sources import local_path
+
+# HTTP API for the agent workflow.
+#   POST /jobs                         submit a video (202, or 429 when the queue is full);
+#                                      an identical queued / running job is returned instead of a new one
+#   GET  /jobs/{id}                    status and per-stage progress
+#   GET  /jobs/{id}/events             progress as Server-Sent Events
+#   GET  /jobs/{id}/result             full workflow results
+#   GET  /jobs/{id}/artifacts/{kind}   the generated PDF or BRF
+# Run from the project root:  uvicorn backend.api.server:app  (or python -m backend.api.server)
+
+API_HOST = os.environ.get("API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("API_PORT", "8000"))
+# Suggested wait (seconds) sent with a 429 response
+RETRY_AFTER_SECONDS = 30
+# Set API_ALLOW_LOCAL_FILES=1 to accept paths of files on the server (e.g. a mounted lecture archive)
+API_ALLOW_LOCAL_FILES = os.environ.get("API_ALLOW_LOCAL_FILES", "0") == "1"
+# An SSE comment is sent when no event arrived for this long, to keep proxies from closing the stream
+SSE_KEEPALIVE_SECONDS = 15
+
+ARTIFACT_TYPES = {"pdf": "application/pdf", "brf": "text/plain; charset=us-ascii"}
+
+manager = JobManager()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    manager.start()
+    yield
+    manager.shutdown()
+
+app = FastAPI(title="SparshVaani API", lifespan=lifespan)
+
+class JobRequest(BaseModel):
+    url: str
+    provider: str = "openai"
+    model: Optional[str] = None
+    use_cache: Optional[bool] = None
+    use_digest: Optional[bool] = None
+    batch_mode: Optional[bool] = None
+
+def _get_job(job_id: str):
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
+
+@app.post("/jobs", status_code=202)
+def submit_job(request: JobRequest):
+    if local_path(request.url) is not None and not API_ALLOW_LOCAL_FILES:
+        raise HTTPException(status_code=400, detail="Local files are not accepted by this server")
+    options = {"provider_type": request.provider, "provider_model": request.model}
+    # Unset options keep the orchestrator defaults
+    for name in ("use_cache", "use_digest", "batch_mode"):
+        value = getattr(request, name)
+        if value is not None:
+            options[name] = value
+    try:
+        job, shared = manager.submit(request.url, **options)
+    except queue.Full:
+        raise HTTPException(status_code=429, detail="Job queue is full, try again later",
+                            headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        # True if an identical job was already queued or running; its ID is returned
+        "deduplicated": shared,
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events",
+    }
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    return _get_job(job_id).summary()
+
+@app.get("/jobs/{job_id}/result")
+def job_result(job_id: str):
+    job = _get_job(job_id)
+    if job.status not in FINISHED_STATES:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    if job.results is None:
+        raise HTTPException(status_code=500, detail=job.error)
+    return job.results
+
+@app.get("/jobs/{job_id}/artifacts/{kind}")
+def job_artifact(job_id: str, kind: str):
+    job = _get_job(job_id)
+    if kind not in ARTIFACT_TYPES:
+        raise HTTPException(status_code=404, detail=f"Unknown artifact type, expected one of {list(ARTIFACT_TYPES)}")
+    if job.status not in FINISHED_STATES:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    path = (job.results or {}).get(f"{kind}_path")
+    if not path or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail=f"No {kind.upper()} for this job")
+    return FileResponse(path, media_type=ARTIFACT_TYPES[kind], filename=os.path.basename(path))
+
+@app.get("/jobs/{job_id}/events")
+def job_events(job_id: str, request: Request):
+    """Streams the job's events (status, stage, summary_token) until it has finished."""
+    job = _get_job(job_id)
+    # A reconnecting client continues after the last event it received
+    last_id = request.headers.get("last-event-id", "")
+    start = int(last_id) + 1 if last_id.isdigit() else 0
+
+    async def stream():
+        cursor = start
+        while True:
+            if job.status in FINISHED_STATES and cursor >= len(job.events):
+                return
+            events = await run_in_threadpool(manager.wait_events, job, cursor, SSE_KEEPALIVE_SECONDS)
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            for event in events:
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'], ensure_ascii=False)}\n\n"
+            cursor = events[-1]["id"] + 1
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/health")
+def health():
+    return {"workers": manager.workers, "queued": manager.queue_depth()}
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host=API_HOST, port=API_PORT)
@@ -1,9 +1,15 @@
 import os
 import speech_recognition as sr
 from .youtube_audio_stream import stream_youtube_audio
+from .transcript_cache import get_transcript, put_transcript
 
 def transcribe_with_hindi_speech_recognition(youtube_url: str):
     try:
+        # Reuse a cached transcript if this video was already processed
+        cached = get_transcript(youtube_url, "hi-IN", "google", "")
+        if cached is not None:
+            return cached
+        
         # Step 1: Stream Audio (BytesIO)
         audio_io = stream_youtube_audio(youtube_url)
         
@@ -18,6 +24,7 @@ def transcribe_with_hindi_speech_recognition(youtube_url: str):
             try:
                 # Specify language='hi-IN' for Hindi
                 text = recognizer.recognize_google(audio_data, language="hi-IN")
+                put_transcript(youtube_url, "hi-IN", "google", text, "")
             except sr.UnknownValueError:
                 text = "[Error: Speech was unintelligible]"
             except sr.RequestError as e:
@@ -1,36 +1,32 @@
-import os
-import whisper
-import numpy as np
-import io
-import soundfile as sf
-from .youtube_audio_stream import stream_youtube_audio
+from .whisper_transcribe import transcribe_stream
+from .transcript_cache import get_transcript, put_transcript
 
-# Define output file path
-OUTPUT_FILE = os.path.join(os.path.dirname(__file__), "hindi_whisper_output.txt")
+try:
+    from modules.artifact_store import get_store
+except ImportError:
+    from backend.modules.artifact_store import get_store
+
+# Output file name inside the artifact store (one directory per distinct transcript)
+OUTPUT_FILE = "hindi_whisper_output.txt"
 
 def transcribe_with_hindi_whisper(youtube_url: str):
     try:
-        # Step 1: Stream Audio
-        audio_io = stream_youtube_audio(youtube_url)
-        
-        print("Loading Whisper model (base)...")
-        model = whisper.load_model("base")
-        
-        print(f"Transcribing Hindi with Whisper (In-Memory)...")
+        # Reuse a cached transcript if this video was already processed
+        cached = get_transcript(youtube_url, "hi", "whisper", "base")
+        if cached is not None:
+            return cached
         
-        # Step 3: Convert BytesIO wav to float32 numpy array
-        audio_data, sample_rate = sf.read(audio_io)
+        print(f"Transcribing Hindi with Whisper (Streaming)...")
         
-        # Convert to float32
-        audio_data = audio_data.astype(np.float32)
-        
-        # Transcribe with language='hi', force fp16=False for CPU
-        result = model.transcribe(audio_data, language="hi", fp16=False)
+        # Step 1: Stream audio window by window into the (cached) model, language='hi'
+        result = transcribe_stream(youtube_url, language="hi", model_name="base")
         text = result["text"]
         
-        # Step 4: Save Output
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            f.write(text)
+        put_transcript(youtube_url, "hi", "whisper", text, "base")
+        
+        # Step 2: Save Output (content-addressed, so concurrent runs never share a file)
+        _, output_path = get_store().put_content(OUTPUT_FILE, text.encode("utf-8"))
+        print(f"Saved transcript to {output_path}")
             
         return text
 
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+import numpy as np
+
+# Local cache of decoded audio: raw 16 kHz mono int16 PCM (s16le), one file per video ID.
+# The first engine to stream a video tees the ffmpeg output into the cache; every other
+# engine (speech, Whisper, Vosk) then reads the file (or memory-maps it) instead of
+# resolving the URL with yt-dlp and decoding it again.
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_DIR = os.environ.get("AUDIO_CACHE_DIR", os.path.join(BACKEND_DIR, "cache", "audio"))
+MAX_CACHE_MB = int(os.environ.get("AUDIO_CACHE_MAX_MB", "2048"))
+
+_evict_lock = threading.Lock()
+
+def pcm_path(video_id: str) -> str:
+    return os.path.join(CACHE_DIR, f"{video_id}.pcm")
+
+def cached_pcm_path(video_id: str) -> str:
+    """Returns the cache file for a video, or None if it has not been decoded yet."""
+    path = pcm_path(video_id)
+    if not os.path.exists(path):
+        return None
+    try:
+        # Mark as recently used for eviction
+        os.utime(path, None)
+    except OSError:
+        pass
+    return path
+
+def load_pcm(video_id: str) -> np.ndarray:
+    """Memory-maps a cached video as a read-only int16 array (None on a miss)."""
+    path = cached_pcm_path(video_id)
+    if path is None:
+        return None
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=np.int16)
+    return np.memmap(path, dtype=np.int16, mode="r")
+
+def read_frames(path: str, frame_bytes: int):
+    """Yields the cached PCM file in chunks of `frame_bytes`."""
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(frame_bytes)
+            if not data:
+                break
+            yield data
+
+@contextmanager
+def pcm_writer(video_id: str):
+    """
+    Context manager yielding a binary file to tee decoded PCM into.
+    The entry is published with an atomic rename only if the block completes;
+    if decoding fails or the consumer stops early the partial file is discarded.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".part", dir=CACHE_DIR)
+    f = os.fdopen(fd, "wb")
+    try:
+        yield f
+        f.close()
+        os.replace(tmp_path, pcm_path(video_id))
+    except BaseException:
+        f.close()
+        os.remove(tmp_path)
+        raise
+    _evict()
+
+def _evict():
+    budget = MAX_CACHE_MB * 1024 * 1024
+    with _evict_lock:
+        entries = []
+        for name in os.listdir(CACHE_DIR):
+            if not name.endswith(".pcm"):
+                continue
+            path = os.path.join(CACHE_DIR, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        # Keep at least the newest entry, even if it alone exceeds the budget
+        for _, size, path in sorted(entries)[:-1]:
+            if total <= budget:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
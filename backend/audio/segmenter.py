@@ -0,0 +1,93 @@
+import numpy as np
+from .youtube_audio_stream import SAMPLE_RATE
+
+# Energy-based segmentation of 16 kHz float32 audio at silence boundaries.
+# Segments are cut inside pauses so each one can be transcribed independently
+# (and in parallel) without splitting words.
+
+FRAME_SECONDS = 0.03        # analysis frame length (30 ms)
+MIN_SEGMENT_SECONDS = 10.0  # never cut before this
+MAX_SEGMENT_SECONDS = 30.0  # Whisper's context length; always cut by this point
+MIN_SILENCE_SECONDS = 0.3   # a pause must be at least this long to count as a boundary
+SILENCE_MARGIN_DB = 10.0    # silence is within this many dB of the noise floor and below the median level
+MIN_SILENCE_DB = -60.0      # anything quieter than this is always silence
+
+def frame_energy_db(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    """Returns the RMS energy in dBFS of each complete frame of `frame_len` samples."""
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return np.empty(0, dtype=np.float32)
+    frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    return 20.0 * np.log10(rms + 1e-10)
+
+def find_cut(samples: np.ndarray, sample_rate: int = SAMPLE_RATE,
+             min_segment_s: float = MIN_SEGMENT_SECONDS, max_segment_s: float = MAX_SEGMENT_SECONDS,
+             min_silence_s: float = MIN_SILENCE_SECONDS) -> int:
+    """
+    Returns the sample index at which to end the first segment of `samples`.
+    Cuts in the middle of the longest pause between min_segment_s and max_segment_s;
+    falls back to the quietest frame in that range if there is no pause.
+    """
+    max_len = int(max_segment_s * sample_rate)
+    if len(samples) <= max_len:
+        return len(samples)
+
+    frame_len = int(FRAME_SECONDS * sample_rate)
+    energy = frame_energy_db(samples[:max_len], frame_len)
+    first = int(min_segment_s * sample_rate) // frame_len
+    search = energy[first:]
+    if len(search) == 0:
+        return max_len
+
+    noise_floor = np.percentile(energy, 5)
+    threshold = max(min(noise_floor + SILENCE_MARGIN_DB, np.median(energy) - SILENCE_MARGIN_DB), MIN_SILENCE_DB)
+    silent = search <= threshold
+
+    # Longest run of silent frames in the search range
+    best_start, best_len = -1, 0
+    run_start = None
+    for i, is_silent in enumerate(np.append(silent, False)):
+        if is_silent and run_start is None:
+            run_start = i
+        elif not is_silent and run_start is not None:
+            if i - run_start > best_len:
+                best_start, best_len = run_start, i - run_start
+            run_start = None
+
+    if best_len * FRAME_SECONDS >= min_silence_s:
+        cut_frame = first + best_start + best_len // 2
+    else:
+        cut_frame = first + int(np.argmin(search))
+    return cut_frame * frame_len
+
+def split_on_silence(samples: np.ndarray, sample_rate: int = SAMPLE_RATE, **kwargs) -> list:
+    """Splits a complete array into (start_sample, end_sample) segments at silence boundaries."""
+    segments = []
+    start = 0
+    while start < len(samples):
+        end = start + find_cut(samples[start:], sample_rate, **kwargs)
+        segments.append((start, end))
+        start = end
+    return segments
+
+def iter_segments(windows, sample_rate: int = SAMPLE_RATE, **kwargs):
+    """
+    Segments a stream of float32 windows incrementally.
+    Yields (start_seconds, samples) tuples; only about one max-length segment plus
+    one window is buffered at any time.
+    """
+    max_len = int(kwargs.get("max_segment_s", MAX_SEGMENT_SECONDS) * sample_rate)
+    buffer = np.empty(0, dtype=np.float32)
+    offset = 0  # absolute sample index of buffer[0]
+
+    for window in windows:
+        buffer = np.concatenate([buffer, window]) if len(buffer) else window
+        while len(buffer) > max_len:
+            cut = find_cut(buffer, sample_rate, **kwargs)
+            yield offset / sample_rate, buffer[:cut]
+            buffer = buffer[cut:]
+            offset += cut
+
+    if len(buffer):
+        yield offset / sample_rate, buffer
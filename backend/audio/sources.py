@@ -0,0 +1,94 @@
+import os
+import re
+import glob
+import json
+import hashlib
+import subprocess
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+# Audio sources besides YouTube URLs: local files (plain paths or file:// URLs), and
+# directories / glob patterns that expand to many files for batch processing.
+# A local file is decoded by ffmpeg directly (no yt-dlp) and identified by its path, size and
+# modification time, so caches and stored results stay valid until the file changes.
+
+# Extensions picked up when a directory is expanded (ffmpeg reads all of them)
+AUDIO_EXTENSIONS = (
+    ".mp3", ".wav", ".m4a", ".aac", ".flac", ".ogg", ".opus", ".wma",
+    ".mp4", ".mkv", ".webm", ".mov", ".avi",
+)
+
+_URL_RE = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]+://")
+
+def local_path(source: str) -> str:
+    """Absolute path if the source is an existing local file (path or file:// URL), else None."""
+    if source.startswith("file://"):
+        path = url2pathname(urlparse(source).path)
+    elif _URL_RE.match(source):
+        return None
+    else:
+        path = os.path.expanduser(source)
+    return os.path.abspath(path) if os.path.isfile(path) else None
+
+def local_source_id(path: str) -> str:
+    """Stable ID of a local file; it changes when the file is replaced or modified."""
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+    return "file-" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+def local_metadata(path: str) -> dict:
+    """Title / description of a local recording: container tags if ffprobe finds any, else the file name."""
+    title = os.path.splitext(os.path.basename(path))[0].replace("_", " ").replace("-", " ")
+    description = ""
+    try:
+        output = subprocess.check_output(
+            ["ffprobe", "-v", "error", "-show_entries", "format_tags", "-of", "json", path],
+            stderr=subprocess.DEVNULL, timeout=30)
+        tags = {k.lower(): v for k, v in json.loads(output).get("format", {}).get("tags", {}).items()}
+        title = tags.get("title") or title
+        description = tags.get("comment") or tags.get("description") or ""
+    except (OSError, ValueError, subprocess.SubprocessError):
+        pass
+    return {"title": title, "description": description[:500]}
+
+def _directory_files(directory: str, extensions) -> list:
+    files = []
+    for root, dirs, names in os.walk(directory):
+        dirs.sort()
+        for name in sorted(names):
+            if name.lower().endswith(extensions) and not name.startswith("."):
+                files.append(os.path.join(root, name))
+    return files
+
+def resolve_sources(specs, extensions=AUDIO_EXTENSIONS) -> list:
+    """
+    Expands URLs, files, directories (recursively, files with `extensions`) and glob patterns
+    into a list of sources, in order and without duplicates. Local files become absolute paths.
+    """
+    extensions = tuple(ext.lower() for ext in extensions)
+    sources, seen = [], set()
+
+    def add(source):
+        if source not in seen:
+            seen.add(source)
+            sources.append(source)
+
+    for spec in specs:
+        if _URL_RE.match(spec) and not spec.startswith("file://"):
+            add(spec)
+            continue
+        path = local_path(spec)
+        if path is not None:
+            add(path)
+            continue
+        expanded = os.path.expanduser(spec)
+        matches = [expanded] if os.path.isdir(expanded) else sorted(glob.glob(expanded, recursive=True))
+        if not matches:
+            print(f"[Sources] Nothing matches: {spec}")
+        for match in matches:
+            if os.path.isdir(match):
+                for file_path in _directory_files(match, extensions):
+                    add(os.path.abspath(file_path))
+            elif os.path.isfile(match):
+                add(os.path.abspath(match))
+    return sources
@@ -0,0 +1,95 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from .youtube_audio_stream import canonical_video_id
+
+# Persistent on-disk transcript cache.
+# Entries are keyed by (canonical video ID, language, engine, model size), so the same
+# video is never downloaded and transcribed twice for the same configuration.
+# Writes are atomic (temp file + rename) and the directory is kept under a size budget
+# by evicting the least recently used entries.
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_DIR = os.environ.get("TRANSCRIPT_CACHE_DIR", os.path.join(BACKEND_DIR, "cache", "transcripts"))
+MAX_CACHE_MB = int(os.environ.get("TRANSCRIPT_CACHE_MAX_MB", "200"))
+
+_evict_lock = threading.Lock()
+
+def _entry_path(video_id: str, language: str, engine: str, model: str) -> str:
+    key = "|".join([video_id, language or "auto", engine, model or ""])
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.json")
+
+def get_transcript(youtube_url: str, language: str, engine: str, model: str = "") -> str:
+    """Returns the cached transcript or None on a miss."""
+    path = _entry_path(canonical_video_id(youtube_url), language, engine, model)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        # Mark as recently used for eviction
+        os.utime(path, None)
+    except OSError:
+        pass
+    print(f"[TranscriptCache] Hit for {entry.get('video_id')} ({engine}, {language or 'auto'})")
+    return entry.get("transcript")
+
+def put_transcript(youtube_url: str, language: str, engine: str, transcript: str, model: str = ""):
+    """Stores a transcript atomically, then trims the cache to its size budget."""
+    if not transcript:
+        return
+    video_id = canonical_video_id(youtube_url)
+    path = _entry_path(video_id, language, engine, model)
+    entry = {
+        "video_id": video_id,
+        "language": language or "auto",
+        "engine": engine,
+        "model": model,
+        "created": time.time(),
+        "transcript": transcript,
+    }
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=CACHE_DIR)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        _evict()
+    except OSError as e:
+        # The cache is an optimization only; never fail a transcription because of it
+        print(f"[TranscriptCache] Warning: could not write entry: {e}")
+
+def _evict():
+    budget = MAX_CACHE_MB * 1024 * 1024
+    with _evict_lock:
+        entries = []
+        for name in os.listdir(CACHE_DIR):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(CACHE_DIR, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue  # removed by another worker
+            entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= budget:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,147 @@
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+import requests
+from vosk import Model
+
+# Shared Vosk model manager.
+# Resolves language -> model directory once, keeps loaded Models resident for reuse
+# across requests and downloads missing models by streaming the archive to disk.
+
+AUDIO_DIR = os.path.dirname(__file__)
+MODEL_BASE_DIR = os.path.join(AUDIO_DIR, "model")
+
+# A pre-seeded model directory (e.g. baked into a container image) is checked first,
+# so the first request never has to wait for a download.
+VOSK_MODEL_DIR = os.environ.get("VOSK_MODEL_DIR")
+
+POSSIBLE_MODEL_DIRS = [d for d in [
+    VOSK_MODEL_DIR,
+    MODEL_BASE_DIR,
+    os.path.join(AUDIO_DIR, "models"),
+    os.path.join(AUDIO_DIR, "..", "modules", "model"),
+    os.path.join(AUDIO_DIR, "..", "model"),
+] if d]
+
+VOSK_MODELS = {
+    "en": {
+        "folder": "vosk-model-small-en-us-0.15",
+        "url": "https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip",
+    },
+    "hi": {
+        "folder": "vosk-model-small-hi-0.22",
+        "url": "https://alphacephei.com/vosk/models/vosk-model-small-hi-0.22.zip",
+    },
+}
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+_resolved_paths = {}  # language -> model path
+_loaded_models = {}   # language -> vosk.Model
+_lock = threading.Lock()
+_language_locks = {}
+
+
+def _language_lock(language: str) -> threading.Lock:
+    with _lock:
+        return _language_locks.setdefault(language, threading.Lock())
+
+
+def _is_model_dir(path: str) -> bool:
+    return os.path.isdir(os.path.join(path, "conf"))
+
+
+def _find_model_path(language: str):
+    """Looks for the language's model folder in the known model directories."""
+    folder = VOSK_MODELS[language]["folder"]
+    for d in POSSIBLE_MODEL_DIRS:
+        if not os.path.isdir(d):
+            continue
+        candidate = os.path.join(d, folder)
+        if _is_model_dir(candidate):
+            return os.path.abspath(candidate)
+        # 'd' may itself be the model folder
+        if os.path.basename(os.path.normpath(d)) == folder and _is_model_dir(d):
+            return os.path.abspath(d)
+    return None
+
+
+def download_model(language: str) -> str:
+    """
+    Downloads and extracts the Vosk model for a language into MODEL_BASE_DIR.
+    The archive is streamed to a temporary file in chunks and extracted into a
+    staging directory that is renamed into place once complete.
+    """
+    info = VOSK_MODELS[language]
+    url = info["url"]
+    target = os.path.join(MODEL_BASE_DIR, info["folder"])
+    print(f"[VoskModels] Downloading '{language}' model from {url}...")
+    os.makedirs(MODEL_BASE_DIR, exist_ok=True)
+
+    zip_fd, zip_path = tempfile.mkstemp(suffix=".zip", dir=MODEL_BASE_DIR)
+    # Wrapped right away, so the descriptor is closed even if the request fails
+    zip_file = os.fdopen(zip_fd, "wb")
+    staging_dir = None
+    try:
+        staging_dir = tempfile.mkdtemp(dir=MODEL_BASE_DIR)
+        with zip_file, requests.get(url, stream=True, timeout=(10, 60)) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                zip_file.write(chunk)
+
+        print(f"[VoskModels] Extracting '{language}' model...")
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            zip_ref.extractall(staging_dir)
+
+        extracted = os.path.join(staging_dir, info["folder"])
+        if not os.path.isdir(extracted):
+            raise RuntimeError(f"Archive did not contain '{info['folder']}'")
+        if not os.path.exists(target):
+            os.replace(extracted, target)
+
+        print(f"[VoskModels] Model ready at {target}")
+        return target
+    except Exception as e:
+        raise RuntimeError(f"Failed to download Vosk model for '{language}': {e}")
+    finally:
+        zip_file.close()
+        if os.path.exists(zip_path):
+            os.remove(zip_path)
+        if staging_dir:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def resolve_model_path(language: str = "en") -> str:
+    """Returns the model directory for a language, downloading it only if no local copy exists."""
+    if language not in VOSK_MODELS:
+        raise ValueError(f"No Vosk model configured for language '{language}'")
+
+    path = _resolved_paths.get(language)
+    if path:
+        return path
+
+    with _language_lock(language):
+        path = _resolved_paths.get(language) or _find_model_path(language)
+        if not path:
+            print(f"[VoskModels] '{language}' model not found locally. Attempting to download...")
+            path = download_model(language)
+        _resolved_paths[language] = path
+        return path
+
+
+def get_vosk_model(language: str = "en") -> Model:
+    """Returns a resident vosk.Model for the language, loading it on first use."""
+    model = _loaded_models.get(language)
+    if model is not None:
+        return model
+
+    model_path = resolve_model_path(language)
+    with _language_lock(language):
+        model = _loaded_models.get(language)
+        if model is None:
+            print(f"[VoskModels] Loading '{language}' model from: {model_path}")
+            model = Model(model_path)
+            _loaded_models[language] = model
+        return model
@@ -0,0 +1,103 @@
+import os
+import threading
+from collections import OrderedDict
+
+import whisper
+
+# Process-wide cache of loaded Whisper models.
+# Every transcription entry point (agents, CLI, Streamlit) goes through here so a
+# model is deserialized once per process and then reused while it stays warm.
+
+DEFAULT_MODEL_NAME = "base"
+
+# Total memory the cached models may occupy before least-recently-used ones are evicted.
+# Override with WHISPER_MODEL_BUDGET_MB (e.g. on small boxes or when loading 'medium'/'large').
+DEFAULT_MEMORY_BUDGET_MB = int(os.environ.get("WHISPER_MODEL_BUDGET_MB", "2048"))
+
+
+def _default_device():
+    try:
+        import torch
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    except ImportError:
+        return "cpu"
+
+
+def _model_size_bytes(model) -> int:
+    """Approximate resident size of a torch model (parameters + buffers)."""
+    total = 0
+    for tensor in list(model.parameters()) + list(model.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class WhisperModelRegistry:
+    """
+    Thread-safe LRU cache of Whisper models keyed by (model name, device, dtype).
+    Models are evicted least-recently-used first once the memory budget is exceeded;
+    the most recently requested model is always kept.
+    """
+
+    def __init__(self, memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB):
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024
+        self._models = OrderedDict()  # key -> (model, size_bytes)
+        self._lock = threading.Lock()
+        self._load_locks = {}  # key -> Lock, so concurrent callers don't load the same model twice
+
+    def get(self, model_name: str = DEFAULT_MODEL_NAME, device: str = None, dtype: str = "float32"):
+        device = device or _default_device()
+        key = (model_name, device, dtype)
+
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key][0]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # Another thread may have finished loading while we waited
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key][0]
+
+            print(f"[WhisperRegistry] Loading Whisper model ({model_name}, {device}, {dtype})...")
+            model = whisper.load_model(model_name, device=device)
+            if dtype == "float16" and device != "cpu":
+                model = model.half()
+            size = _model_size_bytes(model)
+
+            with self._lock:
+                self._models[key] = (model, size)
+                self._models.move_to_end(key)
+                self._evict_locked()
+                self._load_locks.pop(key, None)
+            return model
+
+    def _evict_locked(self):
+        total = sum(size for _, size in self._models.values())
+        while total > self.memory_budget_bytes and len(self._models) > 1:
+            key, (_, size) = self._models.popitem(last=False)
+            total -= size
+            print(f"[WhisperRegistry] Evicted {key} ({size / (1024 * 1024):.0f} MB)")
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def loaded(self) -> list:
+        """Returns the keys of the currently resident models, least recently used first."""
+        with self._lock:
+            return list(self._models.keys())
+
+
+_registry = WhisperModelRegistry()
+
+
+def get_whisper_model(model_name: str = DEFAULT_MODEL_NAME, device: str = None, dtype: str = "float32"):
+    """Returns a warm Whisper model from the process-wide registry, loading it on first use."""
+    return _registry.get(model_name, device=device, dtype=dtype)
+
+
+def get_registry() -> WhisperModelRegistry:
+    return _registry
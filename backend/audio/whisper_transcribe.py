@@ -0,0 +1,131 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from .youtube_audio_stream import stream_youtube_audio_arrays
+from .whisper_registry import get_whisper_model
+from .segmenter import iter_segments
+
+# Segmented Whisper engine shared by the English, Hindi and Marathi modules.
+# Audio is consumed window by window from the ffmpeg pipe, cut at silence boundaries
+# and the segments are transcribed in order in-process, or (opt-in) on a pool of worker
+# processes, each holding a warm model. Results are stitched back in order with absolute
+# timestamps.
+
+WINDOW_SECONDS = 30.0  # read size from the ffmpeg pipe
+PROMPT_TAIL_CHARS = 200  # previous text passed as prompt to keep continuity (sequential path)
+
+# Number of worker processes. 1 (or 0, the default) transcribes in-process. Every worker
+# holds its own model, outside the registry's per-process memory budget, and segments
+# transcribed in parallel don't get the previous text as a prompt.
+WHISPER_WORKERS = int(os.environ.get("WHISPER_WORKERS", "1"))
+
+# One pool per (model, workers) configuration. Pools are only shut down by shutdown_pool(),
+# never replaced while another thread's transcription may still be submitting to them.
+_pools = {}
+_pool_lock = threading.Lock()
+
+def _init_worker(model_name: str, threads: int):
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    # Load once per worker; the registry keeps it warm for every later segment
+    get_whisper_model(model_name)
+
+def _transcribe_segment(samples, language, model_name: str, initial_prompt: str = None) -> dict:
+    model = get_whisper_model(model_name)
+    # force fp16=False for CPU
+    result = model.transcribe(samples, language=language, fp16=False, initial_prompt=initial_prompt)
+    return {
+        "text": result["text"].strip(),
+        "language": result.get("language", language),
+        "segments": [(s["start"], s["end"], s["text"].strip()) for s in result.get("segments", [])],
+    }
+
+def _get_pool(model_name: str, workers: int) -> ProcessPoolExecutor:
+    """Returns the shared worker pool for this configuration, creating it on first use."""
+    with _pool_lock:
+        config = (model_name, workers)
+        if config not in _pools:
+            threads = max(1, (os.cpu_count() or workers) // workers)
+            print(f"[WhisperTranscribe] Starting {workers} worker processes ({threads} threads each)...")
+            _pools[config] = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_name, threads),
+            )
+        return _pools[config]
+
+def shutdown_pool():
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+def _stitch(offset: float, result: dict, segments: list, texts: list):
+    if result["text"]:
+        texts.append(result["text"])
+    for start, end, text in result["segments"]:
+        segments.append({"start": round(offset + start, 2), "end": round(offset + end, 2), "text": text})
+
+def _transcribe_sequential(audio_segments, language, model_name):
+    texts, segments = [], []
+    prompt = None
+    for offset, samples in audio_segments:
+        result = _transcribe_segment(samples, language, model_name, initial_prompt=prompt)
+        if language is None:
+            # Lock in the language detected on the first segment
+            language = result["language"]
+        _stitch(offset, result, segments, texts)
+        if result["text"]:
+            prompt = result["text"][-PROMPT_TAIL_CHARS:]
+    return texts, segments, language
+
+def _transcribe_parallel(audio_segments, language, model_name, workers):
+    pool = _get_pool(model_name, workers)
+    texts, segments = [], []
+    max_in_flight = workers * 2  # bounds how many decoded segments are held in memory
+
+    pending = []  # (offset, future) in submission order
+    for offset, samples in audio_segments:
+        if language is None:
+            # Detect the language on the first segment so every segment decodes consistently
+            result = pool.submit(_transcribe_segment, samples, None, model_name).result()
+            language = result["language"]
+            _stitch(offset, result, segments, texts)
+            continue
+
+        pending.append((offset, pool.submit(_transcribe_segment, samples, language, model_name)))
+        while len(pending) >= max_in_flight:
+            done_offset, future = pending.pop(0)
+            _stitch(done_offset, future.result(), segments, texts)
+
+    for done_offset, future in pending:
+        _stitch(done_offset, future.result(), segments, texts)
+    return texts, segments, language
+
+def transcribe_stream(youtube_url: str, language: str = None, model_name: str = "base",
+                      workers: int = None) -> dict:
+    """
+    Transcribes a YouTube video segment by segment.
+    :param language: Whisper language code ('hi', 'mr', ...) or None to auto-detect on the first segment.
+    :param workers: Worker processes to use (default WHISPER_WORKERS); 1 runs in-process.
+                    More workers finish sooner on multi-core machines, at one model per worker
+                    and without the previous segment's text as a prompt (less continuity across
+                    segment boundaries, so the wording can differ from the in-process result).
+    Returns: {"text": str, "language": str, "segments": [{"start", "end", "text"}]}
+    """
+    workers = WHISPER_WORKERS if workers is None else workers
+    windows = stream_youtube_audio_arrays(youtube_url, window_seconds=WINDOW_SECONDS)
+    audio_segments = iter_segments(windows)
+
+    if workers > 1:
+        texts, segments, language = _transcribe_parallel(audio_segments, language, model_name, workers)
+    else:
+        texts, segments, language = _transcribe_sequential(audio_segments, language, model_name)
+
+    return {"text": " ".join(texts), "language": language or "unknown", "segments": segments}
@@ -1,28 +1,52 @@
 import os
 import subprocess
 import io
+import re
 import shutil
+import hashlib
+import wave
+import tempfile
 from pathlib import Path
+import numpy as np
+from . import pcm_cache
+from .sources import local_path, local_source_id
 
 # Add FFmpeg to PATH if likely missing
 FFMPEG_PATH = r"C:\ffmpeg\ffmpeg-8.0-full_build\bin"
 if os.path.exists(FFMPEG_PATH) and FFMPEG_PATH not in os.environ["PATH"]:
     os.environ["PATH"] += os.pathsep + FFMPEG_PATH
 
-def stream_youtube_audio(youtube_url: str) -> io.BytesIO:
+# All engines consume 16 kHz mono signed 16-bit PCM
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # bytes per sample (int16)
+
+# youtube.com/watch?v=ID, youtu.be/ID, /shorts/ID, /embed/ID, /live/ID
+_VIDEO_ID_PATTERN = re.compile(r"(?:[?&]v=|youtu\.be/|/shorts/|/embed/|/live/)([A-Za-z0-9_-]{11})")
+
+def canonical_video_id(youtube_url: str) -> str:
     """
-     streams audio from YouTube via yt-dlp (get-url) and converts it to WAV (16kHz, mono) in-memory using ffmpeg.
-     Returns a BytesIO object containing the WAV data.
+    Returns a stable identifier for a video so that different URL forms of the same
+    video (short links, extra query params, timestamps) share cache entries.
+    Local files get an ID from their path, size and modification time.
+    Falls back to a hash of the URL for non-YouTube sources.
     """
-    print(f"Streaming audio from: {youtube_url}")
-    
+    path = local_path(youtube_url)
+    if path is not None:
+        return local_source_id(path)
+    match = _VIDEO_ID_PATTERN.search(youtube_url)
+    if match:
+        return match.group(1)
+    return "url-" + hashlib.sha1(youtube_url.strip().encode("utf-8")).hexdigest()[:16]
+
+def _check_tools(need_ytdlp: bool = True):
     # Check if yt-dlp is available
-    if not shutil.which("yt-dlp"):
+    if need_ytdlp and not shutil.which("yt-dlp"):
          raise RuntimeError("yt-dlp not found in PATH")
     if not shutil.which("ffmpeg"):
          raise RuntimeError("ffmpeg not found in PATH")
 
-    # 1. Get Direct URL using yt-dlp
+def get_direct_audio_url(youtube_url: str) -> str:
+    """Resolves the direct best-audio URL of a YouTube video using yt-dlp."""
     # -f bestaudio : Best audio
     # --get-url : Output only the URL
     cmd_yt_url = [
@@ -34,47 +58,134 @@ def stream_youtube_audio(youtube_url: str) -> io.BytesIO:
         "--no-playlist",
         youtube_url
     ]
-
     try:
-        # Get the URL
         direct_url = subprocess.check_output(cmd_yt_url).decode("utf-8").strip()
-        if not direct_url:
-            raise RuntimeError("yt-dlp failed to extract a valid URL")
-
-        print(f"Direct Audio URL extracted. Streaming to memory...")
-
-        # 2. ffmpeg command to read from URL and write wav to stdout
-        # -i <url> : Read from URL
-        # -f wav : Format wav
-        # -ar 16000 : 16kHz
-        # -ac 1 : Mono
-        # pipe:1 : Write to stdout
-        cmd_ffmpeg = [
-            "ffmpeg",
-            "-i", direct_url, 
-            "-f", "wav",
-            "-ar", "16000",
-            "-ac", "1",
-            "-v", "error", # quiet logs
-            "pipe:1"
-        ]
-        
-        # Popen ffmpeg
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"yt-dlp failed to get URL: {e}")
+    if not direct_url:
+        raise RuntimeError("yt-dlp failed to extract a valid URL")
+    return direct_url
+
+def _ffmpeg_cmd(input_url: str, output_format: str) -> list:
+    # -i <url> : Read from URL
+    # -f <fmt> : 'wav' (with header) or 's16le' (raw PCM)
+    # -ar 16000 : 16kHz
+    # -ac 1 : Mono
+    # pipe:1 : Write to stdout
+    return [
+        "ffmpeg",
+        "-i", input_url,
+        "-f", output_format,
+        "-ar", str(SAMPLE_RATE),
+        "-ac", "1",
+        "-v", "error", # quiet logs
+        "pipe:1"
+    ]
+
+def stream_youtube_audio(youtube_url: str) -> io.BytesIO:
+    """
+     streams audio from YouTube via yt-dlp (get-url) and converts it to WAV (16kHz, mono) in-memory using ffmpeg.
+     Returns a BytesIO object containing the WAV data.
+     The decoded audio is shared through the PCM cache, so other engines don't fetch it again.
+     Prefer stream_youtube_audio_frames / stream_youtube_audio_arrays for long videos,
+     this holds the whole decoded file in memory.
+    """
+    try:
+        wav_io = io.BytesIO()
+        with wave.open(wav_io, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(SAMPLE_WIDTH)
+            wf.setframerate(SAMPLE_RATE)
+            # Built from the frames as they arrive (cached, or decoded and cached on the way),
+            # so a cache eviction after decoding can't lose the audio
+            for data in stream_youtube_audio_frames(youtube_url, frame_samples=SAMPLE_RATE * 10):
+                wf.writeframes(data)
+        wav_io.seek(0)
+        return wav_io
+
+    except Exception as e:
+        raise RuntimeError(f"Streaming failed: {e}")
+
+def _decode_frames(youtube_url: str, frame_bytes: int):
+    """
+    Resolves the URL with yt-dlp (local files are passed to ffmpeg as they are) and yields
+    raw PCM chunks from the ffmpeg stdout pipe.
+    """
+    path = local_path(youtube_url)
+    _check_tools(need_ytdlp=path is None)
+
+    direct_url = path if path is not None else get_direct_audio_url(youtube_url)
+    # stderr goes to a file, not a pipe: a damaged input makes ffmpeg log an error per bad
+    # packet, and a full stderr pipe nobody reads until EOF would block it (and us) for good
+    with tempfile.TemporaryFile() as stderr_file:
         p_ffmpeg = subprocess.Popen(
-            cmd_ffmpeg, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE
+            _ffmpeg_cmd(direct_url, "s16le"),
+            stdout=subprocess.PIPE,
+            stderr=stderr_file
         )
-        
-        # Get output
-        wav_data, stderr_ffmpeg = p_ffmpeg.communicate()
-        
+
+        completed = False
+        try:
+            while True:
+                data = p_ffmpeg.stdout.read(frame_bytes)
+                if not data:
+                    break
+                yield data
+            completed = True
+        finally:
+            if not completed:
+                # Consumer stopped early (or failed): don't leave ffmpeg running
+                p_ffmpeg.kill()
+            p_ffmpeg.stdout.close()
+            p_ffmpeg.wait()
+
         if p_ffmpeg.returncode != 0:
+            # The last lines hold the actual failure
+            stderr_file.seek(max(0, os.fstat(stderr_file.fileno()).st_size - 4000))
+            stderr_ffmpeg = stderr_file.read()
             raise RuntimeError(f"FFmpeg failed: {stderr_ffmpeg.decode('utf-8', errors='ignore')}")
-            
-        return io.BytesIO(wav_data)
 
-    except subprocess.CalledProcessError as e:
-         raise RuntimeError(f"yt-dlp failed to get URL: {e}")
-    except Exception as e:
-        raise RuntimeError(f"Streaming failed: {e}")
+def stream_youtube_audio_frames(youtube_url: str, frame_samples: int = 4000):
+    """
+    Generator yielding raw PCM frames (16kHz, mono, int16 little-endian bytes).
+    Each frame holds `frame_samples` samples, except possibly the last one.
+    Reads from the decoded-audio cache when the video was fetched before; otherwise
+    streams straight from the ffmpeg stdout pipe and tees the frames into the cache.
+    Peak memory is one frame regardless of the video length.
+    """
+    frame_bytes = frame_samples * SAMPLE_WIDTH
+    video_id = canonical_video_id(youtube_url)
+
+    path = pcm_cache.cached_pcm_path(video_id)
+    if path is not None:
+        print(f"Using cached decoded audio for: {youtube_url}")
+        yield from pcm_cache.read_frames(path, frame_bytes)
+        return
+
+    print(f"Streaming audio frames from: {youtube_url}")
+    with pcm_cache.pcm_writer(video_id) as sink:
+        for data in _decode_frames(youtube_url, frame_bytes):
+            sink.write(data)
+            yield data
+
+def stream_youtube_audio_arrays(youtube_url: str, window_seconds: float = 30.0):
+    """
+    Generator yielding float32 numpy arrays in [-1.0, 1.0] of `window_seconds` each,
+    decoded incrementally (the format Whisper expects). Cached audio is memory-mapped
+    and converted one window at a time.
+    """
+    frame_samples = int(window_seconds * SAMPLE_RATE)
+
+    pcm = pcm_cache.load_pcm(canonical_video_id(youtube_url))
+    if pcm is not None:
+        print(f"Using cached decoded audio for: {youtube_url}")
+        for start in range(0, len(pcm), frame_samples):
+            samples = pcm[start:start + frame_samples].astype(np.float32)
+            samples /= 32768.0
+            yield samples
+        return
+
+    for frame in stream_youtube_audio_frames(youtube_url, frame_samples=frame_samples):
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        samples /= 32768.0
+        yield samples
@@ -1,9 +1,15 @@
 import os
 import speech_recognition as sr
 from .youtube_audio_stream import stream_youtube_audio
+from .transcript_cache import get_transcript, put_transcript
 
 def transcribe_with_speech_recognition(youtube_url: str):
     try:
+        # Reuse a cached transcript if this video was already processed
+        cached = get_transcript(youtube_url, "en-US", "google", "")
+        if cached is not None:
+            return cached
+        
         # Step 1: Stream Audio (BytesIO)
         audio_io = stream_youtube_audio(youtube_url)
         
@@ -17,6 +23,7 @@ def transcribe_with_speech_recognition(youtube_url: str):
             audio_data = recognizer.record(source)
             try:
                 text = recognizer.recognize_google(audio_data)
+                put_transcript(youtube_url, "en-US", "google", text, "")
             except sr.UnknownValueError:
                 text = "[Error: Speech was unintelligible]"
             except sr.RequestError as e:
@@ -1,40 +1,34 @@
-import os
-import whisper
-import numpy as np
-import io
-import soundfile as sf
-from .youtube_audio_stream import stream_youtube_audio
+from .whisper_transcribe import transcribe_stream
+from .transcript_cache import get_transcript, put_transcript
 
-# Define output file path
-OUTPUT_FILE = os.path.join(os.path.dirname(__file__), "whisper_output.txt")
+try:
+    from modules.artifact_store import get_store
+except ImportError:
+    from backend.modules.artifact_store import get_store
+
+# Output file name inside the artifact store (one directory per distinct transcript)
+OUTPUT_FILE = "whisper_output.txt"
 
 def transcribe_with_whisper(youtube_url: str):
     try:
-        # Step 1: Stream Audio
-        audio_io = stream_youtube_audio(youtube_url)
-        
-        print("Loading Whisper model (base)...")
-        model = whisper.load_model("base")
-        
-        print(f"Transcribing with Whisper (In-Memory)...")
+        # Reuse a cached transcript if this video was already processed
+        cached = get_transcript(youtube_url, None, "whisper", "base")
+        if cached is not None:
+            return cached
         
-        # Step 3: Convert BytesIO wav to float32 numpy array
-        # Whisper expects distinct method if passing array
-        # Soundfile can read from file-like object
-        audio_data, sample_rate = sf.read(audio_io)
+        print(f"Transcribing with Whisper (Streaming)...")
         
-        # Convert to float32
-        audio_data = audio_data.astype(np.float32)
-        
-        # Transcribe, force fp16=False for CPU
-        result = model.transcribe(audio_data, fp16=False)
+        # Step 1: Stream audio window by window into the (cached) model
+        result = transcribe_stream(youtube_url, model_name="base")
         text = result["text"]
-        language = result.get("language", "unknown")
+        language = result["language"]
+        
+        put_transcript(youtube_url, None, "whisper", text, "base")
         
-        # Step 4: Save Output
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            f.write(f"[Detected Language: {language}]\n\n")
-            f.write(text)
+        # Step 2: Save Output (content-addressed, so concurrent runs never share a file)
+        output = f"[Detected Language: {language}]\n\n{text}"
+        _, output_path = get_store().put_content(OUTPUT_FILE, output.encode("utf-8"))
+        print(f"Saved transcript to {output_path}")
             
         return text
 
@@ -0,0 +1,120 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Add parent directory to path to import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.agents.agent_orchestrator import run_agent_workflow, stored_results
+from backend.audio.sources import resolve_sources, local_path, AUDIO_EXTENSIONS
+
+# Batch processing of lecture recordings: files, directories, glob patterns or URLs.
+# Sources are processed a few at a time; a source whose results for the same provider,
+# model and options are already in the artifact store (or, with --output-dir, whose outputs
+# there are newer than the file) is skipped.
+# Usage: python backend/batch_ingest.py /nas/lectures "/nas/extra/**/*.mp3" --provider ollama --workers 2 --output-dir out
+
+OUTPUTS = ("pdf", "brf")
+
+def output_paths(source: str, output_dir: str, roots: list) -> dict:
+    """Where a source's outputs go: its path relative to the directory it was found in, mirrored under output_dir."""
+    path = local_path(source)
+    if path is None:
+        # URLs: one flat name per source
+        stem = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in source.split("://")[-1])[:100]
+    else:
+        root = next((r for r in roots if path.startswith(r + os.sep)), os.path.dirname(path))
+        stem = os.path.splitext(os.path.relpath(path, root))[0]
+    base = os.path.join(output_dir, stem)
+    paths = {kind: f"{base}.{kind}" for kind in OUTPUTS}
+    paths["results"] = f"{base}.results.json"
+    return paths
+
+def outputs_current(source: str, paths: dict) -> bool:
+    path = local_path(source)
+    if path is None:
+        return False
+    try:
+        source_mtime = os.stat(path).st_mtime
+        return all(os.stat(paths[kind]).st_mtime >= source_mtime for kind in OUTPUTS)
+    except OSError:
+        return False
+
+def export(results: dict, paths: dict):
+    os.makedirs(os.path.dirname(paths["results"]), exist_ok=True)
+    for kind in OUTPUTS:
+        if results.get(f"{kind}_path"):
+            shutil.copyfile(results[f"{kind}_path"], paths[kind])
+    with open(paths["results"], "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=1)
+
+def process(source: str, args, roots: list) -> tuple:
+    """Returns (status, detail) with status "done", "skipped" or "failed"."""
+    options = {"provider_type": args.provider, "provider_model": args.model,
+               "use_digest": not args.no_digest, "batch_mode": args.batch_mode}
+    paths = output_paths(source, args.output_dir, roots) if args.output_dir else None
+
+    if not args.force:
+        if paths and outputs_current(source, paths):
+            return "skipped", paths["pdf"]
+        stored = stored_results(source, **options)
+        if stored is not None:
+            if paths:
+                export(stored, paths)
+            return "skipped", stored.get("pdf_path", "")
+
+    start = time.perf_counter()
+    try:
+        results = run_agent_workflow(source, **options)
+    except Exception as e:
+        return "failed", f"{type(e).__name__}: {e}"
+    if "error" in results:
+        return "failed", results["error"]
+    if paths:
+        export(results, paths)
+    return "done", f"{paths['pdf'] if paths else results.get('pdf_path', '')} ({time.perf_counter() - start:.1f}s)"
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate study material for many recordings")
+    parser.add_argument("sources", nargs="+", help="Audio / video files, directories, glob patterns or URLs")
+    parser.add_argument("--provider", default="openai", help="openai or ollama")
+    parser.add_argument("--model", help="Model name (default: the provider's default)")
+    parser.add_argument("--workers", type=int, default=2, help="Sources processed at the same time")
+    parser.add_argument("--output-dir", help="Copy PDF, BRF and results JSON here, mirroring the source directories")
+    parser.add_argument("--extensions", help=f"Comma-separated extensions for directories (default: {','.join(AUDIO_EXTENSIONS)})")
+    parser.add_argument("--batch-mode", action="store_true", default=None, help="Summary, notes and Q&A in one LLM call")
+    parser.add_argument("--no-digest", action="store_true", help="Give the agents the raw transcript instead of a digest")
+    parser.add_argument("--force", action="store_true", help="Process sources even if they were processed before")
+    args = parser.parse_args()
+
+    extensions = AUDIO_EXTENSIONS
+    if args.extensions:
+        extensions = tuple(ext if ext.startswith(".") else f".{ext}" for ext in args.extensions.split(","))
+    sources = resolve_sources(args.sources, extensions)
+    if not sources:
+        print("No sources found.")
+        sys.exit(1)
+    # Directories given on the command line, for mirroring the layout under --output-dir
+    roots = [os.path.abspath(os.path.expanduser(s)) for s in args.sources if os.path.isdir(os.path.expanduser(s))]
+
+    print(f"Processing {len(sources)} sources with {args.workers} workers...")
+    counts = {"done": 0, "skipped": 0, "failed": 0}
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {executor.submit(process, source, args, roots): source for source in sources}
+        for future in as_completed(futures):
+            try:
+                status, detail = future.result()
+            except Exception as e:
+                status, detail = "failed", f"{type(e).__name__}: {e}"
+            counts[status] += 1
+            print(f"[{status.upper():>7}] {futures[future]} -> {detail}")
+
+    print(f"\nDone: {counts['done']}, skipped: {counts['skipped']}, failed: {counts['failed']}")
+    sys.exit(1 if counts["failed"] else 0)
+
+if __name__ == "__main__":
+    main()
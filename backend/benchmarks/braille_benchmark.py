@@ -0,0 +1,61 @@
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path to import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.modules.braille_converter import text_to_braille, braille_dict
+
+# Throughput of the Braille translation engine on megabyte-scale text.
+# Usage: python benchmarks/braille_benchmark.py --mb 4 --repeat 3
+
+ENGLISH_SAMPLE = (
+    "In this lecture we discuss the structure of the cell. The nucleus contains the genetic "
+    "material, and the mitochondria produce energy through cellular respiration. Around 37.2 "
+    "trillion cells make up the human body! Which of these organelles would you find in plants, "
+    "and why? NASA scientists have studied how children learn about DNA, RNA and proteins. "
+)
+HINDI_SAMPLE = (
+    "इस व्याख्यान में हम कोशिका की संरचना पर चर्चा करते हैं। केंद्रक में आनुवंशिक सामग्री होती है, "
+    "और माइटोकॉन्ड्रिया ऊर्जा का उत्पादन करते हैं। मानव शरीर में लगभग ३७ खरब कोशिकाएँ हैं। "
+)
+
+def legacy_text_to_braille(text: str) -> str:
+    """The previous per-character implementation, for comparison."""
+    return "".join(braille_dict.get(ch.lower(), ch) for ch in text)
+
+def build_text(sample: str, megabytes: float) -> str:
+    target = int(megabytes * 1024 * 1024)
+    return sample * max(1, target // len(sample.encode("utf-8")))
+
+def measure(label: str, fn, text: str, repeat: int) -> dict:
+    size_mb = len(text.encode("utf-8")) / (1024 * 1024)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    result = {"case": label, "mb": round(size_mb, 2), "seconds": round(best, 3),
+              "mb_per_s": round(size_mb / best, 2) if best else float("inf")}
+    print(f"{label:<28} {result['mb']:>7.2f} MB {result['seconds']:>8.3f} s {result['mb_per_s']:>9.2f} MB/s")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Braille translation throughput")
+    parser.add_argument("--mb", type=float, default=4.0, help="Input size in megabytes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+
+    english = build_text(ENGLISH_SAMPLE, args.mb)
+    hindi = build_text(HINDI_SAMPLE, args.mb)
+
+    print(f"{'case':<28} {'input':>10} {'time':>10} {'throughput':>14}")
+    measure("legacy (per character)", legacy_text_to_braille, english, args.repeat)
+    measure("english grade 1", lambda t: text_to_braille(t, grade=1), english, args.repeat)
+    measure("english grade 2", lambda t: text_to_braille(t, grade=2), english, args.repeat)
+    measure("hindi (bharati)", lambda t: text_to_braille(t, grade=1), hindi, args.repeat)
+
+if __name__ == "__main__":
+    main()
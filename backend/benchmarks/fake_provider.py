@@ -0,0 +1,102 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+
+# Add parent directory to path to import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.LLM.providers.base import LLMProvider
+
+# Deterministic stand-in for an LLM, for offline benchmarks.
+# The response is chosen by the agent's system message and filled with words taken from the
+# prompt (so Braille / PDF work on realistic text), seeded by a hash of the prompt: the same
+# prompt always gets the same answer. Latency follows a simple model: a fixed delay per call,
+# prompt processing proportional to its length, and generation at a fixed token rate.
+
+_WORD_RE = re.compile(r"[^\W\d_]{3,}")
+
+class FakeProvider(LLMProvider):
+    def __init__(self, model: str = "fake", latency: float = 0.2, seconds_per_1k_chars: float = 0.0,
+                 tokens_per_second: float = 200.0, language: str = "en", summary_words: int = 120,
+                 notes: int = 8, questions: int = 5):
+        """
+        :param latency: Seconds added to every call (network / queueing).
+        :param seconds_per_1k_chars: Prompt processing time per 1000 prompt characters.
+        :param tokens_per_second: Generation speed, one token per word (0 = instant).
+        :param language: Language reported to the language detection agent.
+        """
+        self.model = model
+        self.latency = latency
+        self.seconds_per_1k_chars = seconds_per_1k_chars
+        self.tokens_per_second = tokens_per_second
+        self.language = language
+        self.summary_words = summary_words
+        self.notes = notes
+        self.questions = questions
+
+    def _rng(self, prompt: str, system_message: str) -> random.Random:
+        seed = hashlib.sha256(f"{system_message}\n{prompt}".encode("utf-8")).hexdigest()
+        return random.Random(int(seed[:16], 16))
+
+    def _sentence(self, rng: random.Random, words: list, length: int) -> str:
+        picked = [rng.choice(words) for _ in range(length)]
+        return " ".join(picked).capitalize() + "."
+
+    def _text(self, rng: random.Random, words: list, length: int) -> str:
+        sentences = []
+        while length > 0:
+            size = min(length, rng.randint(8, 16))
+            sentences.append(self._sentence(rng, words, size))
+            length -= size
+        return " ".join(sentences)
+
+    def _respond(self, prompt: str, system_message: str) -> str:
+        rng = self._rng(prompt, system_message)
+        words = _WORD_RE.findall(prompt) or ["lecture", "topic", "example"]
+        system = (system_message or "").lower()
+        notes = [self._sentence(rng, words, rng.randint(6, 12)) for _ in range(self.notes)]
+        questions = [{"question": self._sentence(rng, words, rng.randint(5, 9))[:-1] + "?",
+                      "answer": self._sentence(rng, words, rng.randint(6, 12))} for _ in range(self.questions)]
+
+        if "language detection" in system:
+            return json.dumps({"language": self.language, "confidence": 0.9})
+        if "expert note taker" in system:  # transcript digest chunk
+            return json.dumps({"summary": self._text(rng, words, 40),
+                               "key_terms": sorted(set(rng.choice(words) for _ in range(6))),
+                               "sections": [self._sentence(rng, words, 4) for _ in range(3)]})
+        if "educational ai assistant" in system:  # context
+            return json.dumps({"topic": self._sentence(rng, words, 3)[:-1],
+                               "subtopics": [self._sentence(rng, words, 3)[:-1] for _ in range(3)],
+                               "key_points": notes[:3], "intent": "Lecture"})
+        if "content generator" in system:  # batched summary / notes / Q&A
+            return json.dumps({"summary": self._text(rng, words, self.summary_words),
+                               "notes": notes, "questions": questions})
+        if "study aid" in system:
+            return json.dumps({"notes": notes})
+        if "exam" in system:
+            return json.dumps({"questions": questions})
+        # Summaries and anything else: plain text
+        return self._text(rng, words, self.summary_words)
+
+    def _prompt_delay(self, prompt: str, kwargs: dict) -> float:
+        chars = len(prompt) + len(kwargs.get("prefix") or "")
+        return self.latency + self.seconds_per_1k_chars * chars / 1000
+
+    def _token_delay(self, tokens: int) -> float:
+        return tokens / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def generate(self, prompt: str, system_message: str = "You are a helpful assistant.", **kwargs) -> str:
+        response = self._respond(prompt, system_message)
+        time.sleep(self._prompt_delay(prompt, kwargs) + self._token_delay(len(response.split())))
+        return response
+
+    def generate_stream(self, prompt: str, system_message: str = "You are a helpful assistant.", **kwargs):
+        response = self._respond(prompt, system_message)
+        time.sleep(self._prompt_delay(prompt, kwargs))
+        for word in response.split(" "):
+            time.sleep(self._token_delay(1))
+            yield word + " "
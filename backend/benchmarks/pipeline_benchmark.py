@@ -0,0 +1,383 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Add parent directory to path to import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+# Offline, repeatable benchmark of the audio modules and the full agent workflow.
+# Fixture audio (local files, or a generated speech-like signal) is decoded once and seeded
+# into the decoded-audio cache, and the audio modules and the workflow are given the file as
+# a local source: they read it like a video they already streamed, and language detection
+# takes its metadata from the file instead of YouTube. The workflow runs against a deterministic FakeProvider
+# with configurable latency. Every case runs in a fresh process (so peak RSS belongs to that
+# case) with its own cache directories, and results are written as JSON; pass --baseline
+# with an earlier result file to compare.
+# Usage: python benchmarks/pipeline_benchmark.py --fixture-seconds 120 --repeat 3
+
+SAMPLE_RATE = 16000
+
+# name -> (module, function, language); the Google Speech Recognition modules need the network
+AUDIO_CASES = {
+    "whisper_en": ("backend.audio.youtube_whisper", "transcribe_with_whisper", "en"),
+    "whisper_hi": ("backend.audio.hindi_whisper", "transcribe_with_hindi_whisper", "hi"),
+    "whisper_mr": ("backend.audio.marathi_whisper", "transcribe_with_marathi_whisper", "mr"),
+    "vosk_en": ("backend.audio.youtube_vosk", "transcribe_with_vosk", "en"),
+    "vosk_hi": ("backend.audio.hindi_vosk", "transcribe_with_hindi_vosk", "hi"),
+}
+ONLINE_AUDIO_CASES = {
+    "speech_en": ("backend.audio.youtube_speech", "transcribe_with_speech_recognition", "en"),
+    "speech_hi": ("backend.audio.hindi_speech", "transcribe_with_hindi_speech_recognition", "hi"),
+    "speech_mr": ("backend.audio.marathi_speech", "transcribe_with_marathi_speech_recognition", "mr"),
+}
+
+# Used as the transcript when the workflow runs without Whisper (about 150 spoken words per minute)
+FIXTURE_TRANSCRIPT = (
+    "Today we look at how plants turn light into chemical energy. Photosynthesis happens in the "
+    "chloroplasts, where chlorophyll absorbs mostly red and blue light. Water is split, oxygen is "
+    "released, and the energy is stored in molecules such as glucose. Why do leaves change colour "
+    "in autumn? As chlorophyll breaks down, other pigments become visible. "
+)
+WORDS_PER_SECOND = 2.5
+
+# --- Fixtures ---
+
+def generate_fixture(path: str, seconds: float, seed: int = 7):
+    """Writes a speech-like test signal: voiced bursts (harmonics + noise) separated by pauses."""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    signal = np.zeros(total, dtype=np.float32)
+    pos = 0
+    while pos < total:
+        burst = int(rng.uniform(0.3, 2.0) * SAMPLE_RATE)
+        t = np.arange(min(burst, total - pos)) / SAMPLE_RATE
+        pitch = rng.uniform(90, 220)
+        voiced = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+        envelope = np.sin(np.pi * np.arange(len(t)) / max(1, len(t)))
+        signal[pos:pos + len(t)] = 0.25 * envelope * (voiced + 0.3 * rng.standard_normal(len(t)))
+        pos += len(t) + int(rng.uniform(0.2, 0.8) * SAMPLE_RATE)
+    pcm = (np.clip(signal, -1.0, 1.0) * 32767).astype(np.int16)
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(pcm.tobytes())
+
+def decode_fixture(path: str) -> bytes:
+    """16 kHz mono s16le PCM of an audio file (WAVs in that format directly, anything else via ffmpeg)."""
+    try:
+        with wave.open(path, "rb") as wf:
+            if (wf.getnchannels(), wf.getsampwidth(), wf.getframerate()) == (1, 2, SAMPLE_RATE):
+                return wf.readframes(wf.getnframes())
+    except (wave.Error, EOFError):
+        pass
+    from backend.audio.youtube_audio_stream import _ffmpeg_cmd
+    return subprocess.run(_ffmpeg_cmd(path, "s16le"), check=True, capture_output=True).stdout
+
+def seed_fixture(path: str) -> dict:
+    """
+    Seeds the decoded-audio cache with the fixture under its local source ID. The modules and
+    the workflow are given the file path, so nothing (not even video metadata) is fetched online.
+    """
+    from backend.audio import pcm_cache
+    from backend.audio.sources import local_source_id
+    if pcm_cache.CACHE_DIR != os.environ.get("AUDIO_CACHE_DIR"):
+        raise RuntimeError("Backend modules were imported before the benchmark set its cache directories")
+    path = os.path.abspath(path)
+    pcm = decode_fixture(path)
+    video_id = local_source_id(path)
+    with pcm_cache.pcm_writer(video_id) as f:
+        f.write(pcm)
+    return {
+        "file": path,
+        "video_id": video_id,
+        "url": path,
+        "audio_seconds": round(len(pcm) / 2 / SAMPLE_RATE, 3),
+        "sha256": hashlib.sha256(pcm).hexdigest(),
+    }
+
+def fixture_transcript(audio_seconds: float) -> str:
+    words = FIXTURE_TRANSCRIPT.split()
+    count = max(len(words), int(audio_seconds * WORDS_PER_SECOND))
+    return " ".join(words[i % len(words)] for i in range(count))
+
+# --- Measurement (inside the case process) ---
+
+def _peak_rss_mb(who) -> float:
+    if resource is None:
+        try:
+            import psutil
+            return round(psutil.Process().memory_info().peak_wset / 2**20, 1) if who == "self" else None
+        except (ImportError, AttributeError):
+            return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return round(usage.ru_maxrss * scale / 2**20, 1)
+
+def _children_cpu() -> float:
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def _shutdown_pools():
+    # Worker processes only count towards the children's CPU / RSS once they have exited
+    for module in ("backend.audio.whisper_transcribe", "backend.modules.braille_converter"):
+        if module in sys.modules:
+            sys.modules[module].shutdown_pool()
+
+def _clear_transcripts():
+    from backend.audio import transcript_cache
+    shutil.rmtree(transcript_cache.CACHE_DIR, ignore_errors=True)
+
+def _measure(fn, audio_seconds: float) -> dict:
+    wall_start, cpu_start, children_start = time.perf_counter(), time.process_time(), _children_cpu()
+    output = fn()
+    _shutdown_pools()
+    wall = time.perf_counter() - wall_start
+    return {
+        "wall_s": round(wall, 3),
+        "cpu_s": round(time.process_time() - cpu_start, 3),
+        "children_cpu_s": round(_children_cpu() - children_start, 3),
+        "peak_rss_mb": _peak_rss_mb("self"),
+        "children_peak_rss_mb": _peak_rss_mb("children"),
+        "audio_s_per_s": round(audio_seconds / wall, 2) if wall else None,
+    }, output
+
+def run_audio_case(name: str, spec: tuple, fixture: dict, repeat: int) -> dict:
+    module_name, function_name, _ = spec
+    case = {"name": name, "kind": "audio", "fixture": fixture["video_id"], "runs": []}
+    try:
+        module = __import__(module_name, fromlist=[function_name])
+        transcribe = getattr(module, function_name)
+    except Exception as e:
+        case.update(status="skipped", error=f"{type(e).__name__}: {e}")
+        return case
+    for _ in range(repeat):
+        _clear_transcripts()  # every run transcribes (the first one also loads the model)
+        metrics, text = _measure(lambda: transcribe(fixture["url"]), fixture["audio_seconds"])
+        # The modules report failures as text instead of raising
+        if not isinstance(text, str) or text.startswith(("Error", "❌")):
+            case.update(status="failed", error=str(text)[:500])
+            return case
+        metrics["transcript_chars"] = len(text)
+        case["runs"].append(metrics)
+    case["status"] = "ok"
+    return case
+
+def run_pipeline_case(fixture: dict, repeat: int, provider_options: dict, transcription: str,
+                      workflow_options: dict) -> dict:
+    from backend.agents.agent_orchestrator import run_agent_workflow
+    from backend.agents.transcription_agent import WHISPER_CACHE_KEYS
+    from backend.audio.transcript_cache import put_transcript
+    from backend.benchmarks.fake_provider import FakeProvider
+
+    language = provider_options.get("language", "en")
+    case = {"name": f"pipeline_{language}", "kind": "pipeline", "fixture": fixture["video_id"],
+            "transcription": transcription, "runs": []}
+    for _ in range(repeat):
+        _clear_transcripts()
+        if transcription == "seeded":
+            cache_language, _ = WHISPER_CACHE_KEYS.get(language, (None, None))
+            put_transcript(fixture["url"], cache_language, "whisper",
+                           fixture_transcript(fixture["audio_seconds"]), "base")
+
+        # Stage callbacks run on the stage's own thread, so thread CPU time isolates each stage
+        stages, started = {}, {}
+        def on_progress(event):
+            if event["status"] == "started":
+                started[event["stage"]] = time.thread_time()
+            elif event["stage"] in started:
+                stages[event["stage"]] = {"wall_s": event["seconds"],
+                                          "cpu_s": round(time.thread_time() - started[event["stage"]], 3)}
+
+        provider = FakeProvider(**provider_options)
+        metrics, results = _measure(lambda: run_agent_workflow(
+            fixture["url"], provider_type="fake", llm_provider=provider, use_cache=False,
+            on_progress=on_progress, **workflow_options), fixture["audio_seconds"])
+        if "error" in results:
+            case.update(status="failed", error=results["error"])
+            return case
+        metrics["stages"] = stages
+        metrics["llm_s"] = results["timings"].get("llm")
+        metrics["llm_calls"] = results.get("llm_calls")
+        case["runs"].append(metrics)
+    case["status"] = "ok"
+    return case
+
+def _run_case(kind: str, args: tuple) -> dict:
+    if kind == "audio":
+        return run_audio_case(*args)
+    return run_pipeline_case(*args)
+
+def run_isolated(kind: str, *args) -> dict:
+    """Runs a case in a fresh process, so model loads, caches and peak RSS don't leak between cases."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        try:
+            return executor.submit(_run_case, kind, args).result()
+        except Exception as e:
+            return {"name": kind, "kind": kind, "status": "failed", "error": f"{type(e).__name__}: {e}"}
+
+# --- Reporting ---
+
+def _median(values: list):
+    values = sorted(v for v in values if v is not None)
+    return values[len(values) // 2] if values else None
+
+def summarize(case: dict) -> dict:
+    runs = case.get("runs", [])
+    return {metric: _median([run.get(metric) for run in runs])
+            for metric in ("wall_s", "cpu_s", "peak_rss_mb", "audio_s_per_s")}
+
+def print_case(case: dict):
+    if case["status"] != "ok":
+        print(f"{case['name']:<14} {case['status']}: {case.get('error', '')[:100]}")
+        return
+    s = summarize(case)
+    print(f"{case['name']:<14} {s['wall_s']:>9.3f} s {s['cpu_s']:>9.3f} s cpu {s['peak_rss_mb'] or 0:>8.1f} MB "
+          f"{s['audio_s_per_s'] or 0:>9.2f} audio s/s")
+    if case["kind"] == "pipeline":
+        stages = case["runs"][len(case["runs"]) // 2]["stages"]
+        for stage, m in stages.items():
+            print(f"  {stage:<14} {m['wall_s']:>8.3f} s {m['cpu_s']:>8.3f} s cpu")
+
+def compare(report: dict, baseline: dict, threshold: float) -> list:
+    """Cases whose median wall time, CPU time or peak RSS grew by more than `threshold` (fraction)."""
+    regressions = []
+    before = {case["name"]: summarize(case) for case in baseline.get("cases", []) if case.get("status") == "ok"}
+    print(f"\nCompared with {baseline.get('commit', '?')[:10]} ({baseline.get('timestamp', '?')}):")
+    for case in report["cases"]:
+        if case["status"] != "ok" or case["name"] not in before:
+            continue
+        now, old = summarize(case), before[case["name"]]
+        changes = []
+        for metric in ("wall_s", "cpu_s", "peak_rss_mb"):
+            if not old[metric] or now[metric] is None:
+                continue
+            change = (now[metric] - old[metric]) / old[metric]
+            changes.append(f"{metric} {change:+.1%}")
+            if change > threshold:
+                regressions.append(f"{case['name']} {metric}")
+        print(f"  {case['name']:<14} " + ", ".join(changes))
+    return regressions
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(__file__),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def _whisper_available() -> bool:
+    try:
+        import whisper  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmark")
+    parser.add_argument("--audio", nargs="*", default=[], help="Fixture audio files (default: a generated signal)")
+    parser.add_argument("--fixture-seconds", type=float, default=120.0, help="Length of the generated fixture")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (the median is reported)")
+    parser.add_argument("--modules", nargs="*", default=list(AUDIO_CASES),
+                        help=f"Audio modules to run ({', '.join(list(AUDIO_CASES) + list(ONLINE_AUDIO_CASES))})")
+    parser.add_argument("--no-pipeline", action="store_true", help="Only benchmark the audio modules")
+    parser.add_argument("--transcription", choices=["auto", "whisper", "seeded"], default="auto",
+                        help="Workflow transcription: real Whisper, or a seeded fixture transcript (auto: Whisper if installed)")
+    parser.add_argument("--language", default="en", help="Language the fake LLM detects")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Fake LLM seconds per call")
+    parser.add_argument("--llm-seconds-per-1k-chars", type=float, default=0.0, help="Fake LLM prompt processing time")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=200.0, help="Fake LLM generation speed (0 = instant)")
+    parser.add_argument("--batch-mode", action="store_true", help="Generate summary, notes and Q&A in one call")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/pipeline-<commit>-<time>.json)")
+    parser.add_argument("--baseline", help="Earlier result file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative growth reported as a regression")
+    parser.add_argument("--keep", action="store_true", help="Keep the work directory (caches, artifacts)")
+    args = parser.parse_args()
+
+    # All caches and outputs go to a scratch directory; set before any backend module is imported
+    work_dir = tempfile.mkdtemp(prefix="sparshvaani-bench-")
+    for variable, name in (("AUDIO_CACHE_DIR", "audio"), ("TRANSCRIPT_CACHE_DIR", "transcripts"),
+                           ("ARTIFACT_DIR", "artifacts"), ("LLM_CACHE_PATH", "llm_cache.sqlite3")):
+        os.environ[variable] = os.path.join(work_dir, name)
+
+    try:
+        audio_files = args.audio
+        if not audio_files:
+            fixture_path = os.path.join(work_dir, "fixture.wav")
+            generate_fixture(fixture_path, args.fixture_seconds)
+            audio_files = [fixture_path]
+        fixtures = [seed_fixture(path) for path in audio_files]
+
+        transcription = args.transcription
+        if transcription == "auto":
+            transcription = "whisper" if _whisper_available() else "seeded"
+        provider_options = {"latency": args.llm_latency, "seconds_per_1k_chars": args.llm_seconds_per_1k_chars,
+                            "tokens_per_second": args.llm_tokens_per_second, "language": args.language}
+        workflow_options = {"batch_mode": args.batch_mode}
+        all_cases = {**AUDIO_CASES, **ONLINE_AUDIO_CASES}
+
+        report = {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": {**vars(args), "transcription": transcription},
+            "fixtures": fixtures,
+            "cases": [],
+        }
+        print(f"{'case':<14} {'wall':>11} {'cpu':>13} {'peak rss':>11} {'throughput':>19}")
+        for fixture in fixtures:
+            for name in args.modules:
+                if name not in all_cases:
+                    parser.error(f"Unknown module '{name}'")
+                case = run_isolated("audio", name, all_cases[name], fixture, args.repeat)
+                report["cases"].append(case)
+                print_case(case)
+            if not args.no_pipeline:
+                case = run_isolated("pipeline", fixture, args.repeat, provider_options, transcription, workflow_options)
+                report["cases"].append(case)
+                print_case(case)
+
+        output = args.output or os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "results",
+            f"pipeline-{report['commit'][:10] or 'nogit'}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1, ensure_ascii=False)
+        print(f"\nResults written to {output}")
+
+        if args.baseline:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                regressions = compare(report, json.load(f), args.threshold)
+            if regressions:
+                print(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+                sys.exit(1)
+    finally:
+        if args.keep:
+            print(f"Work directory kept at {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
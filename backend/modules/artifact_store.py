@@ -0,0 +1,183 @@
+import os
+import re
+import json
+import time
+import uuid
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+
+# Artifact store for generated files (PDF, BRF, transcripts, result manifests).
+# Every run writes into its own directory, keyed by a job ID or by a hash of the request
+# (or of the content), so concurrent runs never write to the same path. Files are written
+# to a temp name in the target directory and renamed into place, so readers only ever see
+# complete files. Old directories are removed by a retention / size policy (gc()).
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ARTIFACT_DIR = os.environ.get("ARTIFACT_DIR", os.path.join(BACKEND_DIR, "cache", "artifacts"))
+ARTIFACT_RETENTION_HOURS = float(os.environ.get("ARTIFACT_RETENTION_HOURS", "72"))
+ARTIFACT_MAX_MB = int(os.environ.get("ARTIFACT_MAX_MB", "2048"))
+# Minimum seconds between two automatic gc() runs
+GC_INTERVAL_SECONDS = 300
+
+_KEY_RE = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+_TMP_SUFFIX = ".tmp"
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
+
+def request_key(*parts) -> str:
+    """Deterministic key for a request (e.g. video ID, provider, model and options)."""
+    return hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:32]
+
+def content_key(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:32]
+
+class ArtifactStore:
+    def __init__(self, root: str = ARTIFACT_DIR, retention_hours: float = ARTIFACT_RETENTION_HOURS,
+                 max_mb: int = ARTIFACT_MAX_MB):
+        self.root = os.path.abspath(root)
+        self.retention_seconds = retention_hours * 3600
+        self.max_bytes = max_mb * 1024 * 1024
+        self._gc_lock = threading.Lock()
+        self._last_gc = 0.0
+
+    def _dir(self, key: str) -> str:
+        if not _KEY_RE.match(key):
+            raise ValueError(f"Invalid artifact key: {key!r}")
+        return os.path.join(self.root, key)
+
+    def path(self, key: str, filename: str) -> str:
+        """Final location of an artifact (it may not exist yet)."""
+        if os.path.basename(filename) != filename or filename.startswith("."):
+            raise ValueError(f"Invalid artifact name: {filename!r}")
+        return os.path.join(self._dir(key), filename)
+
+    def get(self, key: str, filename: str) -> str:
+        """Path of a stored artifact, or None. Marks the entry as recently used."""
+        path = self.path(key, filename)
+        if not os.path.isfile(path):
+            return None
+        try:
+            os.utime(self._dir(key), None)
+        except OSError:
+            pass
+        return path
+
+    def temp_path(self, key: str, filename: str) -> str:
+        """A unique temporary path next to the artifact; publish it with commit()."""
+        final = self.path(key, filename)
+        os.makedirs(os.path.dirname(final), exist_ok=True)
+        return os.path.join(os.path.dirname(final), f".{filename}.{uuid.uuid4().hex}{_TMP_SUFFIX}")
+
+    def commit(self, tmp_path: str, key: str, filename: str) -> str:
+        """Atomically moves a finished temp file into place and returns the final path."""
+        final = self.path(key, filename)
+        os.replace(tmp_path, final)
+        try:
+            os.utime(os.path.dirname(final), None)
+        except OSError:
+            pass
+        self._maybe_gc()
+        return final
+
+    def discard(self, tmp_path: str):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    @contextmanager
+    def writer(self, key: str, filename: str):
+        """
+        Yields a temp path to write to; on success it is renamed to the artifact path,
+        on error it is removed.
+        """
+        tmp_path = self.temp_path(key, filename)
+        try:
+            yield tmp_path
+        except BaseException:
+            self.discard(tmp_path)
+            raise
+        self.commit(tmp_path, key, filename)
+
+    def put_bytes(self, key: str, filename: str, data: bytes) -> str:
+        with self.writer(key, filename) as tmp_path:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+        return self.path(key, filename)
+
+    def put_content(self, filename: str, data: bytes) -> tuple:
+        """Content-addressed store: returns (key, path); identical content is stored once."""
+        key = content_key(data)
+        existing = self.get(key, filename)
+        if existing:
+            return key, existing
+        return key, self.put_bytes(key, filename, data)
+
+    def put_json(self, key: str, filename: str, obj) -> str:
+        return self.put_bytes(key, filename, json.dumps(obj, ensure_ascii=False, indent=1).encode("utf-8"))
+
+    def get_json(self, key: str, filename: str):
+        path = self.get(key, filename)
+        if path is None:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _maybe_gc(self):
+        if time.time() - self._last_gc >= GC_INTERVAL_SECONDS:
+            self.gc()
+
+    def gc(self) -> int:
+        """
+        Removes entries not used within the retention period, then the least recently used
+        ones until the store fits its size budget. Returns the number of entries removed.
+        """
+        with self._gc_lock:
+            self._last_gc = time.time()
+            try:
+                names = os.listdir(self.root)
+            except OSError:
+                return 0
+
+            entries = []
+            for name in names:
+                path = os.path.join(self.root, name)
+                try:
+                    mtime = os.stat(path).st_mtime
+                    size = sum(
+                        os.path.getsize(os.path.join(dirpath, f))
+                        for dirpath, _, files in os.walk(path) for f in files
+                    )
+                except OSError:
+                    continue  # removed by another worker
+                entries.append((mtime, size, path))
+
+            removed = 0
+            total = sum(size for _, size, _ in entries)
+            cutoff = time.time() - self.retention_seconds
+            for mtime, size, path in sorted(entries):
+                if mtime >= cutoff and total <= self.max_bytes:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
+                removed += 1
+            if removed:
+                print(f"[ArtifactStore] Removed {removed} expired entries")
+            return removed
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store() -> ArtifactStore:
+    """The process-wide store at ARTIFACT_DIR."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore()
+        return _store
@@ -1,16 +1,294 @@
+import os
+import re
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
+try:
+    from modules import braille_tables as tables
+except ImportError:
+    from backend.modules import braille_tables as tables
+
+# Table-driven Braille translation.
+# Single-character mappings (letters, capitals, punctuation, Devanagari) are precompiled
+# into one str.translate table, numbers and capitalized words are marked with regex passes,
+# and Grade 2 contractions are matched per word with a trie. Grade 2 results are memoized
+# per whitespace-delimited token, since natural text repeats the same words over and over.
+# English follows UEB; Hindi / Marathi (Devanagari) follow Bharati Braille.
+
+# 1 = uncontracted, 2 = contracted (English words only)
+DEFAULT_GRADE = int(os.environ.get("BRAILLE_GRADE", "1"))
+
+# Documents larger than this (characters) are translated on a process pool
+PARALLEL_MIN_CHARS = int(os.environ.get("BRAILLE_PARALLEL_MIN_CHARS", "1000000"))
+BRAILLE_WORKERS = int(os.environ.get("BRAILLE_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+# Character-level map without indicators, kept for callers looking up single characters
 braille_dict = {
-    "a": "⠁", "b": "⠃", "c": "⠉", "d": "⠙", "e": "⠑",
-    "f": "⠋", "g": "⠛", "h": "⠓", "i": "⠊", "j": "⠚",
-    "k": "⠅", "l": "⠇", "m": "⠍", "n": "⠝", "o": "⠕",
-    "p": "⠏", "q": "⠟", "r": "⠗", "s": "⠎", "t": "⠞",
-    "u": "⠥", "v": "⠧", "w": "⠺", "x": "⠭", "y": "⠽", "z": "⠵",
-    " ": " ",
-    "0": "⠚", "1": "⠁", "2": "⠃", "3": "⠉", "4": "⠙", "5": "⠑",
-    "6": "⠋", "7": "⠛", "8": "⠓", "9": "⠊",
-    ".": "⠲", ",": "⠂", "?": "⠦", "!": "⠖"
+    **tables.LETTERS,
+    **{d: cell for d, cell in tables.DIGITS.items() if d.isascii()},
+    **tables.PUNCTUATION,
 }
 
-def text_to_braille(text: str) -> str:
-    """Convert plain English text to Braille (Grade 1)."""
-    return "".join(braille_dict.get(ch.lower(), ch) for ch in text)
+def _build_char_table() -> dict:
+    mapping = {}
+    mapping.update(tables.PUNCTUATION)
+    mapping.update(tables.DEVANAGARI)
+    mapping.update(tables.LETTERS)
+    mapping.update({ch.upper(): tables.CAPITAL + cell for ch, cell in tables.LETTERS.items()})
+    return str.maketrans(mapping)
+
+_CHAR_TABLE = _build_char_table()
+_NUMBER_TABLE = str.maketrans({**tables.DIGITS, **tables.NUMERIC_PUNCTUATION})
+
+_DIGIT = "0-9०-९"
+# A run of digits (with decimal points / thousands separators) and the character after it
+_NUMBER_RE = re.compile(rf"[{_DIGIT}]+(?:[.,][{_DIGIT}]+)*(?=([A-Za-z])?)")
+_CAPS_WORD_RE = re.compile(r"\b[A-Z]{2,}\b")
+_WORD_RE = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)*")
+_CONJUNCT_RE = re.compile("|".join(map(re.escape, tables.DEVANAGARI_CONJUNCTS)))
+
+# Characters that may surround a word that "stands alone" (whole-word contractions)
+_OPENING = set("([{\"'“‘-—")
+_CLOSING = set(".,;:!?)]}\"'”’-—…")
+
+# --- Grade 2 contraction trie ---
+
+_END = ""  # key of the terminal entry in a trie node: (cells, position rule)
+
+def _build_trie() -> dict:
+    trie = {}
+    groups = [
+        (tables.STRONG_CONTRACTIONS, "any"),
+        (tables.STRONG_GROUPSIGNS, "any"),
+        (tables.LOWER_GROUPSIGNS, "any"),
+        (tables.INITIAL_LETTER_CONTRACTIONS, "any"),
+        (tables.FINAL_LETTER_GROUPSIGNS, "not_initial"),
+        (tables.MEDIAL_GROUPSIGNS, "medial"),
+        ({"ing": tables.STRONG_GROUPSIGNS["ing"]}, "not_initial"),
+    ]
+    for mapping, rule in groups:
+        for letters, cells in mapping.items():
+            node = trie
+            for ch in letters:
+                node = node.setdefault(ch, {})
+            node[_END] = (cells, rule)
+    return trie
+
+_TRIE = _build_trie()
+
+_WHOLE_WORDS = {
+    **tables.INITIAL_LETTER_CONTRACTIONS,
+    **tables.STRONG_CONTRACTIONS,
+    **tables.STRONG_WORDSIGNS,
+    **tables.ALPHABETIC_WORDSIGNS,
+    **tables.SHORTFORMS,
+}
+
+def _allowed(rule: str, start: int, end: int, length: int) -> bool:
+    if rule == "any":
+        return True
+    if rule == "not_initial":
+        return start > 0
+    return start > 0 and end < length  # medial
+
+def _contract(word: str) -> str:
+    """Grade 2 part-word contractions for a lowercase word: longest allowed trie match at each position."""
+    out = []
+    i, n = 0, len(word)
+    while i < n:
+        node = _TRIE
+        best_end, best_cells = 0, None
+        j = i
+        while j < n:
+            node = node.get(word[j])
+            if node is None:
+                break
+            j += 1
+            entry = node.get(_END)
+            if entry and _allowed(entry[1], i, j, n):
+                best_end, best_cells = j, entry[0]
+        if best_cells is None:
+            out.append(word[i].translate(_CHAR_TABLE))
+            i += 1
+        else:
+            out.append(best_cells)
+            i = best_end
+    return "".join(out)
+
+def _grade2_word(word: str, standalone: bool, spaced: bool) -> str:
+    lower = word.lower()
+    if word == lower:
+        prefix = ""
+    elif word[0].isupper() and word[1:] == lower[1:]:
+        prefix = tables.CAPITAL
+    elif len(word) > 1 and word == word.upper():
+        prefix = tables.CAPITAL_WORD
+    else:
+        prefix = None  # mixed case: spell it out letter by letter
+
+    if prefix is None:
+        cells = word.translate(_CHAR_TABLE)
+    elif spaced and lower in tables.LOWER_WORDSIGNS:
+        cells = prefix + tables.LOWER_WORDSIGNS[lower]
+    elif standalone and lower in _WHOLE_WORDS:
+        cells = prefix + _WHOLE_WORDS[lower]
+    elif standalone and len(lower) == 1 and lower in tables.WORDSIGN_LETTERS:
+        cells = tables.GRADE1 + prefix + tables.LETTERS[lower]
+    else:
+        cells = prefix + _contract(lower)
+    return cells
+
+def _grade2_match(m: re.Match) -> str:
+    text, start, end = m.string, m.start(), m.end()
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    spaced = before.isspace() and after.isspace()
+    standalone = spaced or ((before.isspace() or before in _OPENING) and (after.isspace() or after in _CLOSING))
+    return _grade2_word(m.group(), standalone, spaced)
+
+def _number_match(m: re.Match) -> str:
+    cells = tables.NUMBER + m.group().translate(_NUMBER_TABLE)
+    # A letter a-j right after a number would be read as another digit
+    if m.group(1) and m.group(1).lower() in "abcdefghij":
+        cells += tables.GRADE1
+    return cells
+
+def _caps_word_match(m: re.Match) -> str:
+    return tables.CAPITAL_WORD + m.group().lower()
+
+def _conjunct_match(m: re.Match) -> str:
+    return tables.DEVANAGARI_CONJUNCTS[m.group()]
+
+def _translate(text: str, grade: int) -> str:
+    text = _NUMBER_RE.sub(_number_match, text)
+    if grade == 2:
+        text = _WORD_RE.sub(_grade2_match, text)
+    else:
+        text = _CAPS_WORD_RE.sub(_caps_word_match, text)
+    if _CONJUNCT_RE.search(text):
+        text = _CONJUNCT_RE.sub(_conjunct_match, text)
+    return text.translate(_CHAR_TABLE)
+
+_SPACE_RE = re.compile(r"(\s+)")
+_token_cache = {}
+MAX_CACHED_TOKENS = 200000
+
+def _translate_grade2(text: str) -> str:
+    # Whitespace-delimited tokens translate independently (the token edges count as
+    # spaces for the whole-word rules), so each distinct token is contracted only once.
+    cache = _token_cache
+    out = []
+    for token in _SPACE_RE.split(text):
+        cells = cache.get(token)
+        if cells is None:
+            if len(cache) >= MAX_CACHED_TOKENS:
+                cache.clear()
+            cells = cache[token] = _translate(token, 2)
+        out.append(cells)
+    return "".join(out)
+
+def text_to_braille(text: str, grade: int = None) -> str:
+    """
+    Convert text to Unicode Braille.
+    English uses UEB with capital and number indicators; grade=2 also applies contractions.
+    Devanagari (Hindi / Marathi) uses Bharati Braille. Unknown characters are kept as-is.
+    :param grade: 1 (uncontracted) or 2 (contracted); defaults to BRAILLE_GRADE.
+    """
+    if not text:
+        return ""
+    if grade is None:
+        grade = DEFAULT_GRADE
+    if grade == 2:
+        return _translate_grade2(text)
+    return _translate(text, 1)
+
+# --- Batch translation of whole documents ---
+
+# Joins the fields of a document. It is whitespace to the translator (so fields don't
+# affect each other's word rules) and passes through translation unchanged.
+_FIELD_SEPARATOR = "\x1e"
+
+# One pool per worker count. Pools are only shut down by shutdown_pool(), never replaced
+# while another thread's translation may still be submitting to them.
+_pools = {}
+_pool_lock = threading.Lock()
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Returns the shared worker pool for this worker count, creating it on first use."""
+    with _pool_lock:
+        if workers not in _pools:
+            print(f"[BrailleConverter] Starting {workers} worker processes...")
+            _pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pools[workers]
+
+def shutdown_pool():
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+def _collect(node, texts: list):
+    """Replaces every string in a nested dict/list with its index in `texts`."""
+    if isinstance(node, str):
+        texts.append(node.replace(_FIELD_SEPARATOR, " "))
+        return len(texts) - 1
+    if isinstance(node, dict):
+        return {key: _collect(value, texts) for key, value in node.items()}
+    if isinstance(node, (list, tuple)):
+        return [_collect(value, texts) for value in node]
+    return node
+
+def _rebuild(template, source, translated: list):
+    if isinstance(source, str):
+        return translated[template]
+    if isinstance(source, dict):
+        return {key: _rebuild(template[key], value, translated) for key, value in source.items()}
+    if isinstance(source, (list, tuple)):
+        return [_rebuild(t, value, translated) for t, value in zip(template, source)]
+    return source
+
+def _split_on_whitespace(buffer: str, parts: int) -> list:
+    """Cuts the buffer into about `parts` pieces, only right after whitespace (where translation is context-free)."""
+    size = -(-len(buffer) // parts)
+    pieces, start = [], 0
+    while start < len(buffer):
+        end = min(len(buffer), start + size)
+        if end < len(buffer):
+            match = _SPACE_RE.search(buffer, end)
+            end = match.end() if match else len(buffer)
+        pieces.append(buffer[start:end])
+        start = end
+    return pieces
+
+def translate_document(document, grade: int = None, workers: int = None):
+    """
+    Translates every string in a nested structure (dicts / lists, e.g. the workflow results)
+    to Braille and returns the same shape; other values are kept as they are.
+    All fields are joined into one buffer and translated in a single pass; large documents
+    (PARALLEL_MIN_CHARS and up) are cut on whitespace and translated on a process pool.
+    :param workers: Worker processes for large documents (default BRAILLE_WORKERS, 1 = in-process).
+    """
+    if grade is None:
+        grade = DEFAULT_GRADE
+    workers = BRAILLE_WORKERS if workers is None else workers
+
+    texts = []
+    template = _collect(document, texts)
+    if not texts:
+        return _rebuild(template, document, [])
+
+    buffer = _FIELD_SEPARATOR.join(texts)
+    if workers > 1 and len(buffer) >= PARALLEL_MIN_CHARS:
+        pieces = _split_on_whitespace(buffer, workers * 4)
+        pool = _get_pool(workers)
+        output = "".join(pool.map(text_to_braille, pieces, [grade] * len(pieces)))
+    else:
+        output = text_to_braille(buffer, grade)
+
+    # Field boundaries in the output: the separators, which translation preserves one-to-one
+    translated = output.split(_FIELD_SEPARATOR)
+    if len(translated) != len(texts):
+        raise ValueError(f"Braille field count mismatch ({len(translated)} != {len(texts)})")
+    return _rebuild(template, document, translated)
@@ -0,0 +1,151 @@
+# Braille translation tables used by braille_converter.
+# English follows Unified English Braille (UEB); Hindi and Marathi (Devanagari) follow
+# Bharati Braille. Cells are Unicode Braille patterns (U+2800-U+28FF).
+
+# Indicators
+CAPITAL = "⠠"           # dot 6: next letter is capital
+CAPITAL_WORD = "⠠⠠"     # dot 6 twice: whole word in capitals
+NUMBER = "⠼"            # dots 3456: digits follow
+GRADE1 = "⠰"            # dots 56: next cell is a letter, not a contraction / digit
+
+LETTERS = {
+    "a": "⠁", "b": "⠃", "c": "⠉", "d": "⠙", "e": "⠑",
+    "f": "⠋", "g": "⠛", "h": "⠓", "i": "⠊", "j": "⠚",
+    "k": "⠅", "l": "⠇", "m": "⠍", "n": "⠝", "o": "⠕",
+    "p": "⠏", "q": "⠟", "r": "⠗", "s": "⠎", "t": "⠞",
+    "u": "⠥", "v": "⠧", "w": "⠺", "x": "⠭", "y": "⠽", "z": "⠵",
+}
+
+# Digits use the cells of a-j after a number sign; Devanagari digits likewise
+DIGITS = {
+    "1": "⠁", "2": "⠃", "3": "⠉", "4": "⠙", "5": "⠑",
+    "6": "⠋", "7": "⠛", "8": "⠓", "9": "⠊", "0": "⠚",
+    "१": "⠁", "२": "⠃", "३": "⠉", "४": "⠙", "५": "⠑",
+    "६": "⠋", "७": "⠛", "८": "⠓", "९": "⠊", "०": "⠚",
+}
+# Inside a number
+NUMERIC_PUNCTUATION = {".": "⠲", ",": "⠂"}
+
+PUNCTUATION = {
+    " ": " ",
+    ".": "⠲", ",": "⠂", "?": "⠦", "!": "⠖", ";": "⠆", ":": "⠒",
+    "'": "⠄", "’": "⠄", "‘": "⠠⠦", "-": "⠤", "–": "⠠⠤", "—": "⠐⠠⠤",
+    '"': "⠠⠶", "“": "⠘⠦", "”": "⠘⠴",
+    "(": "⠐⠣", ")": "⠐⠜", "[": "⠨⠣", "]": "⠨⠜", "{": "⠸⠣", "}": "⠸⠜",
+    "/": "⠸⠌", "\\": "⠸⠡", "&": "⠈⠯", "%": "⠨⠴", "+": "⠐⠖", "=": "⠐⠶",
+    "*": "⠐⠔", "@": "⠈⠁", "$": "⠈⠎", "#": "⠸⠹", "<": "⠈⠣", ">": "⠈⠜",
+    "…": "⠲⠲⠲",
+}
+
+# Bharati Braille (Hindi / Marathi). Dependent vowel signs (matras) share the cells of
+# the independent vowels; the inherent "a" of a consonant is not written, as in Unicode.
+DEVANAGARI = {
+    # Vowels
+    "अ": "⠁", "आ": "⠜", "इ": "⠊", "ई": "⠔", "उ": "⠥", "ऊ": "⠳", "ऋ": "⠐⠗",
+    "ए": "⠑", "ऐ": "⠌", "ओ": "⠕", "औ": "⠪",
+    # Vowel signs
+    "ा": "⠜", "ि": "⠊", "ी": "⠔", "ु": "⠥", "ू": "⠳", "ृ": "⠐⠗",
+    "े": "⠑", "ै": "⠌", "ो": "⠕", "ौ": "⠪",
+    # Consonants
+    "क": "⠅", "ख": "⠨", "ग": "⠛", "घ": "⠣", "ङ": "⠬",
+    "च": "⠉", "छ": "⠡", "ज": "⠚", "झ": "⠴", "ञ": "⠒",
+    "ट": "⠾", "ठ": "⠺", "ड": "⠫", "ढ": "⠿", "ण": "⠼",
+    "त": "⠞", "थ": "⠹", "द": "⠙", "ध": "⠮", "न": "⠝",
+    "प": "⠏", "फ": "⠖", "ब": "⠃", "भ": "⠘", "म": "⠍",
+    "य": "⠽", "र": "⠗", "ल": "⠇", "ळ": "⠸", "व": "⠧",
+    "श": "⠩", "ष": "⠯", "स": "⠎", "ह": "⠓",
+    # Signs
+    "्": "⠈",   # halant (virama)
+    "ं": "⠰",   # anusvara
+    "ँ": "⠄",   # chandrabindu
+    "ः": "⠠",   # visarga
+    "़": "⠐",   # nukta
+    "।": "⠲", "॥": "⠲⠲",
+}
+
+# Conjuncts with their own Bharati cell (longer than one code point)
+DEVANAGARI_CONJUNCTS = {
+    "क्ष": "⠟",
+    "ज्ञ": "⠱",
+}
+
+# --- English Grade 2 (UEB contractions) ---
+
+# Whole words, used when the word stands alone
+ALPHABETIC_WORDSIGNS = {
+    "but": "⠃", "can": "⠉", "do": "⠙", "every": "⠑", "from": "⠋", "go": "⠛",
+    "have": "⠓", "just": "⠚", "knowledge": "⠅", "like": "⠇", "more": "⠍",
+    "not": "⠝", "people": "⠏", "quite": "⠟", "rather": "⠗", "so": "⠎",
+    "that": "⠞", "us": "⠥", "very": "⠧", "will": "⠺", "it": "⠭", "you": "⠽",
+    "as": "⠵",
+}
+
+STRONG_WORDSIGNS = {
+    "child": "⠡", "shall": "⠩", "this": "⠹", "which": "⠱", "out": "⠳", "still": "⠌",
+}
+
+# Only when the word has a space (or the start / end of the text) on both sides
+LOWER_WORDSIGNS = {
+    "be": "⠆", "enough": "⠢", "were": "⠶", "his": "⠦", "in": "⠔", "was": "⠴",
+}
+
+SHORTFORMS = {
+    "about": "⠁⠃", "above": "⠁⠃⠧", "according": "⠁⠉", "after": "⠁⠋",
+    "afternoon": "⠁⠋⠝", "again": "⠁⠛", "against": "⠁⠛⠌", "almost": "⠁⠇⠍",
+    "already": "⠁⠇⠗", "also": "⠁⠇", "although": "⠁⠇⠹", "altogether": "⠁⠇⠞",
+    "always": "⠁⠇⠺", "because": "⠆⠉", "before": "⠆⠋", "behind": "⠆⠓",
+    "below": "⠆⠇", "beneath": "⠆⠝", "beside": "⠆⠎", "between": "⠆⠞",
+    "beyond": "⠆⠽", "blind": "⠃⠇", "braille": "⠃⠗⠇", "children": "⠡⠝",
+    "could": "⠉⠙", "either": "⠑⠊", "first": "⠋⠌", "friend": "⠋⠗", "good": "⠛⠙",
+    "great": "⠛⠗⠞", "herself": "⠓⠻⠋", "himself": "⠓⠍⠋", "immediate": "⠊⠍⠍",
+    "its": "⠭⠎", "itself": "⠭⠋", "letter": "⠇⠗", "little": "⠇⠇", "much": "⠍⠡",
+    "must": "⠍⠌", "myself": "⠍⠽⠋", "necessary": "⠝⠑⠉", "neither": "⠝⠑⠊",
+    "paid": "⠏⠙", "perhaps": "⠏⠻⠓", "quick": "⠟⠅", "said": "⠎⠙", "should": "⠩⠙",
+    "such": "⠎⠡", "themselves": "⠮⠍⠧⠎", "today": "⠞⠙", "together": "⠞⠛⠗",
+    "tomorrow": "⠞⠍", "tonight": "⠞⠝", "would": "⠺⠙", "your": "⠽⠗",
+    "yourself": "⠽⠗⠋", "yourselves": "⠽⠗⠧⠎",
+}
+
+# Part-word contractions, usable anywhere in a word
+STRONG_CONTRACTIONS = {
+    "and": "⠯", "for": "⠿", "of": "⠷", "the": "⠮", "with": "⠾",
+}
+
+STRONG_GROUPSIGNS = {
+    "ch": "⠡", "gh": "⠣", "sh": "⠩", "th": "⠹", "wh": "⠱", "ed": "⠫",
+    "er": "⠻", "ou": "⠳", "ow": "⠪", "st": "⠌", "ar": "⠜", "ing": "⠬",
+}
+
+INITIAL_LETTER_CONTRACTIONS = {
+    # dot 5
+    "day": "⠐⠙", "ever": "⠐⠑", "father": "⠐⠋", "here": "⠐⠓", "know": "⠐⠅",
+    "lord": "⠐⠇", "mother": "⠐⠍", "name": "⠐⠝", "one": "⠐⠕", "part": "⠐⠏",
+    "question": "⠐⠟", "right": "⠐⠗", "some": "⠐⠎", "time": "⠐⠞", "under": "⠐⠥",
+    "work": "⠐⠺", "young": "⠐⠽", "there": "⠐⠮", "character": "⠐⠡",
+    "through": "⠐⠹", "where": "⠐⠱", "ought": "⠐⠳",
+    # dots 45
+    "upon": "⠘⠥", "these": "⠘⠮", "those": "⠘⠹", "whose": "⠘⠱", "word": "⠘⠺",
+    # dots 456
+    "cannot": "⠸⠉", "had": "⠸⠓", "many": "⠸⠍", "spirit": "⠸⠎", "their": "⠸⠮",
+    "world": "⠸⠺",
+}
+
+# Not at the start of a word
+FINAL_LETTER_GROUPSIGNS = {
+    "ound": "⠨⠙", "ance": "⠨⠑", "sion": "⠨⠝", "less": "⠨⠎", "ount": "⠨⠞",
+    "ence": "⠰⠑", "ong": "⠰⠛", "ful": "⠰⠇", "tion": "⠰⠝", "ness": "⠰⠎",
+    "ment": "⠰⠞", "ity": "⠰⠽",
+}
+
+# Neither the first nor the last letters of a word
+MEDIAL_GROUPSIGNS = {
+    "ea": "⠂", "bb": "⠆", "cc": "⠒", "ff": "⠖", "gg": "⠶",
+}
+
+# Anywhere in a word
+LOWER_GROUPSIGNS = {
+    "en": "⠢", "in": "⠔",
+}
+
+# A lone letter that is also an alphabetic wordsign needs the grade 1 indicator
+WORDSIGN_LETTERS = set("bcdefghjklmnpqrstuvwxyz")
@@ -0,0 +1,153 @@
+import re
+
+# BRF (Braille Ready Format) output for embossers and refreshable displays.
+# Unicode Braille is mapped to North American Braille ASCII and laid out in fixed pages
+# (40 cells x 25 lines by default), with word wrap, hyphenation of long words and a
+# braille page number on the last line of each page. Pages are written to the output
+# stream as soon as they are full, so only one page is held in memory.
+
+CELLS_PER_LINE = 40
+LINES_PER_PAGE = 25
+
+# North American Braille ASCII, indexed by the dot pattern (dot 1 = bit 0 ... dot 6 = bit 5)
+BRAILLE_ASCII = " A1B'K2L@CIF/MSP\"E3H9O6R^DJG>NTQ,*5<-U8V.%[$+X!&;:4\\0Z7(_?W]#Y)="
+
+# Unicode Braille (dots 7 and 8 are dropped) -> Braille ASCII; other whitespace becomes a space
+_ASCII_TABLE = {0x2800 + i: BRAILLE_ASCII[i % 64] for i in range(256)}
+_ASCII_TABLE.update({ord(ch): " " for ch in "\t\n\r\x0b\x0c\x1e"})
+_NON_BRF_RE = re.compile(r"[^ -_]")  # anything not translated into the Braille ASCII range
+
+# Braille ASCII for the number sign and the digits (a-j) used in page numbers
+_NUMBER_SIGN = "#"
+_DIGITS = str.maketrans("1234567890", "ABCDEFGHIJ")
+
+# Prefix indicators (capital, number, grade 1, dot 5 / 45 / 456 / 46 / 56 prefixes)
+# that must stay attached to the following cell when a word is hyphenated
+_PREFIXES = set(',#;"^_.')
+HYPHEN = "-"
+MIN_HYPHEN_PART = 3  # cells that must remain on each side of a hyphenation point
+
+def to_braille_ascii(braille: str) -> str:
+    """Maps Unicode Braille to Braille ASCII (one character per cell)."""
+    return _NON_BRF_RE.sub("", braille.translate(_ASCII_TABLE))
+
+def page_number(number: int) -> str:
+    return _NUMBER_SIGN + str(number).translate(_DIGITS)
+
+class BrfWriter:
+    """
+    Paginates Braille ASCII into an open text stream.
+    Use as a context manager (or call close()) so the last page is completed.
+    """
+
+    def __init__(self, stream, cells_per_line: int = CELLS_PER_LINE, lines_per_page: int = LINES_PER_PAGE):
+        self.stream = stream
+        self.cells_per_line = cells_per_line
+        # The last line of each page carries the page number
+        self.text_lines = lines_per_page - 1
+        self.page = 1
+        self.lines = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _line(self, text: str):
+        self.lines.append(text)
+        if len(self.lines) == self.text_lines:
+            self._flush_page()
+
+    def _flush_page(self):
+        if not self.lines:
+            return
+        lines = self.lines + [""] * (self.text_lines - len(self.lines))
+        number = page_number(self.page)
+        lines.append(number.rjust(self.cells_per_line))
+        # BRF convention: CRLF line ends, form feed between pages
+        self.stream.write("\r\n".join(lines) + "\r\n\f")
+        self.page += 1
+        self.lines = []
+
+    def blank_line(self):
+        # Never start a page with a blank line
+        if self.lines:
+            self._line("")
+
+    def new_page(self):
+        self._flush_page()
+
+    def heading(self, braille: str):
+        """Centered heading (long headings wrap), with a blank line before it."""
+        self.blank_line()
+        for line in self._wrap(to_braille_ascii(braille), 0, 0):
+            self._line(line.center(self.cells_per_line).rstrip())
+
+    def paragraph(self, braille: str, indent: int = 2, runover: int = 0):
+        """
+        Wrapped paragraph; the first line starts at cell indent + 1 and the following
+        lines at cell runover + 1 (2/0 for prose, 0/2 for list items).
+        """
+        for line in self._wrap(to_braille_ascii(braille), indent, runover):
+            self._line(line)
+
+    def paragraphs(self, braille_chunks, indent: int = 2, runover: int = 0):
+        """
+        Streams consecutive chunks (e.g. of a long transcript, split on whitespace) as one
+        paragraph, keeping only the unfinished last line between chunks.
+        """
+        words, first = [], True
+        for chunk in braille_chunks:
+            words.extend(to_braille_ascii(chunk).split())
+            if len(words) > self.cells_per_line:
+                lines = self._wrap(" ".join(words), indent if first else runover, runover)
+                for line in lines[:-1]:
+                    self._line(line)
+                if len(lines) > 1:
+                    first = False
+                words = lines[-1].split()
+        if words:
+            for line in self._wrap(" ".join(words), indent if first else runover, runover):
+                self._line(line)
+
+    def _wrap(self, text: str, indent: int, runover: int) -> list:
+        lines = []
+        width = self.cells_per_line
+        current = " " * indent
+        for word in text.split():
+            while word:
+                room = width - len(current) - (1 if current.strip() else 0)
+                if len(word) <= room:
+                    current = f"{current} {word}" if current.strip() else current + word
+                    word = ""
+                    continue
+                cut = self._hyphenation_point(word, room)
+                if cut:
+                    piece = word[:cut] + HYPHEN
+                    current = f"{current} {piece}" if current.strip() else current + piece
+                    word = word[cut:]
+                elif not current.strip():
+                    # Longer than a whole line and no place to hyphenate: hard break
+                    current += word[:room]
+                    word = word[room:]
+                lines.append(current)
+                current = " " * runover
+        if current.strip():
+            lines.append(current)
+        return lines
+
+    def _hyphenation_point(self, word: str, room: int) -> int:
+        """Number of cells of `word` to keep before a hyphen in `room` cells (0 = don't hyphenate)."""
+        cut = room - len(HYPHEN)
+        if len(word) < 2 * MIN_HYPHEN_PART:
+            return 0
+        cut = min(cut, len(word) - MIN_HYPHEN_PART)
+        # Don't separate an indicator from its cell, or split right before/after a hyphen
+        while cut >= MIN_HYPHEN_PART and (word[cut - 1] in _PREFIXES or HYPHEN in word[cut - 1:cut + 1]):
+            cut -= 1
+        return cut if cut >= MIN_HYPHEN_PART else 0
+
+    def close(self):
+        self._flush_page()
+        self.stream.flush()
@@ -0,0 +1,64 @@
+import copy
+import threading
+
+# Single-flight coalescing of identical concurrent calls.
+# The first caller for a key runs the computation; callers arriving with the same key while
+# it is in flight wait for it and get its result (or its exception) instead of repeating the
+# work. Nothing is kept once the call finishes: later callers start a new one (results that
+# should outlive a call belong in the caches / artifact store).
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    def __init__(self, name: str = "SingleFlight"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """
+        Runs fn() once for all concurrent callers with the same key.
+        :return: (result, shared) where shared is True for callers that waited on another caller's run.
+                 Waiters receive a deep copy, so callers can't affect each other's results.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            print(f"[{self.name}] Joining in-flight call for {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), True
+
+        result = None
+        try:
+            result = fn()
+            return result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                waiters = call.waiters
+            if waiters:
+                if call.error is None:
+                    # Waiters copy from a snapshot, which the leader's caller can't modify
+                    call.result = copy.deepcopy(result)
+                print(f"[{self.name}] Shared result for {key} with {waiters} waiting callers")
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
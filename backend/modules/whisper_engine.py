@@ -1,10 +1,11 @@
-import whisper
-import streamlit as st
+try:
+    from audio.whisper_registry import get_whisper_model
+except ImportError:
+    from backend.audio.whisper_registry import get_whisper_model
 
-@st.cache_resource
 def load_whisper_model(model_name="base"):
-    """Load Whisper model with caching."""
-    return whisper.load_model(model_name)
+    """Load Whisper model from the process-wide registry (shared with the agent pipeline)."""
+    return get_whisper_model(model_name)
 
 def transcribe_with_whisper(model, audio_path):
     """Transcribe audio file using Whisper model."""
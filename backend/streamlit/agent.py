@@ -2,6 +2,8 @@ import streamlit as st
 import sys
 import os
 import json
+import queue
+import threading
 from dotenv import load_dotenv
 
 # Load .env from backend directory
@@ -36,10 +38,35 @@ if st.button("Generate Study Material", type="primary"):
         with st.status("🚀 Agents Working...", expanded=True) as status:
             st.write("Initializing Agents...")
             
-            # Run the synchronous orchestrator (since it uses blocking calls)
-            # In a production app, we might want this async or threaded
+            # Run the orchestrator in a background thread so the summary can be rendered
+            # while it streams; the worker never touches Streamlit, it only fills a queue.
             try:
-                results = run_agent_workflow(youtube_url)
+                token_queue = queue.Queue()
+                outcome = {}
+                
+                def run_workflow():
+                    try:
+                        outcome["results"] = run_agent_workflow(youtube_url, on_summary_token=token_queue.put)
+                    except Exception as e:
+                        outcome["error"] = e
+                
+                worker = threading.Thread(target=run_workflow, daemon=True)
+                worker.start()
+                
+                st.write("Summary (live):")
+                summary_placeholder = st.empty()
+                partial_summary = ""
+                while worker.is_alive() or not token_queue.empty():
+                    try:
+                        partial_summary += token_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    summary_placeholder.markdown(partial_summary)
+                worker.join()
+                
+                if "error" in outcome:
+                    raise outcome["error"]
+                results = outcome["results"]
                 
                 if "error" in results:
                     status.update(label="❌ Workflow Failed", state="error")
@@ -63,6 +90,18 @@ if st.button("Generate Study Material", type="primary"):
                             type="primary"
                         )
                     
+                    # BRF Download Button (embosser / braille display ready)
+                    brf_path = results.get("brf_path", "")
+                    if brf_path and os.path.exists(brf_path):
+                        with open(brf_path, "rb") as f:
+                            brf_data = f.read()
+                        st.download_button(
+                            label="📥 Download Braille (BRF)",
+                            data=brf_data,
+                            file_name="study_material.brf",
+                            mime="text/plain"
+                        )
+                    
             except Exception as e:
                 status.update(label="❌ Critical Error", state="error")
                 st.error(f"An unexpected error occurred: {e}")
@@ -136,3 +175,5 @@ if 'agent_results' in st.session_state:
         
     with tab6:
         st.json(res.get('context', {}))
+        st.markdown("#### Stage Timings (s)")
+        st.json(res.get('timings', {}))
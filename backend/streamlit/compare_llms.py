@@ -1,7 +1,6 @@
 import streamlit as st
 import sys
 import os
-import time
 import pandas as pd
 import difflib
 from dotenv import load_dotenv
@@ -12,18 +11,29 @@ load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 # Add parent directory to path to import backend modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
-from backend.agents.agent_orchestrator import run_agent_workflow
+from backend.agents.agent_orchestrator import compare_providers
 
-st.set_page_config(page_title="LLM Comparison: OpenAI vs Ollama", layout="wide")
+st.set_page_config(page_title="LLM Comparison", layout="wide")
 
-st.title("🤖 LLM Comparison: OpenAI vs Ollama")
-st.markdown("Run the same agent pipeline with two different LLM providers to compare accuracy, speed, and quality.")
+st.title("🤖 LLM Comparison")
+st.markdown("Run the same agent pipeline with several LLM providers / models to compare accuracy, speed, and quality. "
+            "The video is transcribed once and the providers run in parallel.")
 
 # Sidebar Settings
 st.sidebar.header("Settings")
 youtube_url = st.sidebar.text_input("YouTube URL", "https://www.youtube.com/watch?v=example")
-openai_model = st.sidebar.selectbox("OpenAI Model", ["gpt-4o", "gpt-3.5-turbo"], index=0)
-ollama_model = st.sidebar.text_input("Ollama Model", "mistral")
+providers_text = st.sidebar.text_area("Providers (one per line, provider:model)", "openai:gpt-4o\nollama:mistral",
+                                      help="provider is openai or ollama; the model may be left out for the default.")
+
+def parse_providers(text):
+    providers = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        provider, _, model = line.partition(":")
+        providers.append((provider.strip().lower(), model.strip() or None))
+    return providers
 
 def calculate_metrics(text):
     if not text:
@@ -38,125 +48,104 @@ def get_similarity(text1, text2):
     return difflib.SequenceMatcher(None, text1, text2).ratio()
 
 if st.sidebar.button("Run Comparison"):
+    providers = parse_providers(providers_text)
     if not youtube_url:
         st.error("Please enter a YouTube URL.")
+    elif not providers:
+        st.error("Please enter at least one provider.")
     else:
-        # Containers for results
-        results_data = {
-            "OpenAI": {},
-            "Ollama": {}
-        }
-        
-        # --- Run OpenAI ---
-        with st.status("Running OpenAI Agent...", expanded=True) as status_openai:
-            start_time = time.time()
+        with st.status(f"Running {len(providers)} providers...", expanded=True) as status:
             try:
-                res_openai = run_agent_workflow(youtube_url, provider_type="openai", provider_model=openai_model)
-                results_data["OpenAI"]["data"] = res_openai
-                results_data["OpenAI"]["time"] = time.time() - start_time
-                status_openai.update(label="✅ OpenAI Complete", state="complete")
+                comparison = compare_providers(youtube_url, providers)
+                if "error" in comparison:
+                    st.error(comparison["error"])
+                    status.update(label="❌ Comparison Failed", state="error")
+                else:
+                    for run in comparison["runs"]:
+                        if "error" in run:
+                            st.error(f"{run['provider']} ({run['model']}) Failed: {run['error']}")
+                    status.update(label="✅ Comparison Complete", state="complete")
             except Exception as e:
-                st.error(f"OpenAI Failed: {e}")
-                results_data["OpenAI"]["error"] = str(e)
-                status_openai.update(label="❌ OpenAI Failed", state="error")
+                st.error(f"Comparison Failed: {e}")
+                comparison = {"runs": []}
+                status.update(label="❌ Comparison Failed", state="error")
 
-        # --- Run Ollama ---
-        with st.status("Running Ollama Agent...", expanded=True) as status_ollama:
-            start_time = time.time()
-            try:
-                res_ollama = run_agent_workflow(youtube_url, provider_type="ollama", provider_model=ollama_model)
-                results_data["Ollama"]["data"] = res_ollama
-                results_data["Ollama"]["time"] = time.time() - start_time
-                status_ollama.update(label="✅ Ollama Complete", state="complete")
-            except Exception as e:
-                st.error(f"Ollama Failed: {e}")
-                results_data["Ollama"]["error"] = str(e)
-                status_ollama.update(label="❌ Ollama Failed", state="error")
+        runs = [run for run in comparison["runs"] if "error" not in run]
 
         # --- Display Comparison ---
         st.divider()
         st.header("📊 Comparative Analysis")
         
-        if "data" in results_data["OpenAI"] and "data" in results_data["Ollama"]:
-            d_openai = results_data["OpenAI"]["data"]
-            d_ollama = results_data["Ollama"]["data"]
+        if runs:
+            timings = comparison.get("timings", {})
+            st.markdown(f"**Shared (once for all providers):** language detection {timings.get('language', 0):.2f}s, "
+                        f"transcription {timings.get('transcription', 0):.2f}s · **Total:** {timings.get('total', 0):.2f}s")
             
-            # Metrics Calculation
-            summ_oa_len, summ_oa_rich = calculate_metrics(d_openai.get("summary", ""))
-            summ_ol_len, summ_ol_rich = calculate_metrics(d_ollama.get("summary", ""))
+            labels = [f"{run['provider']} ({run['model']})" + (" [stored]" if run.get("from_store") else "")
+                      for run in runs]
+            baseline = runs[0]["results"].get("summary", "")
             
-            sim_score = get_similarity(d_openai.get("summary", ""), d_ollama.get("summary", ""))
-            
-            metrics = {
-                "Metric": [
-                    "Processing Time (s)", 
-                    "Summary Word Count", 
-                    "Vocabulary Richness", 
-                    "Notes Generated", 
-                    "Q&A Generated",
-                    "Summary Similarity (vs OpenAI)"
-                ],
-                "OpenAI": [
-                    f"{results_data['OpenAI']['time']:.2f}",
-                    summ_oa_len,
-                    f"{summ_oa_rich:.2f}",
-                    len(d_openai.get("notes", [])),
-                    len(d_openai.get("qa", [])),
-                    "1.00 (Baseline)"
-                ],
-                "Ollama": [
-                    f"{results_data['Ollama']['time']:.2f}",
-                    summ_ol_len,
-                    f"{summ_ol_rich:.2f}",
-                    len(d_ollama.get("notes", [])),
-                    len(d_ollama.get("qa", [])),
-                    f"{sim_score:.2f}"
+            metrics = {"Metric": [
+                "LLM Time (s)",
+                "Processing Time (s)",
+                "LLM Calls",
+                "Summary Word Count",
+                "Vocabulary Richness",
+                "Notes Generated",
+                "Q&A Generated",
+                f"Summary Similarity (vs {labels[0]})"
+            ]}
+            word_counts = []
+            for i, (label, run) in enumerate(zip(labels, runs)):
+                data = run["results"]
+                summ_len, summ_rich = calculate_metrics(data.get("summary", ""))
+                word_counts.append(summ_len)
+                similarity = "1.00 (Baseline)" if i == 0 else f"{get_similarity(baseline, data.get('summary', '')):.2f}"
+                metrics[label] = [
+                    f"{run['llm_seconds']:.2f}",
+                    f"{run['wall_seconds']:.2f}",
+                    data.get("llm_calls", 0),
+                    summ_len,
+                    f"{summ_rich:.2f}",
+                    len(data.get("notes", [])),
+                    len(data.get("qa", [])),
+                    similarity
                 ]
-            }
             
             df = pd.DataFrame(metrics)
             st.table(df)
+            st.caption("LLM time adds up every LLM call of the provider (calls made in parallel count in full); "
+                       "processing time is the provider's own chain, without the shared transcription.")
             
             # Charts
             c1, c2 = st.columns(2)
             with c1:
-                st.subheader("Processing Time (s)")
+                st.subheader("Time (s)")
                 chart_data_time = pd.DataFrame({
-                    "Provider": ["OpenAI", "Ollama"],
-                    "Time (s)": [results_data["OpenAI"]["time"], results_data["Ollama"]["time"]]
+                    "Provider": labels,
+                    "LLM": [run["llm_seconds"] for run in runs],
+                    "Processing": [run["wall_seconds"] for run in runs]
                 }).set_index("Provider")
                 st.bar_chart(chart_data_time)
                 
             with c2:
                 st.subheader("Summary Word Count")
                 chart_data_words = pd.DataFrame({
-                    "Provider": ["OpenAI", "Ollama"],
-                    "Word Count": [summ_oa_len, summ_ol_len]
+                    "Provider": labels,
+                    "Word Count": word_counts
                 }).set_index("Provider")
                 st.bar_chart(chart_data_words)
         
-        # --- Side-by-Side Content ---
-        st.divider()
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader(f"OpenAI ({openai_model})")
-            if "data" in results_data["OpenAI"]:
-                res = results_data["OpenAI"]["data"]
-                st.markdown(f"**Language:** {res.get('language')}")
-                st.markdown("### Summary")
-                st.write(res.get("summary"))
-                st.markdown("### Notes")
-                for n in res.get("notes", []):
-                    st.markdown(f"- {n}")
-                    
-        with col2:
-            st.subheader(f"Ollama ({ollama_model})")
-            if "data" in results_data["Ollama"]:
-                res = results_data["Ollama"]["data"]
-                st.markdown(f"**Language:** {res.get('language')}")
-                st.markdown("### Summary")
-                st.write(res.get("summary"))
-                st.markdown("### Notes")
-                for n in res.get("notes", []):
-                    st.markdown(f"- {n}")
+            # --- Side-by-Side Content ---
+            st.divider()
+            st.markdown(f"**Language:** {comparison.get('language')}")
+            columns = st.columns(len(runs))
+            for col, label, run in zip(columns, labels, runs):
+                with col:
+                    st.subheader(label)
+                    res = run["results"]
+                    st.markdown("### Summary")
+                    st.write(res.get("summary"))
+                    st.markdown("### Notes")
+                    for n in res.get("notes", []):
+                        st.markdown(f"- {n}")
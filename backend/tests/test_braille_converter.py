@@ -0,0 +1,95 @@
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.modules import braille_converter
+from backend.modules.braille_converter import text_to_braille, translate_document
+
+# (text, grade, expected Unicode Braille)
+UEB_CASES = [
+    # Grade 1: letters, capital and number indicators, punctuation
+    ("abc", 1, "⠁⠃⠉"),
+    ("Hello", 1, "⠠⠓⠑⠇⠇⠕"),
+    ("NASA", 1, "⠠⠠⠝⠁⠎⠁"),
+    ("123", 1, "⠼⠁⠃⠉"),
+    ("3.5", 1, "⠼⠉⠲⠑"),
+    ("a1b", 1, "⠁⠼⠁⠰⠃"),  # grade 1 indicator: "b" after a number would read as a digit
+    ("hi, you.", 1, "⠓⠊⠂ ⠽⠕⠥⠲"),
+    # Grade 2: wordsigns, strong contractions and groupsigns
+    ("the", 2, "⠮"),
+    ("and", 2, "⠯"),
+    ("for", 2, "⠿"),
+    ("of", 2, "⠷"),
+    ("with", 2, "⠾"),
+    ("but", 2, "⠃"),
+    ("can", 2, "⠉"),
+    ("it", 2, "⠭"),
+    ("you", 2, "⠽"),
+    ("be", 2, "⠆"),
+    ("people", 2, "⠏"),
+    ("child", 2, "⠡"),
+    ("knowledge", 2, "⠅"),
+    ("world", 2, "⠸⠺"),
+    ("shout", 2, "⠩⠳⠞"),
+    ("sing", 2, "⠎⠬"),
+    ("ing", 2, "⠔⠛"),  # "ing" can't begin a word
+    ("ed", 2, "⠫"),
+    ("The cat", 2, "⠠⠮ ⠉⠁⠞"),
+    ("3.5", 2, "⠼⠉⠲⠑"),
+]
+
+# Bharati Braille (Hindi / Marathi)
+BHARATI_CASES = [
+    ("कमल", "⠅⠍⠇"),
+    ("का", "⠅⠜"),
+    ("कि", "⠅⠊"),
+    ("क्ष", "⠟"),
+    ("ज्ञान", "⠱⠜⠝"),
+    ("नमस्ते", "⠝⠍⠎⠈⠞⠑"),
+    ("राम।", "⠗⠜⠍⠲"),
+    ("१२", "⠼⠁⠃"),
+]
+
+@pytest.mark.parametrize("text, grade, expected", UEB_CASES)
+def test_ueb(text, grade, expected):
+    assert text_to_braille(text, grade) == expected
+
+@pytest.mark.parametrize("text, expected", BHARATI_CASES)
+@pytest.mark.parametrize("grade", [1, 2])
+def test_bharati(text, expected, grade):
+    assert text_to_braille(text, grade) == expected
+
+def test_empty():
+    assert text_to_braille("", 2) == ""
+
+DOCUMENT = {
+    "summary": "The world of knowledge. It has 3.5 parts!",
+    "notes": ["Children sing", "NASA and ISRO", "a1b", "", "राम और श्याम।"],
+    "qa": [{"question": "Why?", "answer": "Because\x1eof the (sun)."}],
+    "count": 3,
+    "flag": None,
+}
+
+def _per_field(node, grade):
+    if isinstance(node, str):
+        return text_to_braille(node.replace("\x1e", " "), grade)
+    if isinstance(node, dict):
+        return {key: _per_field(value, grade) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_per_field(value, grade) for value in node]
+    return node
+
+@pytest.mark.parametrize("grade", [1, 2])
+def test_translate_document_matches_per_field(grade):
+    assert translate_document(DOCUMENT, grade=grade, workers=1) == _per_field(DOCUMENT, grade)
+
+def test_translate_document_on_pool(monkeypatch):
+    monkeypatch.setattr(braille_converter, "PARALLEL_MIN_CHARS", 0)
+    try:
+        assert translate_document(DOCUMENT, grade=2, workers=2) == _per_field(DOCUMENT, 2)
+    finally:
+        braille_converter.shutdown_pool()
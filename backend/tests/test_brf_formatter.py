@@ -0,0 +1,53 @@
+import io
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.modules.brf_formatter import BrfWriter, to_braille_ascii, page_number
+
+# (Braille ASCII text, indent, runover, expected lines) on 10-cell lines
+WRAP_CASES = [
+    ("AB CD EF", 0, 0, ["AB CD EF"]),
+    ("ABCD EFGH IJ", 2, 0, ["  ABCD", "EFGH IJ"]),
+    ("AAAA BBBB CCCC", 0, 2, ["AAAA BBBB", "  CCCC"]),
+    # Hyphenated, at least 3 cells on each side
+    ("AB CDEFGHIJKL", 0, 0, ["AB CDEFGH-", "IJKL"]),
+    # Never after an indicator (",", the capital sign): it stays with its cell
+    ("AB CDEFG,HIJ", 0, 0, ["AB CDEFG-", ",HIJ"]),
+    # Short words move to the next line instead of being hyphenated
+    ("ABCDEFG HIJKL", 0, 0, ["ABCDEFG", "HIJKL"]),
+    # No place to hyphenate: hard break
+    ("##########AB", 0, 0, ["##########", "AB"]),
+]
+
+@pytest.mark.parametrize("text, indent, runover, expected", WRAP_CASES)
+def test_wrap(text, indent, runover, expected):
+    lines = BrfWriter(io.StringIO(), cells_per_line=10)._wrap(text, indent, runover)
+    assert lines == expected
+    assert all(len(line) <= 10 for line in lines)
+
+def test_paragraphs_match_paragraph():
+    chunks = ["⠁⠃ ⠉⠙⠑⠋ ⠛⠓", "⠊⠚ ⠅⠇⠍⠝⠕⠏⠟ ", "⠗⠎ ⠞⠥⠧⠺⠭⠽⠵ ⠁"]
+    streamed, whole = io.StringIO(), io.StringIO()
+    with BrfWriter(streamed, cells_per_line=10) as writer:
+        writer.paragraphs(chunks)
+    with BrfWriter(whole, cells_per_line=10) as writer:
+        writer.paragraph(" ".join(chunks))
+    assert streamed.getvalue() == whole.getvalue()
+
+def test_pages():
+    out = io.StringIO()
+    with BrfWriter(out, cells_per_line=10, lines_per_page=3) as writer:
+        for word in ("⠁", "⠃", "⠉"):
+            writer.paragraph(word, indent=0)
+    pages = out.getvalue().split("\f")[:-1]
+    # Two text lines per page, the page number right-aligned on the last line
+    assert pages == ["A\r\nB\r\n" + "#A".rjust(10) + "\r\n", "C\r\n\r\n" + "#B".rjust(10) + "\r\n"]
+
+def test_ascii_and_page_numbers():
+    assert to_braille_ascii("⠠⠓⠑⠇⠇⠕ ⠼⠁") == ",HELLO #A"
+    assert page_number(12) == "#AB"
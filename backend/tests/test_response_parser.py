@@ -0,0 +1,60 @@
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path to import backend modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.agents.response_parser import extract_json, parse_response, SCHEMAS
+
+# (response text, expected value)
+EXTRACT_CASES = [
+    ('{"a": 1}', {"a": 1}),
+    ('Sure! Here is the JSON:\n{"a": [1, 2]}\nHope this helps.', {"a": [1, 2]}),
+    ('```json\n{"a": "x"}\n```', {"a": "x"}),
+    ('See step [1] below: {"notes": ["a"]}', {"notes": ["a"]}),  # objects win over prose arrays
+    ('{"a": "closing } and ] in a string"}', {"a": "closing } and ] in a string"}),
+    ('{"a": "escaped \\" quote"}', {"a": 'escaped " quote'}),
+    ('Broken {"a": } then {"b": 2}', {"b": 2}),
+    ('Only a list: [1, 2]', [1, 2]),
+]
+
+@pytest.mark.parametrize("text, expected", EXTRACT_CASES)
+def test_extract_json(text, expected):
+    assert extract_json(text) == expected
+
+@pytest.mark.parametrize("text", ["no json here", "", "{unclosed", "[" * 5000])
+def test_extract_json_without_json(text):
+    with pytest.raises(ValueError):
+        extract_json(text)
+
+def test_parse_response_skips_invalid_candidates():
+    text = 'Here are the notes (see [1]) and {"other": 1}: {"notes": ["x", "y"]}'
+    assert parse_response(text, SCHEMAS["notes"]) == {"notes": ["x", "y"]}
+
+def test_parse_response_reports_object_error():
+    with pytest.raises(ValueError, match=r"\$\.notes must be a list"):
+        parse_response('[1] {"notes": 3}', SCHEMAS["notes"])
+
+class _RepairProvider:
+    model = "repair"
+
+    def __init__(self, response: str):
+        self.response = response
+        self.prompts = []
+
+    def generate(self, prompt: str, system_message: str = None, **kwargs) -> str:
+        self.prompts.append(prompt)
+        return self.response
+
+def test_parse_response_repairs_once():
+    provider = _RepairProvider('{"questions": [{"question": "q", "answer": "a"}]}')
+    result = parse_response("not json", SCHEMAS["qa"], llm_provider=provider)
+    assert result == {"questions": [{"question": "q", "answer": "a"}]}
+    assert len(provider.prompts) == 1
+
+def test_parse_response_valid_needs_no_repair():
+    provider = _RepairProvider("unused")
+    parse_response('Sure: {"language": "hi"}', SCHEMAS["language"], llm_provider=provider)
+    assert provider.prompts == []